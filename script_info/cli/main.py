@@ -1,7 +1,90 @@
 import argparse
+import functools
+import os
 import sys
-from ..core import get_system_info
-from ..reporting import PDFReporter
+from ..core import get_snapshot
+from ..collectors import (DEFAULT_TIMEOUT, all_collectors, get_collectors, format_timings,
+                          in_declaration_order, iter_sections)
+from ..collectors.model import Snapshot
+from ..formatting import display_dict
+from ..collectors.cache import get_cache
+from ..collectors.options import configure
+from ..collectors.ports import parse_ports
+
+def _split_selectors(values):
+    if not values:
+        return None
+    return [part for value in values for part in value.split(',') if part.strip()]
+
+# Lines shown per section unless --full is given
+SECTION_PREVIEW = 20
+
+def _stdout_closed():
+    # The reader went away (e.g. `| head`); stop quietly, and keep the
+    # interpreter's final flush from failing again
+    os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    sys.exit(1)
+
+def _print_section(section, full=False):
+    """Print one collector's results; return how many items it had."""
+    info = display_dict(section.metrics)
+    lines = []
+    for key, value in info.items():
+        if isinstance(value, dict):
+            lines.append(f"{key}:")
+            lines.extend(f"  {k}: {v}" for k, v in value.items())
+        else:
+            lines.append(f"{key}: {value}")
+    shown = lines if full else lines[:SECTION_PREVIEW]
+    out = [f"\n[{section.category}] {section.collector}"]
+    out.extend(shown)
+    if len(shown) < len(lines):
+        out.append(f"  ... and {len(lines) - len(shown)} more lines (use --full)")
+    print("\n".join(out), flush=True)
+    return len(info)
+
+def _write_snapshot(snapshot, fmt, path):
+    from ..encoding import WRITERS
+    write = WRITERS[fmt]
+    if path is None:
+        out = sys.stdout.buffer if fmt == 'binary' else sys.stdout
+        try:
+            write(snapshot, out)
+            out.flush()
+        except BrokenPipeError:
+            _stdout_closed()
+    elif fmt == 'binary':
+        with open(path, 'wb') as out:
+            write(snapshot, out)
+    else:
+        with open(path, 'w', encoding='utf-8') as out:
+            write(snapshot, out)
+
+def _write_delta(baseline, snapshot, path):
+    from ..diff import write_delta
+    if path is not None:
+        with open(path, 'w', encoding='utf-8') as out:
+            write_delta(baseline, snapshot, out)
+        return
+    try:
+        write_delta(baseline, snapshot, sys.stdout)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        _stdout_closed()
+
+def _configure_collectors(args):
+    """Apply the partition, interface and process options to the collectors."""
+    fstypes = _split_selectors(args.fstype)
+    configure(partition_fstypes=set(fstypes) if fstypes else None,
+              partition_prefixes=_split_selectors(args.mount_prefix),
+              interface_include=_split_selectors(args.interfaces),
+              interface_exclude=_split_selectors(args.exclude_interfaces))
+    if args.top is not None:
+        if args.top < 1:
+            print("Error: --top must be at least 1.")
+            sys.exit(2)
+        configure(process_top=args.top)
+
 
 def main():
     """
@@ -12,9 +95,33 @@ def main():
         add_help=False
     )
 
+    parser.add_argument('command', nargs='?', choices=('serve',), help="'serve' exposes metrics over HTTP in OpenMetrics format")
     parser.add_argument('-all', action='store_true', help='Collect and display all system information')
     parser.add_argument('--help', action='store_true', help='Show help message')
+    parser.add_argument('--full', action='store_true', help='Print every line of every section instead of a preview')
+    parser.add_argument('--format', choices=('json', 'ndjson', 'binary'), help='Write the whole snapshot in a machine-readable format')
+    parser.add_argument('-o', '--output', metavar='FILE', help='Write --format or --since output to FILE instead of stdout')
+    parser.add_argument('--since', metavar='BASELINE', help='Emit only what changed since a snapshot saved with --format json or binary')
     parser.add_argument('--pdf', type=str, metavar='FILENAME', help='Export system information to PDF file')
+    parser.add_argument('--only', action='append', metavar='SELECTORS', help='Run only these collectors (names, categories or cost classes, comma separated)')
+    parser.add_argument('--skip', action='append', metavar='SELECTORS', help='Skip these collectors (names, categories or cost classes, comma separated)')
+    parser.add_argument('--no-cache', action='store_true', help='Recompute static facts instead of using the on-disk cache')
+    parser.add_argument('--profile', action='store_true', help='Print per-collector timings')
+    parser.add_argument('--list-collectors', action='store_true', help='List available collectors')
+    parser.add_argument('--scan-ports', metavar='PORTS', help="Connect-scan these ports, e.g. '22,80,8000-8100' or '1-65535'")
+    parser.add_argument('--scan-hosts', metavar='ADDRESSES', help='Comma separated addresses to scan (default: all local interface addresses)')
+    parser.add_argument('--scan-concurrency', type=int, default=500, metavar='N', help='Maximum connections in flight while scanning')
+    parser.add_argument('--fstype', action='append', metavar='TYPES', help='Report only partitions of these filesystem types (comma separated)')
+    parser.add_argument('--mount-prefix', action='append', metavar='PATHS', help='Report only partitions mounted at or below these paths (comma separated)')
+    parser.add_argument('--interfaces', action='append', metavar='GLOBS', help="Report only network interfaces matching these globs, e.g. 'eth*,en*'")
+    parser.add_argument('--exclude-interfaces', action='append', metavar='GLOBS', help="Leave out network interfaces matching these globs, e.g. 'veth*,cali*'")
+    parser.add_argument('--top', type=int, metavar='N', help='Length of each top-N process list (default 5)')
+    parser.add_argument('--watch', type=float, metavar='INTERVAL', help='Print network/disk rates every INTERVAL seconds')
+    parser.add_argument('--count', type=int, metavar='N', help='Stop --watch after N reports')
+    parser.add_argument('--listen', default='127.0.0.1', metavar='ADDRESS', help='Address for serve to listen on')
+    parser.add_argument('--port', type=int, default=9184, metavar='PORT', help='Port for serve to listen on')
+    parser.add_argument('--interval', type=float, default=15.0, metavar='SECONDS', help='Seconds between background collections in serve mode')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, metavar='SECONDS', help='Overall collection deadline')
 
     args = parser.parse_args()
 
@@ -22,44 +129,157 @@ def main():
         print("Script Info CLI Help:")
         print("  -all           : Collect and display all system information")
         print("  --pdf FILENAME : Export system information to PDF file (use with -all)")
+        print(f"  --full         : Print every line of every section (default: first {SECTION_PREVIEW} lines each)")
+        print("  --format FMT   : Write the full snapshot as json, ndjson (one metric per line) or binary")
+        print("  --since FILE   : Emit only the changes since a snapshot saved with --format json/binary, as a JSON delta")
+        print("  -o, --output FILE : Write --format or --since output to FILE instead of stdout")
+        print("  --only LIST    : Run only matching collectors, e.g. --only cheap or --only cpu,memory")
+        print("  --skip LIST    : Skip matching collectors, e.g. --skip network,software")
+        print("  --no-cache     : Recompute static facts (OS, BIOS, CPU topology, tools) instead of using the cache")
+        print("  --profile      : Print wall/CPU time per collector, slowest first")
+        print("  --list-collectors : List collectors with their category and cost class")
+        print(f"  --timeout SECS : Overall collection deadline (default {DEFAULT_TIMEOUT:g}s)")
+        print("  --scan-ports P : Connect-scan ports, e.g. 22,80,8000-8100 (listening ports are always read from the kernel)")
+        print("  --scan-hosts A : Comma separated addresses to scan (default: all local interface addresses)")
+        print("  --scan-concurrency N : Maximum connections in flight while scanning (default 500)")
+        print("  --fstype LIST  : Report only partitions of these filesystem types, e.g. --fstype ext4,xfs,nfs4")
+        print("  --mount-prefix LIST : Report only partitions mounted at or below these paths")
+        print("  --interfaces GLOBS : Report only matching network interfaces, e.g. --interfaces 'eth*,en*'")
+        print("  --exclude-interfaces GLOBS : Leave out matching network interfaces, e.g. 'veth*,cali*'")
+        print("  --top N        : List the N busiest processes by CPU, memory, open files and threads (default 5)")
+        print("  --watch SECS   : Stay resident and print per-NIC/per-disk rates every SECS seconds")
+        print("  --count N      : Stop --watch after N reports (default: until Ctrl+C)")
+        print("  serve          : Serve OpenMetrics on http://127.0.0.1:9184/metrics, collecting in the background")
+        print("  --listen ADDR  : Address for serve to listen on (default 127.0.0.1)")
+        print("  --port PORT    : Port for serve to listen on (default 9184)")
+        print("  --interval SECS : Seconds between collections in serve mode (default 15)")
         print("  --help         : Show this help message")
         return
 
-    if args.all:
+    if args.list_collectors:
+        for c in all_collectors():
+            note = '' if c.default else ' (opt-in)'
+            print(f"  {c.name:<20} {c.category:<10} {c.cost}{note}")
+        return
+
+    if args.no_cache:
+        get_cache().enabled = False
+
+    if args.watch is not None:
+        if args.watch <= 0:
+            print("Error: --watch interval must be positive.")
+            sys.exit(2)
+        from ..watch import watch
+        try:
+            watch(args.watch, args.count)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if args.command == 'serve':
+        if args.interval <= 0:
+            print("Error: --interval must be positive.")
+            sys.exit(2)
+        only = _split_selectors(args.only)
+        skip = _split_selectors(args.skip)
+        try:
+            get_collectors(only, skip)
+        except ValueError as e:
+            print(f"Error: {e}. Use --list-collectors to see what is available.")
+            sys.exit(2)
+        _configure_collectors(args)
+        from ..exporter import serve
+        try:
+            serve(args.listen, args.port, args.interval, only, skip, args.timeout)
+        except OSError as e:
+            print(f"Error: cannot listen on {args.listen}:{args.port}: {e}")
+            sys.exit(1)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if args.format and args.since:
+        print("Error: --since writes a JSON delta and cannot be combined with --format.")
+        sys.exit(2)
+
+    if args.all or args.format or args.since:
+        only = _split_selectors(args.only)
+        skip = _split_selectors(args.skip)
+        try:
+            get_collectors(only, skip)
+        except ValueError as e:
+            print(f"Error: {e}. Use --list-collectors to see what is available.")
+            sys.exit(2)
+
+        _configure_collectors(args)
+
+        baseline = None
+        if args.since:
+            from ..encoding import read_snapshot
+            try:
+                baseline = read_snapshot(args.since)
+            except (OSError, ValueError) as e:
+                print(f"Error: cannot read baseline: {e}")
+                sys.exit(2)
+
+        collector_timeout = None
+        if args.scan_ports:
+            try:
+                configure(
+                    scan_ports=parse_ports(args.scan_ports),
+                    scan_hosts=_split_selectors([args.scan_hosts]) if args.scan_hosts else None,
+                    scan_concurrency=args.scan_concurrency,
+                )
+            except ValueError as e:
+                print(f"Error: {e}")
+                sys.exit(2)
+            # A requested scan may use the whole run's deadline
+            collector_timeout = {'ports': args.timeout}
+
+        # With --format or --since stdout carries only the encoded output
+        machine = args.format or args.since
+        log = functools.partial(print, file=sys.stderr) if machine else print
+
         try:
-            print("Collecting system information... (this may take a moment)")
-            info = get_system_info()
-            print(f"Collected {len(info)} items")
-
-            print("\nSystem Information Summary:")
-            print("=" * 50)
-
-            # Flat print for console
-            count = 0
-            for key, value in info.items():
-                if count < 15: # Show a bit more than 10
-                    if isinstance(value, dict):
-                         print(f"{key}: [Complex Data]")
-                    else:
-                         print(f"{key}: {value}")
-                    count += 1
+            timings = {}
+            if machine:
+                snapshot = get_snapshot(only=only, skip=skip, timeout=args.timeout,
+                                        collector_timeout=collector_timeout, timings=timings)
+                if args.format:
+                    _write_snapshot(snapshot, args.format, args.output)
                 else:
-                    break
+                    _write_delta(baseline, snapshot, args.output)
+            else:
+                print("Collecting system information...", flush=True)
+                # Print each collector's section the moment it finishes
+                sections = []
+                items = 0
+                for section in iter_sections(only, skip, args.timeout, collector_timeout, timings):
+                    sections.append(section)
+                    items += _print_section(section, args.full)
+                snapshot = Snapshot(in_declaration_order(sections))
+                print(f"\nCollection complete: {items} items from {len(sections)} collectors.")
 
-            print(f"\n... and {len(info) - count} more items")
-            print("\nCollection complete.")
+            if args.profile:
+                log("\nCollector Timings:")
+                log("=" * 50)
+                for line in format_timings(timings):
+                    log(line)
 
             if args.pdf:
-                print(f"\nGenerating PDF report: {args.pdf}")
+                from ..reporting import PDFReporter
+                log(f"\nGenerating PDF report: {args.pdf}")
                 reporter = PDFReporter(args.pdf)
-                if reporter.generate(info):
-                    print(f"PDF report saved successfully: {args.pdf}")
+                if reporter.generate(snapshot):
+                    log(f"PDF report saved successfully: {args.pdf}")
                 else:
-                    print("Failed to generate PDF report.")
+                    log("Failed to generate PDF report.")
                     sys.exit(1)
 
+        except BrokenPipeError:
+            _stdout_closed()
         except Exception as e:
-            print(f"Error collecting system information: {e}")
+            log(f"Error collecting system information: {e}")
             import traceback
             traceback.print_exc()
             sys.exit(1)
@@ -4,13 +4,61 @@ from .storage import get_storage_info
 from .network import get_network_info
 from .software import get_software_info
 from .security import get_security_info
+from .engine import DEFAULT_TIMEOUT, TIMED_OUT, collect, run_collectors
+from .profiling import CollectorTiming, STATUS_OK, format_timings
+from .options import options, configure
+from .model import Metric, Section, Snapshot, from_dict, metric_collector
+from .registry import (
+    CHEAP, MODERATE, EXPENSIVE, COST_CLASSES, Collector,
+    register, add_collector, get_collectors, all_collectors,
+)
 
-def collect_all():
-    data = {}
-    data.update(get_basic_info())
-    data.update(get_hardware_info())
-    data.update(get_storage_info())
-    data.update(get_network_info())
-    data.update(get_software_info())
-    data.update(get_security_info())
-    return data
+def _timeouts(collectors, collector_timeout):
+    if collector_timeout is not None and not isinstance(collector_timeout, dict):
+        return collector_timeout
+    timeouts = {c.name: c.timeout for c in collectors if c.timeout is not None}
+    timeouts.update(collector_timeout or {})
+    return timeouts
+
+def collect_all(only=None, skip=None, timeout=DEFAULT_TIMEOUT, collector_timeout=None, timings=None):
+    """
+    Run the selected collectors concurrently. `only`/`skip` take collector
+    names, categories or cost classes (see registry.get_collectors).
+    `timeout` bounds the whole run and `collector_timeout` (seconds, or a
+    dict keyed by collector name) bounds each collector; late collectors are
+    reported as timed out. Pass a dict as `timings` to receive a
+    CollectorTiming (wall time, CPU time, status) per collector.
+    """
+    collectors = get_collectors(only, skip)
+    pairs = [(c.name, c.func) for c in collectors]
+    return collect(pairs, timeout, _timeouts(collectors, collector_timeout), timings)
+
+def iter_sections(only=None, skip=None, timeout=DEFAULT_TIMEOUT, collector_timeout=None, timings=None):
+    """
+    Yield a Section for each selected collector as soon as it finishes (or
+    times out), fastest first, so a caller can show results while slower
+    collectors are still running. Arguments are as for collect_snapshot().
+    """
+    collectors = get_collectors(only, skip)
+    timings = {} if timings is None else timings
+    categories = {c.name: c.category for c in collectors}
+    pairs = [(c.name, c.metrics) for c in collectors]
+    for name, result in run_collectors(pairs, timeout, _timeouts(collectors, collector_timeout), timings):
+        if isinstance(result, dict):
+            result = from_dict(result)
+        timing = timings.get(name)
+        yield Section(name, categories[name], result or [], timing.status if timing else STATUS_OK)
+
+def in_declaration_order(sections):
+    """Sort sections from iter_sections() back into collector declaration order."""
+    order = {c.name: i for i, c in enumerate(all_collectors())}
+    return sorted(sections, key=lambda s: order.get(s.collector, len(order)))
+
+def collect_snapshot(only=None, skip=None, timeout=DEFAULT_TIMEOUT, collector_timeout=None, timings=None):
+    """
+    Like collect_all(), but return a Snapshot of typed Sections: raw metric
+    values with their units, grouped by collector and category. Collectors
+    that failed or timed out get a Section holding the engine's marker.
+    """
+    sections = iter_sections(only, skip, timeout, collector_timeout, timings)
+    return Snapshot(in_declaration_order(sections))
@@ -1,55 +1,98 @@
 import platform
-import datetime
 import psutil
 import getpass
 import time
 import locale
 import os
+from .registry import register, CHEAP, MODERATE
+from .cache import Uncached, static_fact
+from .options import options
+from .model import Metric, metric_collector, BYTES, COUNT, DURATION, PERCENT, SECONDS, TIMESTAMP
+from . import processes
 
+@register('os', 'System', CHEAP)
+@metric_collector
+@static_fact('os')
 def get_os_info():
-    info = {}
-    info['OS Name'] = platform.system()
-    info['OS Version'] = platform.version()
-    info['OS Release'] = platform.release()
-    info['OS Platform'] = platform.platform()
-    info['Architecture'] = platform.machine()
-    info['Processor'] = platform.processor()
-    
+    metrics = [
+        Metric('os_name', platform.system(), title='OS Name'),
+        Metric('os_version', platform.version(), title='OS Version'),
+        Metric('os_release', platform.release(), title='OS Release'),
+        Metric('os_platform', platform.platform(), title='OS Platform'),
+        Metric('architecture', platform.machine(), title='Architecture'),
+        Metric('processor', platform.processor(), title='Processor'),
+    ]
+
     # Locale and timezone
     try:
-        info['System Locale'] = locale.getlocale()[0] or 'Unknown'
-        info['System Encoding'] = locale.getpreferredencoding()
+        metrics.append(Metric('locale', locale.getlocale()[0] or 'Unknown', title='System Locale'))
+        metrics.append(Metric('encoding', locale.getpreferredencoding(), title='System Encoding'))
     except Exception:
-        info['System Locale'] = 'Unable to determine'
-    info['Timezone'] = time.tzname[0] if time.tzname else 'Unknown'
-    
-    return info
+        metrics.append(Metric('locale', 'Unable to determine', title='System Locale'))
+        metrics = Uncached(metrics)
+    metrics.append(Metric('timezone', time.tzname[0] if time.tzname else 'Unknown', title='Timezone'))
+
+    return metrics
 
+@register('users', 'System', CHEAP)
+@metric_collector
 def get_users_info():
-    info = {}
-    info['Current User'] = getpass.getuser()
+    metrics = [Metric('current_user', getpass.getuser(), title='Current User')]
     try:
         users = psutil.users()
-        info['Logged-in Users'] = ', '.join([user.name for user in users]) if users else 'None'
+        logged_in = ', '.join([user.name for user in users]) if users else 'None'
     except Exception:
-        info['Logged-in Users'] = 'Unable to determine'
-    return info
+        logged_in = 'Unable to determine'
+    metrics.append(Metric('logged_in_users', logged_in, title='Logged-in Users'))
+    return metrics
 
+@register('boot', 'System', CHEAP)
+@metric_collector
 def get_boot_info():
-    info = {}
     try:
-        boot_time = datetime.datetime.fromtimestamp(psutil.boot_time())
-        info['Boot Time'] = boot_time.strftime("%Y-%m-%d %H:%M:%S")
-        uptime = datetime.datetime.now() - boot_time
-        info['Uptime'] = str(uptime).split('.')[0]  # Remove microseconds
+        boot_time = psutil.boot_time()
     except Exception:
-        info['Boot Time'] = 'Unknown'
-        info['Uptime'] = 'Unknown'
-    return info
+        return [Metric('boot_time', 'Unknown', title='Boot Time'),
+                Metric('uptime', 'Unknown', title='Uptime')]
+    return [
+        Metric('boot_time', boot_time, TIMESTAMP, 'Boot Time'),
+        Metric('uptime', time.time() - boot_time, DURATION, 'Uptime'),
+    ]
+
+# (ranking field, metric name, unit, group title)
+PROCESS_TOPS = (
+    ('cpu', 'process_top_cpu', PERCENT, 'Top Processes by CPU (%)'),
+    ('rss', 'process_top_memory', BYTES, 'Top Processes by Memory'),
+    ('fds', 'process_top_fds', COUNT, 'Top Processes by Open Files'),
+    ('threads', 'process_top_threads', COUNT, 'Top Processes by Threads'),
+)
+
+@register('processes', 'System', MODERATE)
+@metric_collector
+def get_processes_info():
+    try:
+        procs, window = processes.process_sampler.sample()
+    except Exception as e:
+        return [Metric('processes', str(e), title='Processes Error')]
+    metrics = [
+        Metric('process_count', len(procs), COUNT, 'Process Count'),
+        Metric('thread_count', sum(p.threads for p in procs if p.threads > 0), COUNT, 'Thread Count'),
+        # None when CPU figures are averages over each process's lifetime
+        Metric('process_cpu_window', window, SECONDS, 'Process CPU Window (s)'),
+    ]
+    for status, count in processes.status_counts(procs).items():
+        metrics.append(Metric('processes_by_status', count, COUNT, ('Process States', '{status}'),
+                              {'status': status}))
+    for field, name, unit, group in PROCESS_TOPS:
+        for rank, proc in enumerate(processes.top(procs, field, options.process_top), 1):
+            metrics.append(Metric(name, getattr(proc, field), unit, (group, '{rank}. {name} ({pid})'),
+                                  {'rank': rank, 'pid': proc.pid, 'name': proc.name}))
+    return metrics
 
 def get_basic_info():
     data = {}
     data.update(get_os_info())
     data.update(get_users_info())
     data.update(get_boot_info())
+    data.update(get_processes_info())
     return data
@@ -0,0 +1,130 @@
+import glob
+import os
+import pathlib
+import shutil
+import sys
+import tempfile
+
+# History databases are queried with SQL aggregates only, so memory use does
+# not depend on how much history there is, and no URL ever leaves SQLite.
+
+# Seconds between the browser's epoch and the Unix epoch
+CHROMIUM_EPOCH = -11644473600  # 1601-01-01, microseconds
+SAFARI_EPOCH = 978307200       # 2001-01-01, seconds
+
+# kind -> (count query, last visit query, timestamp divisor, epoch offset)
+QUERIES = {
+    'chromium': ('SELECT COUNT(*) FROM urls',
+                 'SELECT MAX(last_visit_time) FROM urls', 1_000_000, CHROMIUM_EPOCH),
+    'firefox': ('SELECT COUNT(*) FROM moz_places WHERE last_visit_date IS NOT NULL',
+                'SELECT MAX(last_visit_date) FROM moz_places', 1_000_000, 0),
+    'safari': ('SELECT COUNT(*) FROM history_items',
+               'SELECT MAX(visit_time) FROM history_visits', 1, SAFARI_EPOCH),
+}
+
+
+def _profile_patterns(home, platform):
+    if platform == 'win32':
+        local = os.environ.get('LOCALAPPDATA') or os.path.join(home, 'AppData', 'Local')
+        roaming = os.environ.get('APPDATA') or os.path.join(home, 'AppData', 'Roaming')
+        return [
+            ('Chrome', 'chromium', os.path.join(local, 'Google', 'Chrome', 'User Data', '*', 'History')),
+            ('Edge', 'chromium', os.path.join(local, 'Microsoft', 'Edge', 'User Data', '*', 'History')),
+            ('Brave', 'chromium', os.path.join(local, 'BraveSoftware', 'Brave-Browser', 'User Data', '*', 'History')),
+            ('Firefox', 'firefox', os.path.join(roaming, 'Mozilla', 'Firefox', 'Profiles', '*', 'places.sqlite')),
+        ]
+    if platform == 'darwin':
+        support = os.path.join(home, 'Library', 'Application Support')
+        return [
+            ('Chrome', 'chromium', os.path.join(support, 'Google', 'Chrome', '*', 'History')),
+            ('Chromium', 'chromium', os.path.join(support, 'Chromium', '*', 'History')),
+            ('Edge', 'chromium', os.path.join(support, 'Microsoft Edge', '*', 'History')),
+            ('Brave', 'chromium', os.path.join(support, 'BraveSoftware', 'Brave-Browser', '*', 'History')),
+            ('Firefox', 'firefox', os.path.join(support, 'Firefox', 'Profiles', '*', 'places.sqlite')),
+            ('Safari', 'safari', os.path.join(home, 'Library', 'Safari', 'History.db')),
+        ]
+    config = os.environ.get('XDG_CONFIG_HOME') or os.path.join(home, '.config')
+    return [
+        ('Chrome', 'chromium', os.path.join(config, 'google-chrome', '*', 'History')),
+        ('Chromium', 'chromium', os.path.join(config, 'chromium', '*', 'History')),
+        ('Edge', 'chromium', os.path.join(config, 'microsoft-edge', '*', 'History')),
+        ('Brave', 'chromium', os.path.join(config, 'BraveSoftware', 'Brave-Browser', '*', 'History')),
+        ('Firefox', 'firefox', os.path.join(home, '.mozilla', 'firefox', '*', 'places.sqlite')),
+    ]
+
+
+def find_history_databases(home=None, platform=None):
+    """Return [(browser, kind, path)] for every history database found."""
+    home = home or os.path.expanduser('~')
+    platform = platform or sys.platform
+    found = []
+    for browser, kind, pattern in _profile_patterns(home, platform):
+        for path in sorted(glob.glob(pattern)):
+            if os.path.isfile(path):
+                found.append((browser, kind, path))
+    return found
+
+
+def _query(path, kind):
+    import sqlite3
+    count_sql, last_sql, _, _ = QUERIES[kind]
+    uri = pathlib.Path(os.path.abspath(path)).as_uri() + '?mode=ro'
+    conn = sqlite3.connect(uri, uri=True, timeout=0)
+    try:
+        count = conn.execute(count_sql).fetchone()[0]
+        last = conn.execute(last_sql).fetchone()[0]
+    finally:
+        conn.close()
+    return count, last
+
+
+def _query_snapshot(path, kind):
+    # A running browser keeps its database locked; query a private copy
+    # (with its WAL, if any) instead of waiting for the lock.
+    tmpdir = tempfile.mkdtemp(prefix='script-info-history-')
+    try:
+        copy = os.path.join(tmpdir, os.path.basename(path))
+        shutil.copyfile(path, copy)
+        if os.path.exists(path + '-wal'):
+            shutil.copyfile(path + '-wal', copy + '-wal')
+        return _query(copy, kind)
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def history_stats(path, kind):
+    """
+    Return (visited URL count, last visit as a Unix timestamp or None) for
+    one history database, opened read-only.
+    """
+    import sqlite3
+    try:
+        count, last = _query(path, kind)
+    except sqlite3.OperationalError as e:
+        if 'locked' not in str(e):
+            raise
+        count, last = _query_snapshot(path, kind)
+    _, _, divisor, epoch = QUERIES[kind]
+    if last:
+        last = last / divisor + epoch
+    return count, last or None
+
+
+def browser_history_stats(home=None, platform=None):
+    """
+    Aggregate history across each browser's profiles: returns {browser:
+    {'count': visited URLs, 'last': latest visit as a Unix timestamp or
+    None, 'errors': profiles that could not be read}}.
+    """
+    totals = {}
+    for browser, kind, path in find_history_databases(home, platform):
+        entry = totals.setdefault(browser, {'count': 0, 'last': None, 'errors': 0})
+        try:
+            count, last = history_stats(path, kind)
+        except Exception:
+            entry['errors'] += 1
+            continue
+        entry['count'] += count
+        if last and (entry['last'] is None or last > entry['last']):
+            entry['last'] = last
+    return totals
@@ -0,0 +1,197 @@
+import functools
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import psutil
+
+from .model import decode_metrics, encode_metrics
+
+# Facts like the OS release, BIOS or CPU topology only change across a
+# reboot or a software install, so they are kept on disk between runs.
+CACHE_DIR_ENV = 'SCRIPT_INFO_CACHE_DIR'
+NO_CACHE_ENV = 'SCRIPT_INFO_NO_CACHE'
+CACHE_FILENAME = 'static-facts.json'
+# 4: placeholder results are no longer stored
+CACHE_VERSION = 4
+DEFAULT_TTL = 24 * 3600
+
+# Environment that changes what the static collectors report
+FINGERPRINT_ENV = ('PATH', 'LANG', 'LC_ALL', 'TZ')
+
+
+def default_cache_dir():
+    if os.environ.get(CACHE_DIR_ENV):
+        return os.environ[CACHE_DIR_ENV]
+    if sys.platform == 'win32' and os.environ.get('LOCALAPPDATA'):
+        return os.path.join(os.environ['LOCALAPPDATA'], 'script-info', 'Cache')
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'script-info')
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def current_fingerprint():
+    try:
+        boot_time = psutil.boot_time()
+    except Exception:
+        boot_time = None
+    fingerprint = {'boot_time': boot_time}
+    for name in FINGERPRINT_ENV:
+        fingerprint[name] = os.environ.get(name)
+    return fingerprint
+
+
+def _same_fingerprint(stored, current):
+    stored = dict(stored)
+    current = dict(current)
+    stored_boot, current_boot = stored.pop('boot_time', None), current.pop('boot_time', None)
+    # boot_time is derived from uptime on some platforms and can jitter by a second
+    if stored_boot is None or current_boot is None or abs(stored_boot - current_boot) > 1:
+        return False
+    return stored == current
+
+
+class StaticCache:
+    """
+    On-disk cache of static facts. An entry is valid while its TTL has not
+    expired, the boot time and relevant environment (PATH, locale) are
+    unchanged, and every file recorded with it still has the same mtime.
+    Writes go to a temporary file that is atomically renamed into place.
+    """
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL):
+        self.path = path or os.path.join(default_cache_dir(), CACHE_FILENAME)
+        self.ttl = ttl
+        self.enabled = not os.environ.get(NO_CACHE_ENV)
+        self._entries = None
+        self._fingerprint = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    data = json.load(f)
+                self._entries = data['entries'] if data.get('version') == CACHE_VERSION else {}
+            except (OSError, ValueError, KeyError, AttributeError):
+                self._entries = {}
+            self._fingerprint = current_fingerprint()
+        return self._entries
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix='.static-facts-', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'entries': self._entries}, f)
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._load().get(key)
+            if entry is None:
+                return None
+            if time.time() - entry.get('stored', 0) > self.ttl:
+                return None
+            if not _same_fingerprint(entry.get('fingerprint', {}), self._fingerprint):
+                return None
+            for path, mtime in entry.get('files', {}).items():
+                if _mtime(path) != mtime:
+                    return None
+            return entry.get('value')
+
+    def set(self, key, value, files=()):
+        self.set_many([(key, value, files)])
+
+    def set_many(self, items):
+        """Store several (key, value, files) entries with a single write."""
+        if not self.enabled:
+            return
+        with self._lock:
+            entries = self._load()
+            now = time.time()
+            for key, value, files in items:
+                entries[key] = {
+                    'stored': now,
+                    'fingerprint': self._fingerprint,
+                    'files': {path: _mtime(path) for path in files},
+                    'value': value,
+                }
+            try:
+                self._save()
+            except OSError:
+                # A read-only home directory just means no caching
+                pass
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+_default_cache = None
+
+
+def get_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = StaticCache()
+    return _default_cache
+
+
+def set_cache(cache):
+    """Replace the process-wide cache, e.g. with StaticCache(path) in tests."""
+    global _default_cache
+    _default_cache = cache
+
+
+class Uncached(list):
+    """
+    Metrics a static_fact collector returns but that must not be cached,
+    e.g. 'py-cpuinfo not installed' or an error: they are only true until
+    the package is installed or the error goes away.
+    """
+
+
+def static_fact(key, files=None):
+    """
+    Decorator caching a collector's metrics in the static-facts cache.
+    `files` is an optional callable returning paths whose mtimes are
+    recorded with the entry; touching any of them invalidates it. Uncached
+    results are returned without being stored.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper():
+            cache = get_cache()
+            value = cache.get(key)
+            if value is not None:
+                return decode_metrics(value)
+            metrics = func()
+            if isinstance(metrics, Uncached):
+                return metrics
+            cache.set(key, encode_metrics(metrics), files() if files else ())
+            return metrics
+        return wrapper
+    return decorator
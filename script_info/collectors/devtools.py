@@ -0,0 +1,147 @@
+import os
+import re
+import subprocess
+import sys
+
+from .cache import get_cache
+from .engine import UNFINISHED, map_with_deadline
+
+# Tool name -> (executables in order of preference, version arguments)
+DEV_TOOLS = {
+    'Python': (['python3', 'python'], ['--version']),
+    'Java': (['java'], ['-version']),
+    'GCC': (['gcc'], ['--version']),
+    'Clang': (['clang'], ['--version']),
+    'Go': (['go'], ['version']),
+    'Rust': (['rustc'], ['--version']),
+    'Node.js': (['node'], ['--version']),
+    'Perl': (['perl'], ['--version']),
+    'Ruby': (['ruby'], ['--version']),
+    'PHP': (['php'], ['--version']),
+    '.NET': (['dotnet'], ['--version']),
+    'Git': (['git'], ['--version']),
+    'Docker': (['docker'], ['--version']),
+    'CMake': (['cmake'], ['--version']),
+    'Make': (['make', 'gmake'], ['--version']),
+    'VS Code': (['code'], ['--version']),
+}
+
+PROBE_TIMEOUT = 3.0
+PROBE_WORKERS = 8
+
+VERSION_RE = re.compile(r'(\d+\.\d+(?:\.\d+)*)')
+
+
+def _path_extensions():
+    if sys.platform != 'win32':
+        return None
+    return [ext.lower() for ext in os.environ.get('PATHEXT', '.COM;.EXE;.BAT;.CMD').split(';') if ext]
+
+
+def build_path_index(path=None):
+    """
+    Map executable names to their first location on PATH with a single
+    os.scandir pass per directory, instead of one shutil.which() (which
+    rescans every directory) per lookup. On Windows names are indexed
+    without their PATHEXT extension, matching what which() accepts.
+    """
+    if path is None:
+        path = os.environ.get('PATH', '')
+    extensions = _path_extensions()
+    index = {}
+    for directory in path.split(os.pathsep):
+        if not directory:
+            continue
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if extensions is not None:
+                    base, ext = os.path.splitext(name)
+                    if ext.lower() not in extensions:
+                        continue
+                    name = base.lower()
+                index.setdefault(name, entry.path)
+    return index
+
+
+def _is_executable(path):
+    return os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def find_tools(index, tools=DEV_TOOLS):
+    """Return {tool name: executable path or None}."""
+    found = {}
+    for tool, (executables, _) in tools.items():
+        found[tool] = next((index[exe] for exe in executables
+                            if exe in index and _is_executable(index[exe])), None)
+    return found
+
+
+def parse_version(output):
+    for line in output.splitlines():
+        match = VERSION_RE.search(line)
+        if match:
+            return match.group(1)
+    return None
+
+
+def probe_version(path, args, timeout=PROBE_TIMEOUT):
+    try:
+        result = subprocess.run([path, *args], capture_output=True, text=True,
+                                stdin=subprocess.DEVNULL, timeout=timeout, errors='replace')
+    except (OSError, subprocess.SubprocessError):
+        return None
+    # Java and some others print their version on stderr
+    return parse_version(result.stdout) or parse_version(result.stderr)
+
+
+def _cache_key(path):
+    return f'version:{path}'
+
+
+def detect_dev_tools(tools=DEV_TOOLS, path=None, timeout=PROBE_TIMEOUT):
+    """
+    Detect tools on PATH and their versions. Versions are cached per binary
+    path and invalidated when the binary's mtime changes; uncached probes
+    run in parallel, each bounded by `timeout`.
+    """
+    located = find_tools(build_path_index(path), tools)
+    cache = get_cache()
+    versions = {}
+    to_probe = []
+    for tool, exe in located.items():
+        if exe is None:
+            continue
+        cached = cache.get(_cache_key(exe))
+        if cached is not None:
+            versions[tool] = cached
+        else:
+            to_probe.append(tool)
+
+    if to_probe:
+        # subprocess.run kills a child at `timeout`, but can still wait on
+        # grandchildren holding its pipes; the outer deadline covers that.
+        probed = map_with_deadline(lambda tool: probe_version(located[tool], tools[tool][1], timeout),
+                                   to_probe, timeout + 1.0, PROBE_WORKERS)
+        new_entries = []
+        for tool, version in zip(to_probe, probed):
+            if version is UNFINISHED:
+                continue
+            versions[tool] = version
+            # Failed probes are retried next run rather than cached
+            if version:
+                new_entries.append((_cache_key(located[tool]), version, [located[tool]]))
+        if new_entries:
+            cache.set_many(new_entries)
+
+    result = {}
+    for tool, exe in located.items():
+        if exe is None:
+            result[tool] = 'Not detected'
+        else:
+            result[tool] = versions.get(tool) or 'Installed (version unknown)'
+    return result
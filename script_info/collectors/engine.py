@@ -0,0 +1,157 @@
+import queue
+import sys
+import threading
+import time
+
+from .profiling import CollectorTiming, STATUS_TIMED_OUT, call_timed
+
+# Seconds the whole run may take before outstanding collectors are abandoned
+DEFAULT_TIMEOUT = 15.0
+# Seconds a single collector may take, unless overridden per collector
+DEFAULT_COLLECTOR_TIMEOUT = 10.0
+
+TIMED_OUT = 'Timed out'
+
+
+def timed_out_result(name, seconds):
+    return {f'{name} Collector': f'{TIMED_OUT} after {seconds:g}s'}
+
+
+def error_result(name, exc):
+    return {f'{name} Collector': f'Error: {exc}'}
+
+
+def _worker(name, func, results):
+    if sys.platform == 'win32':
+        # WMI needs COM initialised on every thread that talks to it
+        try:
+            import pythoncom
+            pythoncom.CoInitialize()
+        except ImportError:
+            pass
+    results.put((name, *call_timed(name, func)))
+
+
+def _collector_timeout(name, collector_timeout):
+    if isinstance(collector_timeout, dict):
+        return collector_timeout.get(name, DEFAULT_COLLECTOR_TIMEOUT)
+    if collector_timeout is None:
+        return DEFAULT_COLLECTOR_TIMEOUT
+    return collector_timeout
+
+
+def run_collectors(collectors, timeout=DEFAULT_TIMEOUT, collector_timeout=None, timings=None):
+    """
+    Run (name, func) collectors concurrently and yield (name, result) pairs
+    as each one finishes. Collectors that miss their deadline, or the global
+    one, yield a timed-out marker instead of blocking the rest of the run.
+    If `timings` is a dict it is filled with a CollectorTiming per name.
+    """
+    # Plain daemon threads rather than a ThreadPoolExecutor: executor workers
+    # are joined at interpreter exit, so a hung collector would hang the CLI.
+    results = queue.Queue()
+    start = time.monotonic()
+    global_deadline = start + timeout if timeout is not None else None
+
+    pending = {}
+    for name, func in collectors:
+        limit = _collector_timeout(name, collector_timeout)
+        deadline = start + limit if limit is not None else None
+        if global_deadline is not None and (deadline is None or global_deadline < deadline):
+            deadline = global_deadline
+        pending[name] = deadline
+        thread = threading.Thread(target=_worker, args=(name, func, results),
+                                  name=f'script-info-{name}', daemon=True)
+        thread.start()
+
+    while pending:
+        deadlines = [d for d in pending.values() if d is not None]
+        wait = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+        try:
+            name, result, exc, timing = results.get(timeout=wait)
+        except queue.Empty:
+            now = time.monotonic()
+            for name, deadline in list(pending.items()):
+                if deadline is not None and deadline <= now:
+                    del pending[name]
+                    if timings is not None:
+                        timings[name] = CollectorTiming(name, now - start, status=STATUS_TIMED_OUT)
+                    yield name, timed_out_result(name, round(deadline - start, 2))
+            continue
+
+        if name not in pending:
+            # Finished after its deadline was already reported
+            continue
+        del pending[name]
+        if timings is not None:
+            timings[name] = timing
+        yield name, error_result(name, exc) if exc is not None else result
+
+
+# Returned by map_with_deadline for items that did not finish in time
+UNFINISHED = object()
+
+
+def map_with_deadline(func, items, timeout, max_workers=16):
+    """
+    Apply func to every item on a bounded set of daemon worker threads and
+    return the results in item order. Items that have not finished when
+    `timeout` seconds have passed are returned as UNFINISHED; a call that
+    hangs (stale NFS mount, stuck child process) only ties up its own
+    worker, and never blocks interpreter exit. Exceptions yield None.
+    """
+    items = list(items)
+    results = [UNFINISHED] * len(items)
+    if not items:
+        return results
+    work = queue.Queue()
+    for i in range(len(items)):
+        work.put(i)
+    remaining = [len(items)]
+    done = threading.Condition()
+
+    def worker():
+        while True:
+            try:
+                i = work.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                value = func(items[i])
+            except Exception:
+                value = None
+            with done:
+                results[i] = value
+                remaining[0] -= 1
+                done.notify()
+
+    for _ in range(min(max_workers, len(items))):
+        threading.Thread(target=worker, name='script-info-worker', daemon=True).start()
+
+    deadline = time.monotonic() + timeout
+    with done:
+        while remaining[0]:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                break
+            done.wait(left)
+        # Snapshot under the lock; late finishers must not change the answer
+        snapshot = list(results)
+    # Unstarted items are dropped so idle workers exit instead of picking them up
+    while True:
+        try:
+            work.get_nowait()
+        except queue.Empty:
+            break
+    return snapshot
+
+
+def collect(collectors, timeout=DEFAULT_TIMEOUT, collector_timeout=None, timings=None):
+    """
+    Run collectors concurrently and merge their results in declaration order.
+    """
+    results = dict(run_collectors(collectors, timeout, collector_timeout, timings))
+    data = {}
+    for name, _ in collectors:
+        data.update(results.get(name) or {})
+    return data
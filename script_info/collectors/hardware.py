@@ -1,121 +1,239 @@
-import psutil
+from .procfs import system
+import os
 import platform
-import threading
-import datetime
 import shutil
+from .registry import register, CHEAP, EXPENSIVE
+from .optional import optional_import
+from .cache import Uncached, static_fact
+from .isolation import isolated
+from .model import Metric, metric_collector, BYTES, CELSIUS, COUNT, DURATION, MHZ, PERCENT, RPM, SECONDS
+from .options import options
+from . import sampling, sensors
 
-# Optional imports
-try:
-    import GPUtil
-    GPU_AVAILABLE = True
-except ImportError:
-    GPU_AVAILABLE = False
-
-try:
-    import wmi
-    WMI_AVAILABLE = True
-except ImportError:
-    WMI_AVAILABLE = False
-
-try:
-    import cpuinfo
-    CPUINFO_AVAILABLE = True
-except ImportError:
-    CPUINFO_AVAILABLE = False
+@static_fact('cpu_topology')
+def get_cpu_topology_info():
+    return [
+        Metric('cpu_physical_cores', system.cpu_count(logical=False), COUNT, 'CPU Physical Cores'),
+        Metric('cpu_logical_cores', system.cpu_count(logical=True), COUNT, 'CPU Logical Cores'),
+    ]
 
+@register('cpu', 'Hardware', CHEAP)
+@metric_collector
 def get_cpu_info():
-    info = {}
-    info['CPU Physical Cores'] = psutil.cpu_count(logical=False)
-    info['CPU Logical Cores'] = psutil.cpu_count(logical=True)
-    
-    freq = psutil.cpu_freq()
-    info['CPU Frequency (MHz)'] = freq.current if freq else 'N/A'
-    info['CPU Usage (%)'] = psutil.cpu_percent(interval=0.1) # Reduced interval for speed
-
-    cpu_times = psutil.cpu_times()
-    info['CPU User Time'] = f"{cpu_times.user:.2f}s"
-    info['CPU System Time'] = f"{cpu_times.system:.2f}s"
-    info['CPU Idle Time'] = f"{cpu_times.idle:.2f}s"
-
-    # Deeper CPU information - temporarily disabled in original code "due to hanging issues"
-    # Keeping it optional/disabled or improving timeout
-    info['CPU Details'] = 'CPU info collection skipped (performance)'
-    
-    return info
+    metrics = list(get_cpu_topology_info())
 
+    freq = system.cpu_freq()
+    metrics.append(Metric('cpu_frequency', freq.current if freq else 'N/A', MHZ, 'CPU Frequency (MHz)'))
+
+    # Utilisation since the sampler's baseline (process start or the previous
+    # snapshot) instead of sleeping in cpu_percent(interval=...)
+    usage = sampling.cpu_sampler.sample(options.cpu_min_window)
+    if usage and usage.get('since_boot'):
+        # Too short a window to measure: the average since boot is a different figure
+        metrics.append(Metric('cpu_usage', 'N/A (sampling window too short)', title='CPU Usage (%)'))
+        metrics.append(Metric('cpu_usage_since_boot', usage['total']['usage'], PERCENT,
+                              'CPU Usage Since Boot (%)'))
+    elif usage:
+        metrics.append(Metric('cpu_usage', usage['total']['usage'], PERCENT, 'CPU Usage (%)'))
+        metrics.append(Metric('cpu_usage_window', usage['window'], SECONDS, 'CPU Usage Window (s)'))
+        for field, label in sampling.CPU_MODES:
+            if field in usage['total']:
+                metrics.append(Metric(f'cpu_{field}', usage['total'][field], PERCENT, f'CPU {label} (%)'))
+        for i, core in enumerate(usage['per_core']):
+            metrics.append(Metric('cpu_core_usage', core['usage'] if core else None, PERCENT,
+                                  ('CPU Per-Core Usage (%)', 'Core {core}'), {'core': i + 1}))
+    else:
+        metrics.append(Metric('cpu_usage', 'N/A (sampling window too short)', title='CPU Usage (%)'))
+
+    cpu_times = system.cpu_times()
+    metrics.append(Metric('cpu_time_user', cpu_times.user, SECONDS, 'CPU User Time'))
+    metrics.append(Metric('cpu_time_system', cpu_times.system, SECONDS, 'CPU System Time'))
+    metrics.append(Metric('cpu_time_idle', cpu_times.idle, SECONDS, 'CPU Idle Time'))
+
+    return metrics
+
+# py-cpuinfo key -> (metric name, unit, title)
+CPUINFO_FIELDS = (
+    ('brand_raw', 'cpu_brand', None, 'CPU Brand'),
+    ('vendor_id_raw', 'cpu_vendor', None, 'CPU Vendor'),
+    ('arch', 'cpu_architecture', None, 'CPU Architecture'),
+    ('bits', 'cpu_bits', None, 'CPU Bits'),
+    ('family', 'cpu_family', None, 'CPU Family'),
+    ('model', 'cpu_model', None, 'CPU Model'),
+    ('stepping', 'cpu_stepping', None, 'CPU Stepping'),
+    ('l1_data_cache_size', 'cpu_l1_data_cache', BYTES, 'CPU L1 Data Cache'),
+    ('l1_instruction_cache_size', 'cpu_l1_instruction_cache', BYTES, 'CPU L1 Instruction Cache'),
+    ('l2_cache_size', 'cpu_l2_cache', BYTES, 'CPU L2 Cache'),
+    ('l3_cache_size', 'cpu_l3_cache', BYTES, 'CPU L3 Cache'),
+)
+
+# py-cpuinfo has been known to hang (it runs CPUID in a child process), so
+# it runs isolated and its result is cached until the next boot
+@register('cpu_details', 'Hardware', EXPENSIVE)
+@metric_collector
+@static_fact('cpu_details')
+@isolated()
+def get_cpu_details_info():
+    cpuinfo = optional_import('cpuinfo')
+    if cpuinfo is None:
+        return Uncached([Metric('cpu_details', 'py-cpuinfo not installed', title='CPU Details')])
+    info = cpuinfo.get_cpu_info()
+    metrics = []
+    for key, name, unit, title in CPUINFO_FIELDS:
+        value = info.get(key)
+        if value is None:
+            continue
+        # Older py-cpuinfo reports cache sizes as text, e.g. '256 KiB'
+        metrics.append(Metric(name, value, unit if isinstance(value, int) else None, title))
+    advertised = info.get('hz_advertised')
+    if advertised and advertised[0]:
+        metrics.append(Metric('cpu_advertised_frequency', advertised[0] / 1e6, MHZ, 'CPU Advertised Frequency (MHz)'))
+    flags = info.get('flags')
+    if flags:
+        metrics.append(Metric('cpu_flags', sorted(flags), None, 'CPU Flags'))
+    return metrics
+
+@register('memory', 'Hardware', CHEAP)
+@metric_collector
 def get_memory_info():
-    info = {}
-    mem = psutil.virtual_memory()
-    info['Total Memory (GB)'] = round(mem.total / (1024**3), 2)
-    info['Available Memory (GB)'] = round(mem.available / (1024**3), 2)
-    info['Used Memory (GB)'] = round(mem.used / (1024**3), 2)
-    info['Memory Usage (%)'] = mem.percent
-
-    swap = psutil.swap_memory()
-    info['Total Swap (GB)'] = round(swap.total / (1024**3), 2)
-    info['Used Swap (GB)'] = round(swap.used / (1024**3), 2)
-    info['Free Swap (GB)'] = round(swap.free / (1024**3), 2)
-    info['Swap Usage (%)'] = swap.percent
-    return info
+    mem = system.virtual_memory()
+    swap = system.swap_memory()
+    return [
+        Metric('memory_total', mem.total, BYTES, 'Total Memory (GB)'),
+        Metric('memory_available', mem.available, BYTES, 'Available Memory (GB)'),
+        Metric('memory_used', mem.used, BYTES, 'Used Memory (GB)'),
+        Metric('memory_usage', mem.percent, PERCENT, 'Memory Usage (%)'),
+        Metric('swap_total', swap.total, BYTES, 'Total Swap (GB)'),
+        Metric('swap_used', swap.used, BYTES, 'Used Swap (GB)'),
+        Metric('swap_free', swap.free, BYTES, 'Free Swap (GB)'),
+        Metric('swap_usage', swap.percent, PERCENT, 'Swap Usage (%)'),
+    ]
+
+def find_nvidia_smi():
+    """The nvidia-smi GPUtil would run, or None when there is none to run."""
+    path = shutil.which('nvidia-smi')
+    if path is None and platform.system() == 'Windows':
+        # GPUtil's fallback when nvidia-smi is not on PATH
+        fallback = os.path.join(os.environ.get('systemdrive', 'C:') + os.sep, 'Program Files',
+                                'NVIDIA Corporation', 'NVSMI', 'nvidia-smi.exe')
+        path = fallback if os.path.isfile(fallback) else None
+    return path
 
+@register('gpu', 'Hardware', EXPENSIVE)
+@metric_collector
 def get_gpu_info():
-    info = {}
-    if GPU_AVAILABLE:
-        try:
-            gpus = GPUtil.getGPUs()
-            if gpus:
-                for i, gpu in enumerate(gpus):
-                    info[f'GPU {i+1} Name'] = gpu.name
-                    info[f'GPU {i+1} Memory Total (GB)'] = round(gpu.memoryTotal / 1024, 2)
-                    info[f'GPU {i+1} Memory Used (GB)'] = round(gpu.memoryUsed / 1024, 2)
-                    info[f'GPU {i+1} Memory Free (GB)'] = round(gpu.memoryFree / 1024, 2)
-                    info[f'GPU {i+1} Usage (%)'] = round(gpu.load * 100, 1)
-                    info[f'GPU {i+1} Temperature (°C)'] = round(gpu.temperature, 1)
-            else:
-                info['GPU'] = 'No GPU detected'
-        except Exception as e:
-            info['GPU'] = f'GPU info unavailable: {str(e)}'
-    else:
-        info['GPU'] = 'GPUtil not installed'
-    return info
+    # Checked here so hosts without GPU tools never start a worker
+    if optional_import('GPUtil') is None:
+        return [Metric('gpu', 'GPUtil not installed', title='GPU')]
+    if find_nvidia_smi() is None:
+        return [Metric('gpu', 'No GPU detected', title='GPU')]
+    return read_gpus()
+
+# GPUtil runs nvidia-smi without a timeout
+@isolated()
+def read_gpus():
+    GPUtil = optional_import('GPUtil')
+    try:
+        gpus = GPUtil.getGPUs()
+    except Exception as e:
+        return [Metric('gpu', f'GPU info unavailable: {str(e)}', title='GPU')]
+    if not gpus:
+        return [Metric('gpu', 'No GPU detected', title='GPU')]
+
+    metrics = []
+    for i, gpu in enumerate(gpus):
+        # Identical cards share a name; the UUID tells their series apart
+        labels = {'index': i + 1, 'gpu': gpu.name, 'uuid': getattr(gpu, 'uuid', None) or str(gpu.id)}
+        # GPUtil reports memory in MiB and load as a 0-1 fraction
+        metrics.extend([
+            Metric('gpu_name', gpu.name, None, 'GPU {index} Name', labels),
+            Metric('gpu_memory_total', gpu.memoryTotal * 1024**2, BYTES, 'GPU {index} Memory Total (GB)', labels),
+            Metric('gpu_memory_used', gpu.memoryUsed * 1024**2, BYTES, 'GPU {index} Memory Used (GB)', labels),
+            Metric('gpu_memory_free', gpu.memoryFree * 1024**2, BYTES, 'GPU {index} Memory Free (GB)', labels),
+            Metric('gpu_usage', gpu.load * 100, PERCENT, 'GPU {index} Usage (%)', labels),
+            Metric('gpu_temperature', gpu.temperature, CELSIUS, 'GPU {index} Temperature (°C)', labels),
+        ])
+    return metrics
+
+# kind -> (metric name, unit, display unit)
+SENSOR_METRICS = {
+    'temperature': ('temperature', CELSIUS, '°C'),
+    'fan': ('fan_speed', RPM, 'RPM'),
+}
 
+@register('sensors', 'Hardware', CHEAP)
+@metric_collector
+def get_sensors_info():
+    if not sensors.supported():
+        return [Metric('sensors', 'Not supported on this platform', title='Sensors')]
+    readings = sensors.sensor_set.sample()
+    if not readings:
+        return [Metric('sensors', 'None found', title='Sensors')]
+    metrics = [Metric('sensors', len(readings), COUNT, 'Sensors Count')]
+    for sensor, value in readings:
+        name, unit, shown = SENSOR_METRICS[sensor.kind]
+        labels = {'chip': sensor.chip, 'sensor': sensor.label}
+        metrics.append(Metric(name, value, unit, ('{chip} Sensors', f'{{sensor}} ({shown})'), labels))
+        for threshold, limit in sensor.thresholds:
+            metrics.append(Metric(f'{name}_{threshold}', limit, unit,
+                                  ('{chip} Sensors', f'{{sensor}} {threshold.title()} ({shown})'), labels))
+    return metrics
+
+@register('battery', 'Hardware', CHEAP)
+@metric_collector
 def get_battery_info():
-    info = {}
-    if not hasattr(psutil, "sensors_battery"):
-        info['Battery'] = 'Not supported'
-        return info
-
-    battery = psutil.sensors_battery()
-    if battery:
-        info['Battery Percentage (%)'] = battery.percent
-        info['Battery Plugged In'] = battery.power_plugged
-        info['Battery Time Left'] = str(datetime.timedelta(seconds=battery.secsleft)) if battery.secsleft != -1 else 'Calculating...'
+    if not hasattr(system, "sensors_battery"):
+        return [Metric('battery', 'Not supported', title='Battery')]
+
+    battery = system.sensors_battery()
+    if not battery:
+        return [Metric('battery', 'N/A (Desktop)', title='Battery')]
+    if battery.secsleft == system.POWER_TIME_UNLIMITED:
+        time_left = Metric('battery_time_left', 'Unlimited', title='Battery Time Left')
+    elif battery.secsleft < 0:
+        time_left = Metric('battery_time_left', 'Calculating...', title='Battery Time Left')
     else:
-        info['Battery'] = 'N/A (Desktop)'
-    return info
+        time_left = Metric('battery_time_left', battery.secsleft, DURATION, 'Battery Time Left')
+    return [
+        Metric('battery_percent', battery.percent, PERCENT, 'Battery Percentage (%)'),
+        Metric('battery_plugged', battery.power_plugged, None, 'Battery Plugged In'),
+        time_left,
+    ]
 
+@register('bios', 'Hardware', EXPENSIVE)
+@metric_collector
+@static_fact('bios')
 def get_bios_info():
-    info = {}
-    if WMI_AVAILABLE and platform.system() == 'Windows':
-        try:
-            c = wmi.WMI()
-            bios_list = c.Win32_BIOS()
-            if bios_list:
-                bios = bios_list[0]
-                info['BIOS Version'] = bios.Version
-                info['BIOS Manufacturer'] = bios.Manufacturer
-                info['BIOS Release Date'] = bios.ReleaseDate.split('.')[0] if bios.ReleaseDate else 'Unknown'
-        except Exception as e:
-             info['BIOS'] = f'Unable to retrieve: {str(e)}'
-    else:
-        info['BIOS'] = 'WMI not available or not Windows'
-    return info
+    if platform.system() != 'Windows' or optional_import('wmi') is None:
+        return Uncached([Metric('bios', 'WMI not available or not Windows', title='BIOS')])
+    return read_bios()
+
+# WMI queries can stall
+@isolated()
+def read_bios():
+    wmi = optional_import('wmi')
+    try:
+        c = wmi.WMI()
+        bios_list = c.Win32_BIOS()
+        if not bios_list:
+            return []
+        bios = bios_list[0]
+        return [
+            Metric('bios_version', bios.Version, title='BIOS Version'),
+            Metric('bios_manufacturer', bios.Manufacturer, title='BIOS Manufacturer'),
+            Metric('bios_release_date', bios.ReleaseDate.split('.')[0] if bios.ReleaseDate else 'Unknown',
+                   title='BIOS Release Date'),
+        ]
+    except Exception as e:
+        return Uncached([Metric('bios', f'Unable to retrieve: {str(e)}', title='BIOS')])
 
 def get_hardware_info():
     data = {}
     data.update(get_cpu_info())
+    data.update(get_cpu_details_info())
     data.update(get_memory_info())
     data.update(get_gpu_info())
+    data.update(get_sensors_info())
     data.update(get_battery_info())
     data.update(get_bios_info())
     return data
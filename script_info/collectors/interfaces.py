@@ -0,0 +1,98 @@
+import fnmatch
+import re
+import socket
+from collections import Counter, namedtuple
+
+import psutil
+
+Interface = namedtuple('Interface', 'name type is_up ipv4 ipv6 mac mtu speed bytes_sent bytes_recv')
+
+# Interface name patterns -> type, first match wins. Matching ignores case
+# so Windows names ('Ethernet 2', 'Wi-Fi') are covered too.
+INTERFACE_TYPES = [
+    ('lo', 'loopback'), ('lo[0-9]*', 'loopback'), ('loopback*', 'loopback'),
+    ('veth*', 'veth'),
+    ('cali*', 'calico'),
+    ('docker*', 'bridge'), ('br-*', 'bridge'), ('br[0-9]*', 'bridge'), ('virbr*', 'bridge'),
+    ('cni*', 'bridge'), ('cbr*', 'bridge'),
+    ('vxlan*', 'overlay'), ('flannel*', 'overlay'), ('weave*', 'overlay'), ('genev*', 'overlay'),
+    ('tun*', 'tunnel'), ('tap*', 'tunnel'), ('wg*', 'tunnel'), ('utun*', 'tunnel'), ('ipsec*', 'tunnel'),
+    ('bond*', 'bond'), ('team*', 'bond'),
+    ('wl*', 'wireless'), ('wi-fi*', 'wireless'), ('wlan*', 'wireless'),
+    ('*.*', 'vlan'),
+    ('eth*', 'ethernet'), ('en*', 'ethernet'), ('em[0-9]*', 'ethernet'), ('ethernet*', 'ethernet'),
+]
+
+
+def _compile(patterns):
+    """One case-insensitive regex for a list of globs, or None for no patterns."""
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{fnmatch.translate(p)})' for p in patterns), re.IGNORECASE)
+
+
+# A single alternation: one regex match per interface instead of one per pattern
+_TYPE_RE = re.compile('|'.join(f'(?P<t{i}>{fnmatch.translate(pattern)})'
+                               for i, (pattern, _) in enumerate(INTERFACE_TYPES)), re.IGNORECASE)
+
+
+def interface_type(name):
+    match = _TYPE_RE.match(name)
+    return INTERFACE_TYPES[int(match.lastgroup[1:])][1] if match else 'other'
+
+
+def interface_inventory(backend=psutil, include=None, exclude=None):
+    """
+    Combine addresses, link stats and per-NIC counters into one Interface
+    per NIC, in a single pass. `include` and `exclude` are glob lists
+    matched against the interface name.
+    """
+    addrs = backend.net_if_addrs()
+    stats = backend.net_if_stats()
+    try:
+        counters = backend.net_io_counters(pernic=True) or {}
+    except Exception:
+        counters = {}
+    include_re = _compile(include)
+    exclude_re = _compile(exclude)
+    af_inet, af_inet6, af_link = socket.AF_INET, socket.AF_INET6, backend.AF_LINK
+
+    # Interfaces without any address only show up in the link stats
+    names = list(addrs)
+    names.extend(name for name in stats if name not in addrs)
+
+    inventory = []
+    for name in names:
+        if include_re is not None and not include_re.match(name):
+            continue
+        if exclude_re is not None and exclude_re.match(name):
+            continue
+        ipv4 = ipv6 = mac = None
+        for addr in addrs.get(name, ()):
+            family = addr.family
+            if family == af_inet:
+                if ipv4 is None:
+                    ipv4 = addr.address
+            elif family == af_inet6:
+                if ipv6 is None:
+                    ipv6 = addr.address
+            elif family == af_link:
+                if mac is None:
+                    mac = addr.address
+        stat = stats.get(name)
+        io = counters.get(name)
+        inventory.append(Interface(
+            name, interface_type(name),
+            stat.isup if stat else None,
+            ipv4, ipv6, mac,
+            stat.mtu if stat else None,
+            stat.speed if stat else None,
+            io.bytes_sent if io else None,
+            io.bytes_recv if io else None,
+        ))
+    return inventory
+
+
+def summarise(inventory):
+    """Interface counts by type, most common first."""
+    return dict(Counter(nic.type for nic in inventory).most_common())
@@ -0,0 +1,251 @@
+import atexit
+import functools
+import importlib
+import os
+import queue
+import signal
+import struct
+import subprocess
+import sys
+import threading
+import time
+
+from .cache import Uncached
+from .engine import DEFAULT_COLLECTOR_TIMEOUT
+
+# Collectors that can hang inside C code or a child process (py-cpuinfo,
+# nvidia-smi behind GPUtil, WMI) run in worker processes instead of
+# threads: a thread cannot be stopped, a process can be killed. Workers are
+# started on first use as `python -m script_info.collectors.worker`, which
+# never re-imports the caller's __main__, and reused across calls. A
+# worker that misses its deadline is killed together with any children it
+# started, and replaced on the next call. Requests and replies are
+# length-prefixed frames on the worker's stdin/stdout; a reply carries one
+# binary snapshot frame (see encoding.py).
+
+# Set SCRIPT_INFO_ISOLATION=0 to run isolated collectors in-process. Frozen
+# executables cannot run `-m`, so they always do.
+ENABLED = os.environ.get('SCRIPT_INFO_ISOLATION', '1') != '0' and not getattr(sys, 'frozen', False)
+
+WORKER_MODULE = 'script_info.collectors.worker'
+
+# Worker processes kept at most; further calls wait for a free one
+DEFAULT_WORKERS = 2
+
+# Reply status; _UNCACHED is _OK for a cache.Uncached result
+_OK, _ERROR, _UNCACHED = b'\x00', b'\x01', b'\x02'
+_length = struct.Struct('>I')
+
+# 'module:qualname' -> the undecorated function, filled at import time in
+# the parent and in every worker alike
+_functions = {}
+
+
+class IsolationError(RuntimeError):
+    """An isolated call that was killed, or whose worker died."""
+
+
+def write_frame(stream, data):
+    stream.write(_length.pack(len(data)) + data)
+    stream.flush()
+
+
+def read_frame(stream):
+    """The next frame from `stream`, or None at end of file."""
+    header = stream.read(_length.size)
+    if len(header) < _length.size:
+        return None
+    data = stream.read(_length.unpack(header)[0])
+    if len(data) < _length.unpack(header)[0]:
+        return None
+    return data
+
+
+def serve(requests, replies):
+    """Worker main loop: run requested functions until `requests` is closed."""
+    from ..encoding import encode_binary
+    from .model import Section, Snapshot
+
+    if sys.platform == 'win32':
+        try:
+            import pythoncom
+            pythoncom.CoInitialize()
+        except ImportError:
+            pass
+    while True:
+        request = read_frame(requests)
+        if request is None:
+            return
+        key = request.decode('utf-8')
+        try:
+            module, _ = key.split(':', 1)
+            importlib.import_module(module)
+            metrics = _functions[key]()
+            status = _UNCACHED if isinstance(metrics, Uncached) else _OK
+            reply = status + encode_binary(Snapshot([Section(key, '', metrics)], taken_at=0.0, host=''))
+        except BaseException as e:
+            reply = _ERROR + f'{type(e).__name__}: {e}'.encode('utf-8', 'replace')
+        write_frame(replies, reply)
+
+
+def _worker_env():
+    env = dict(os.environ)
+    # The worker finds script_info (and the callers' modules) where this process does
+    env['PYTHONPATH'] = os.pathsep.join(p for p in sys.path if p and os.path.isdir(p))
+    return env
+
+
+class Worker:
+    """One worker process, with a thread queueing its replies (None once it exits)."""
+
+    __slots__ = ('process', 'replies', 'calls')
+
+    def __init__(self):
+        if sys.platform == 'win32':
+            group = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+        else:
+            # Own session and process group, so a kill also takes down nvidia-smi & co.
+            group = {'start_new_session': True}
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', WORKER_MODULE],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            env=_worker_env(), **group)
+        self.replies = queue.Queue()
+        self.calls = 0
+        threading.Thread(target=self._read, name='script-info-isolated-reader', daemon=True).start()
+
+    def _read(self):
+        try:
+            while True:
+                reply = read_frame(self.process.stdout)
+                self.replies.put(reply)
+                if reply is None:
+                    return
+        except (OSError, ValueError):
+            self.replies.put(None)
+
+    def send(self, data):
+        write_frame(self.process.stdin, data)
+
+    def close(self):
+        # The worker exits when its stdin closes
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(1)
+        except subprocess.TimeoutExpired:
+            self.kill()
+
+    def kill(self):
+        try:
+            if hasattr(os, 'killpg'):
+                os.killpg(self.process.pid, signal.SIGKILL)
+            else:
+                self.process.kill()
+        except OSError:
+            pass
+        try:
+            self.process.wait(1)
+        except subprocess.TimeoutExpired:
+            pass
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+
+class WorkerPool:
+    """
+    Up to `size` reusable worker processes. call() sends a function key to
+    an idle worker and waits at most `timeout` seconds (including any wait
+    for a free worker) for the reply. Workers still running when the
+    interpreter exits are killed.
+    """
+
+    def __init__(self, size=DEFAULT_WORKERS):
+        self.size = size
+        self._idle = []
+        self._busy = set()
+        self._cond = threading.Condition()
+        atexit.register(self.close)
+
+    def _acquire(self, deadline):
+        with self._cond:
+            while not self._idle and len(self._busy) >= self.size:
+                left = deadline - time.monotonic()
+                if left <= 0 or not self._cond.wait(left):
+                    raise IsolationError('No free worker process')
+            worker = self._idle.pop() if self._idle else None
+            if worker is None:
+                worker = Worker()
+            self._busy.add(worker)
+            return worker
+
+    def _release(self, worker, keep):
+        with self._cond:
+            self._busy.discard(worker)
+            if keep:
+                self._idle.append(worker)
+            self._cond.notify()
+
+    def call(self, key, timeout=DEFAULT_COLLECTOR_TIMEOUT):
+        """Run function `key` in a worker and return its metrics."""
+        from ..encoding import decode_binary
+
+        deadline = time.monotonic() + timeout
+        worker = self._acquire(deadline)
+        reply = None
+        try:
+            worker.send(key.encode('utf-8'))
+            reply = worker.replies.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            raise IsolationError(f'Killed after {timeout:g}s')
+        except OSError:
+            pass
+        finally:
+            if reply is None:
+                worker.kill()
+            self._release(worker, reply is not None)
+        if reply is None:
+            raise IsolationError('Worker process exited')
+        worker.calls += 1
+        if reply[:1] == _ERROR:
+            raise IsolationError(reply[1:].decode('utf-8'))
+        metrics = decode_binary(reply[1:]).sections[0].metrics
+        return Uncached(metrics) if reply[:1] == _UNCACHED else metrics
+
+    def close(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+            busy = list(self._busy)
+        for worker in idle:
+            worker.close()
+        # Hung calls the engine already gave up on
+        for worker in busy:
+            worker.kill()
+
+
+pool = WorkerPool()
+
+
+def isolated(timeout=DEFAULT_COLLECTOR_TIMEOUT):
+    """
+    Decorator running a collector function that returns a list of Metric in
+    a worker process, killed after `timeout` seconds. The function must be
+    defined at module level so the worker can import it.
+    """
+    def decorator(func):
+        key = f'{func.__module__}:{func.__qualname__}'
+        _functions[key] = func
+
+        @functools.wraps(func)
+        def wrapper():
+            if not ENABLED:
+                return func()
+            return pool.call(key, timeout)
+        wrapper.isolated = key
+        return wrapper
+    return decorator
@@ -0,0 +1,146 @@
+import functools
+import socket
+import time
+
+from .profiling import STATUS_OK
+
+# Units of raw metric values. Values are stored as measured (bytes, not GB;
+# seconds, not '1:02:03') and only formatted for display.
+BYTES = 'bytes'
+PERCENT = 'percent'
+SECONDS = 'seconds'     # a measured amount of time, e.g. CPU time
+DURATION = 'duration'   # an elapsed time shown as H:MM:SS, e.g. uptime
+TIMESTAMP = 'timestamp' # seconds since the Unix epoch
+MHZ = 'MHz'
+MBPS = 'Mbps'
+CELSIUS = 'celsius'
+RPM = 'rpm'
+COUNT = 'count'
+
+# Cumulative metrics, which only ever grow (until a reboot or driver reload)
+COUNTERS = frozenset({
+    'cpu_time_user', 'cpu_time_system', 'cpu_time_idle',
+    'disk_read', 'disk_written',
+    'network_bytes_sent', 'network_bytes_received', 'network_packets_sent', 'network_packets_received',
+    'interface_bytes_sent', 'interface_bytes_received',
+})
+
+# Display-only labels; the rest identify a series of values over time
+SKIP_LABELS = frozenset({'index'})
+
+
+class Metric:
+    """
+    One measured value. `name` identifies the metric for programs, `labels`
+    distinguish its instances (e.g. {'mount': '/'}), `unit` is one of the
+    unit constants above or None for plain values, and `title` is the
+    display key. Titles may reference labels ('Partition {index} Mount');
+    a (group, key) tuple title is shown nested under `group`.
+    """
+
+    __slots__ = ('name', 'value', 'unit', 'title', 'labels')
+
+    def __init__(self, name, value, unit=None, title=None, labels=None):
+        self.name = name
+        self.value = value
+        self.unit = unit
+        self.title = title or name
+        self.labels = labels
+
+    def __repr__(self):
+        return f'Metric({self.name!r}, {self.value!r}, {self.unit!r})'
+
+    def __eq__(self, other):
+        if not isinstance(other, Metric):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    def as_tuple(self):
+        return (self.name, self.value, self.unit, self.title, self.labels)
+
+    @classmethod
+    def from_tuple(cls, data):
+        name, value, unit, title, labels = data
+        # JSON turns tuple titles into lists
+        return cls(name, value, unit, tuple(title) if isinstance(title, list) else title, labels)
+
+
+class Section:
+    """
+    The metrics one collector produced, with its category and run status
+    (one of the profiling STATUS_* values).
+    """
+
+    __slots__ = ('collector', 'category', 'metrics', 'status')
+
+    def __init__(self, collector, category, metrics, status=STATUS_OK):
+        self.collector = collector
+        self.category = category
+        self.metrics = metrics
+        self.status = status
+
+    def __repr__(self):
+        return f'Section({self.collector!r}, {self.category!r}, {len(self.metrics)} metrics, {self.status!r})'
+
+
+class Snapshot:
+    """All sections from one collection run, in declaration order."""
+
+    __slots__ = ('sections', 'taken_at', 'host')
+
+    def __init__(self, sections, taken_at=None, host=None):
+        self.sections = sections
+        self.taken_at = time.time() if taken_at is None else taken_at
+        self.host = socket.gethostname() if host is None else host
+
+    def __iter__(self):
+        return iter(self.sections)
+
+    def __len__(self):
+        return len(self.sections)
+
+    def section(self, collector):
+        return next((s for s in self.sections if s.collector == collector), None)
+
+    def metrics(self):
+        for section in self.sections:
+            yield from section.metrics
+
+    def categories(self):
+        """{category: [sections]} in first-seen order."""
+        grouped = {}
+        for section in self.sections:
+            grouped.setdefault(section.category, []).append(section)
+        return grouped
+
+    def to_dict(self):
+        """The flat display dict that get_system_info() has always returned."""
+        from ..formatting import display_dict
+        return display_dict(self.metrics())
+
+
+def from_dict(info):
+    """Wrap a collector's display dict (e.g. from a plugin) as metrics."""
+    return [Metric(key, value, title=key) for key, value in info.items()]
+
+
+def encode_metrics(metrics):
+    return [m.as_tuple() for m in metrics]
+
+
+def decode_metrics(data):
+    return [Metric.from_tuple(item) for item in data]
+
+
+def metric_collector(func):
+    """
+    Decorator for collectors that return a list of Metric. Calling the
+    decorated function returns the display dict, as get_*_info() always
+    has; the metrics themselves are available through `.metrics`.
+    """
+    @functools.wraps(func)
+    def wrapper():
+        from ..formatting import display_dict
+        return display_dict(func())
+    wrapper.metrics = func
+    return wrapper
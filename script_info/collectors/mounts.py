@@ -0,0 +1,109 @@
+import os
+import threading
+
+import psutil
+
+from .engine import UNFINISHED, map_with_deadline
+
+# Kernel and memory-backed filesystems that hold no disk space. They are
+# skipped unless asked for explicitly by fstype.
+PSEUDO_FSTYPES = frozenset({
+    'autofs', 'binfmt_misc', 'bpf', 'cgroup', 'cgroup2', 'configfs', 'debugfs',
+    'devfs', 'devpts', 'devtmpfs', 'efivarfs', 'fusectl', 'hugetlbfs', 'mqueue',
+    'nsfs', 'proc', 'pstore', 'ramfs', 'rpc_pipefs', 'securityfs', 'selinuxfs',
+    'sysfs', 'tmpfs', 'tracefs',
+})
+
+STATVFS_TIMEOUT = 1.0
+STATVFS_WORKERS = 32
+
+UNREACHABLE = 'Unreachable (timed out)'
+STILL_HUNG = 'Unreachable (still hung)'
+
+# Mountpoints with a probe in flight. A probe stuck on a dead NFS server
+# never returns, so later runs report the mount without starting another.
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def _under_prefix(mountpoint, prefix):
+    prefix = prefix.rstrip('/\\')
+    if not prefix:
+        return True
+    return mountpoint == prefix or (mountpoint.startswith(prefix)
+                                    and mountpoint[len(prefix)] in '/\\')
+
+
+def select_partitions(partitions, fstypes=None, skip_fstypes=None, prefixes=None):
+    """
+    Filter psutil partitions. `fstypes` keeps only those types (and overrides
+    the skip list); otherwise `skip_fstypes` (default PSEUDO_FSTYPES) is
+    dropped. `prefixes` keeps only mounts at or below one of the paths.
+    """
+    if skip_fstypes is None:
+        skip_fstypes = PSEUDO_FSTYPES
+    selected = []
+    for part in partitions:
+        if fstypes is not None:
+            if part.fstype not in fstypes:
+                continue
+        elif part.fstype in skip_fstypes:
+            continue
+        if prefixes and not any(_under_prefix(part.mountpoint, p) for p in prefixes):
+            continue
+        selected.append(part)
+    return selected
+
+
+def hung_mounts():
+    with _pending_lock:
+        return set(_pending)
+
+
+def partition_usage(partitions, backend=psutil, stat=os.stat,
+                    timeout=STATVFS_TIMEOUT, max_workers=STATVFS_WORKERS):
+    """
+    Probe every partition concurrently, each bounded by `timeout`.
+
+    Returns [(partition, usage or status string, merged mountpoints)] in
+    mount order. Bind mounts, i.e. mounts reporting the same st_dev, are
+    collapsed into the first one seen and listed as its merged mountpoints.
+    """
+    def probe(mountpoint):
+        with _pending_lock:
+            _pending.add(mountpoint)
+        try:
+            try:
+                device_id = stat(mountpoint).st_dev
+            except OSError:
+                device_id = None
+            return device_id, backend.disk_usage(mountpoint)
+        finally:
+            with _pending_lock:
+                _pending.discard(mountpoint)
+
+    hung = hung_mounts()
+    to_probe = [p.mountpoint for p in partitions if p.mountpoint not in hung]
+    probed = dict(zip(to_probe, map_with_deadline(probe, to_probe, timeout, max_workers)))
+
+    results = []
+    first_by_device = {}
+    for part in partitions:
+        if part.mountpoint in hung:
+            results.append((part, STILL_HUNG, []))
+            continue
+        outcome = probed[part.mountpoint]
+        if outcome is UNFINISHED:
+            results.append((part, UNREACHABLE, []))
+        elif outcome is None:
+            results.append((part, 'Unable to access', []))
+        else:
+            device_id, usage = outcome
+            if device_id is not None and device_id in first_by_device:
+                first_by_device[device_id][2].append(part.mountpoint)
+                continue
+            entry = (part, usage, [])
+            if device_id is not None:
+                first_by_device[device_id] = entry
+            results.append(entry)
+    return results
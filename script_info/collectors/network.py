@@ -1,74 +1,102 @@
 import socket
-import psutil
+from .procfs import system
 import subprocess
+from .registry import register, CHEAP, EXPENSIVE, MODERATE
+from .options import options
+from .model import Metric, metric_collector, BYTES, COUNT, MBPS
+from .interfaces import interface_inventory, summarise
+from .ports import COMMON_PORTS, listening_sockets, scan_ports
+from . import resolve
 
+@register('hostname', 'Network', MODERATE)
+@metric_collector
 def get_basic_network_info():
-    info = {}
     try:
         hostname = socket.gethostname()
-        info['Hostname'] = hostname
-        info['FQDN'] = socket.getfqdn()
-        info['IP Address (Local)'] = socket.gethostbyname(hostname)
     except Exception:
-        info['Hostname'] = 'N/A'
-        info['FQDN'] = 'N/A'
-        info['IP Address (Local)'] = 'N/A'
-    return info
+        hostname = None
+    if not hostname:
+        return [
+            Metric('hostname', 'N/A', title='Hostname'),
+            Metric('fqdn', 'N/A', title='FQDN'),
+            Metric('local_address', 'N/A', title='IP Address (Local)'),
+        ]
 
+    # /etc/hosts first; resolver lookups are cached and bounded by a deadline
+    timeout = options.resolve_timeout
+    return [
+        Metric('hostname', hostname, title='Hostname'),
+        Metric('fqdn', resolve.fully_qualified_name(hostname, timeout) or 'N/A (resolver unavailable)',
+               title='FQDN'),
+        Metric('local_address', resolve.host_address(hostname, timeout) or 'N/A (resolver unavailable)',
+               title='IP Address (Local)'),
+    ]
+
+@register('network_io', 'Network', CHEAP)
+@metric_collector
 def get_network_io_info():
-    info = {}
-    net_io = psutil.net_io_counters()
-    info['Network Bytes Sent (MB)'] = round(net_io.bytes_sent / (1024**2), 2)
-    info['Network Bytes Received (MB)'] = round(net_io.bytes_recv / (1024**2), 2)
-    info['Network Packets Sent'] = net_io.packets_sent
-    info['Network Packets Received'] = net_io.packets_recv
-    return info
+    net_io = system.net_io_counters()
+    return [
+        Metric('network_bytes_sent', net_io.bytes_sent, BYTES, 'Network Bytes Sent (MB)'),
+        Metric('network_bytes_received', net_io.bytes_recv, BYTES, 'Network Bytes Received (MB)'),
+        Metric('network_packets_sent', net_io.packets_sent, COUNT, 'Network Packets Sent'),
+        Metric('network_packets_received', net_io.packets_recv, COUNT, 'Network Packets Received'),
+    ]
 
+@register('interfaces', 'Network', CHEAP)
+@metric_collector
 def get_interfaces_info():
-    info = {}
+    metrics = []
     try:
-        net_if = psutil.net_if_addrs()
-        if net_if:
-            info['Network Interfaces Count'] = len(net_if)
-            # Limit to 3 interfaces to avoid clutter
-            for i, (name, addrs) in enumerate(list(net_if.items())[:3]):
-                info[f'Interface {i+1} Name'] = name
-                ipv4 = next((addr.address for addr in addrs if addr.family == socket.AF_INET), 'N/A')
-                info[f'Interface {i+1} IPv4'] = ipv4
-                # MAC address lookup can vary by platform in psutil
-                # Usually AF_LINK on Unix, but on Windows it's handled differently or psutil maps it.
-                # simpler to just look for the hardware address format if possible, 
-                # but psutil usually provides AF_LINK or similar.
-                # We'll just try to find a reasonable MAC-like address if AF_LINK isn't available directly by name 
-                # (psutil constants vary by OS).
-                # safely getting the first address that looks like a MAC or isn't IPv4/6
-                mac = 'N/A'
-                for addr in addrs:
-                     if addr.family not in (socket.AF_INET, socket.AF_INET6):
-                         mac = addr.address
-                         break
-                info[f'Interface {i+1} MAC'] = mac
+        nics = interface_inventory(system, options.interface_include, options.interface_exclude)
+        if nics:
+            metrics.append(Metric('interfaces', len(nics), COUNT, 'Network Interfaces Count'))
+            metrics.append(Metric('interfaces_up', sum(1 for nic in nics if nic.is_up), COUNT,
+                                  'Network Interfaces Up'))
+            for kind, count in summarise(nics).items():
+                metrics.append(Metric('interfaces_by_type', count, COUNT,
+                                      ('Network Interface Types', '{type}'), {'type': kind}))
+            for i, nic in enumerate(nics, 1):
+                labels = {'index': i, 'interface': nic.name}
+                status = 'N/A' if nic.is_up is None else ('Up' if nic.is_up else 'Down')
+                metrics.append(Metric('interface_name', nic.name, None, 'Interface {index} Name', labels))
+                metrics.append(Metric('interface_type', nic.type, None, 'Interface {index} Type', labels))
+                metrics.append(Metric('interface_status', status, None, 'Interface {index} Status', labels))
+                metrics.append(Metric('interface_ipv4', nic.ipv4 or 'N/A', None, 'Interface {index} IPv4', labels))
+                metrics.append(Metric('interface_ipv6', nic.ipv6 or 'N/A', None, 'Interface {index} IPv6', labels))
+                metrics.append(Metric('interface_mac', nic.mac or 'N/A', None, 'Interface {index} MAC', labels))
+                if nic.mtu:
+                    metrics.append(Metric('interface_mtu', nic.mtu, COUNT, 'Interface {index} MTU', labels))
+                if nic.speed:
+                    metrics.append(Metric('interface_speed', nic.speed, MBPS, 'Interface {index} Speed (Mbps)', labels))
+                if nic.bytes_sent is not None:
+                    metrics.append(Metric('interface_bytes_sent', nic.bytes_sent, BYTES,
+                                          'Interface {index} Sent (MB)', labels))
+                    metrics.append(Metric('interface_bytes_received', nic.bytes_recv, BYTES,
+                                          'Interface {index} Received (MB)', labels))
         else:
-            info['Network Interfaces'] = 'None found'
+            metrics.append(Metric('interfaces', 'None found', title='Network Interfaces'))
     except Exception as e:
-        info['Network Interfaces Error'] = str(e)
-    return info
+        metrics.append(Metric('interfaces', str(e), title='Network Interfaces Error'))
+    return metrics
 
+@register('dns', 'Network', MODERATE)
+@metric_collector
 def get_dns_info():
-    info = {}
     try:
-        import dns.resolver
-        # This might fail if no internet
-        dns_servers = dns.resolver.get_default_resolver().nameservers
-        info['DNS Servers'] = ', '.join(dns_servers)
-    except ImportError:
-        info['DNS Servers'] = 'dnspython not installed'
+        servers = resolve.dns_servers(options.resolve_timeout)
+        if servers is None:
+            servers = 'dnspython not installed'
+        elif not servers:
+            servers = 'Unable to retrieve'
     except Exception:
-        info['DNS Servers'] = 'Unable to retrieve'
-    return info
+        servers = 'Unable to retrieve'
+    return [Metric('dns_servers', servers, title='DNS Servers')]
 
+@register('wifi', 'Network', EXPENSIVE)
+@metric_collector
 def get_wifi_info():
-    info = {}
+    metrics = []
     try:
         # Windows specific
         result = subprocess.run(['netsh', 'wlan', 'show', 'interfaces'], capture_output=True, text=True, timeout=2)
@@ -76,36 +104,41 @@ def get_wifi_info():
             lines = result.stdout.split('\n')
             for line in lines:
                 if 'SSID' in line and 'BSSID' not in line:
-                    info['WiFi SSID'] = line.split(':')[1].strip() if ':' in line else 'Connected'
+                    metrics.append(Metric('wifi_ssid', line.split(':')[1].strip() if ':' in line else 'Connected',
+                                          title='WiFi SSID'))
                 elif 'Signal' in line:
-                    info['WiFi Signal'] = line.split(':')[1].strip() if ':' in line else 'Unknown'
+                    metrics.append(Metric('wifi_signal', line.split(':')[1].strip() if ':' in line else 'Unknown',
+                                          title='WiFi Signal'))
         else:
             # Not strict failure, just maybe not wifi or not windows
             pass
     except Exception:
         pass
-    return info
+    return metrics
 
+@register('ports', 'Network', MODERATE)
+@metric_collector
 def get_open_ports_sample():
-    # Reduced logic for speed
-    info = {}
-    open_ports = []
-    # Reduced list of ports
-    common_ports = [80, 443, 3389, 22] 
-    
-    for port in common_ports:
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(0.05) # Very fast timeout
-            result = sock.connect_ex(('127.0.0.1', port))
-            if result == 0:
-                open_ports.append(port)
-            sock.close()
-        except:
-            pass
-            
-    info['Open Ports (Local Sample)'] = ', '.join(map(str, open_ports)) if open_ports else 'None found'
-    return info
+    metrics = []
+    listening = listening_sockets()
+    if listening is not None:
+        ports = sorted({port for _, port in listening})
+        metrics.append(Metric('listening_ports', ports or 'None found', title='Listening TCP Ports'))
+        metrics.append(Metric('listening_sockets', len(listening), COUNT, 'Listening TCP Sockets'))
+    else:
+        metrics.append(Metric('listening_ports', 'Unavailable (insufficient permissions)',
+                              title='Listening TCP Ports'))
+
+    # Connect-scan only when asked for, or when the kernel could not tell us
+    scan = options.scan_ports
+    if scan is None and listening is None:
+        scan = COMMON_PORTS
+    if scan is not None:
+        hosts = options.scan_hosts or (['127.0.0.1'] if options.scan_ports is None else None)
+        results = scan_ports(scan, hosts, options.scan_concurrency, options.scan_timeout)
+        for host, ports in results.items():
+            metrics.append(Metric('open_ports', ports or 'None found', None, 'Open Ports ({host})', {'host': host}))
+    return metrics
 
 def get_network_info():
     data = {}
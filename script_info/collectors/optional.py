@@ -0,0 +1,26 @@
+import importlib
+import threading
+
+# Optional dependencies are imported on first use only, so that importing
+# the package (and starting the CLI) does not pay for GPUtil, wmi or cpuinfo
+# unless a collector actually needs them.
+_modules = {}
+_lock = threading.Lock()
+
+
+def optional_import(name):
+    """
+    Import and return module `name`, or None if it is not installed.
+    The outcome is cached, so a missing module is only looked up once.
+    """
+    try:
+        return _modules[name]
+    except KeyError:
+        pass
+    with _lock:
+        if name not in _modules:
+            try:
+                _modules[name] = importlib.import_module(name)
+            except ImportError:
+                _modules[name] = None
+    return _modules[name]
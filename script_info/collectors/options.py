@@ -0,0 +1,45 @@
+class Options:
+    """
+    Run-time tunables read by collectors. Collectors take no arguments, so
+    the CLI (or an API caller) sets these through configure() before
+    collecting.
+    """
+
+    def __init__(self):
+        # Port scanning: None means only inventory the kernel's listening sockets
+        self.scan_ports = None
+        # Addresses to connect-scan; None means every local interface address
+        self.scan_hosts = None
+        self.scan_concurrency = 500
+        self.scan_timeout = 0.2
+        # Hard deadline for each resolver lookup (hostname, FQDN, DNS servers)
+        self.resolve_timeout = 1.0
+        # Partitions: keep only these fstypes (None means all but pseudo filesystems)
+        self.partition_fstypes = None
+        # fstypes to drop when partition_fstypes is None; None means PSEUDO_FSTYPES
+        self.partition_skip_fstypes = None
+        # Keep only mounts at or below these paths
+        self.partition_prefixes = None
+        # Deadline for each partition's statvfs; dead mounts are reported unreachable
+        self.partition_timeout = 1.0
+        # Interface name globs to keep / drop, e.g. ['eth*'] or ['veth*', 'cali*']
+        self.interface_include = None
+        self.interface_exclude = None
+        # Length of each top-N process list (by CPU, memory, open files, threads)
+        self.process_top = 5
+        # CPU usage windows shorter than this report the average since boot
+        # as cpu_usage_since_boot instead of cpu_usage; 0 always measures
+        self.cpu_min_window = 0.5
+
+    def configure(self, **kwargs):
+        for name, value in kwargs.items():
+            if not hasattr(self, name):
+                raise ValueError(f"Unknown collector option '{name}'")
+            setattr(self, name, value)
+
+
+options = Options()
+
+
+def configure(**kwargs):
+    options.configure(**kwargs)
@@ -0,0 +1,213 @@
+import collections
+import errno
+import ipaddress
+import os
+import selectors
+import socket
+import struct
+import time
+
+import psutil
+
+# Probed when listening sockets cannot be read from the kernel
+COMMON_PORTS = [21, 22, 23, 25, 53, 80, 110, 143, 443, 445, 3306, 3389, 5432, 5900, 6379, 8080, 8443, 27017]
+
+PROC_TCP = (('net/tcp', socket.AF_INET), ('net/tcp6', socket.AF_INET6))
+TCP_LISTEN = '0A'
+
+# File descriptors a scan leaves for the rest of the process (stdio, other
+# collectors' files and sockets)
+FD_HEADROOM = 64
+
+
+def parse_ports(spec):
+    """
+    Parse a port list such as '22,80,8000-8100' into a sorted list of ints.
+    """
+    ports = set()
+    for part in str(spec).split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            low, high = (int(p) for p in part.split('-', 1))
+        else:
+            low = high = int(part)
+        if not 1 <= low <= high <= 65535:
+            raise ValueError(f"Invalid port range '{part}'")
+        ports.update(range(low, high + 1))
+    return sorted(ports)
+
+
+def _decode_proc_address(hex_addr):
+    # /proc/net/tcp* prints addresses as host-endian 32-bit words
+    raw = bytes.fromhex(hex_addr)
+    words = struct.unpack(f'={len(raw) // 4}I', raw)
+    packed = struct.pack(f'!{len(words)}I', *words)
+    return str(ipaddress.ip_address(packed))
+
+
+def _listening_from_proc(root):
+    sockets = set()
+    for path, family in PROC_TCP:
+        try:
+            with open(os.path.join(root, path), encoding='ascii') as f:
+                next(f, None)
+                for line in f:
+                    fields = line.split(None, 4)
+                    if len(fields) < 4 or fields[3] != TCP_LISTEN:
+                        continue
+                    addr, port = fields[1].split(':')
+                    sockets.add((_decode_proc_address(addr), int(port, 16)))
+        except OSError:
+            # Missing, or unreadable on a hardened /proc: let psutil try
+            if family == socket.AF_INET:
+                return None
+    return sockets
+
+
+def _listening_from_psutil():
+    return {(c.laddr.ip, c.laddr.port)
+            for c in psutil.net_connections(kind='tcp')
+            if c.status == psutil.CONN_LISTEN and c.laddr}
+
+
+def listening_sockets(proc_root='/proc'):
+    """
+    Return the set of (address, port) TCP sockets in LISTEN state, read from
+    the kernel rather than by connecting. /proc/net/tcp* is used when
+    present since psutil.net_connections() also maps every socket to its
+    process, which is slow on busy hosts. Returns None if neither source is
+    readable (e.g. psutil needs root on macOS).
+    """
+    sockets = _listening_from_proc(proc_root) if os.path.isdir(proc_root) else None
+    if sockets is not None:
+        return sockets
+    try:
+        return _listening_from_psutil()
+    except (psutil.AccessDenied, OSError):
+        return None
+
+
+def local_addresses():
+    addresses = []
+    for addrs in psutil.net_if_addrs().values():
+        for addr in addrs:
+            if addr.family == socket.AF_INET:
+                addresses.append(addr.address)
+            elif addr.family == socket.AF_INET6 and not addr.address.lower().startswith('fe80'):
+                addresses.append(addr.address.split('%')[0])
+    return addresses or ['127.0.0.1']
+
+
+def max_concurrency(requested):
+    """
+    `requested`, capped so the scan's sockets fit in the open-file limit
+    (e.g. 256 by default on macOS).
+    """
+    try:
+        import resource
+    except ImportError:
+        # Windows: sockets do not count against a per-process file limit
+        return requested
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        return requested
+    try:
+        in_use = len(os.listdir('/dev/fd'))
+    except OSError:
+        in_use = 0
+    return max(1, min(requested, soft - in_use - FD_HEADROOM))
+
+
+IN_PROGRESS = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN, errno.EALREADY, 10035}
+
+
+def _self_connected(sock):
+    # Probing a free ephemeral port on loopback can make TCP connect the
+    # socket to itself (simultaneous open); that is not a listener.
+    try:
+        return sock.getsockname() == sock.getpeername()
+    except OSError:
+        return False
+
+
+def _scan(targets, concurrency, timeout):
+    # One selector drives up to `concurrency` non-blocking connects. This is
+    # much cheaper per probe than an asyncio task + wait_for, and pulling
+    # from the `targets` iterator keeps memory flat for 1-65535 sweeps.
+    selector = selectors.DefaultSelector()
+    in_flight = {}
+    expiry = collections.deque()
+    hits = []
+    exhausted = False
+    retry = None
+    try:
+        while True:
+            now = time.monotonic()
+            while not exhausted and len(in_flight) < concurrency:
+                if retry is not None:
+                    (host, port), retry = retry, None
+                else:
+                    try:
+                        host, port = next(targets)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                try:
+                    sock = socket.socket(socket.AF_INET6 if ':' in host else socket.AF_INET, socket.SOCK_STREAM)
+                except OSError as e:
+                    if e.errno not in (errno.EMFILE, errno.ENFILE) or not in_flight:
+                        raise
+                    # Out of file descriptors anyway: probe fewer at a time
+                    retry = (host, port)
+                    concurrency = len(in_flight)
+                    break
+                sock.setblocking(False)
+                err = sock.connect_ex((host, port))
+                if err in IN_PROGRESS:
+                    selector.register(sock, selectors.EVENT_WRITE)
+                    in_flight[sock] = (host, port)
+                    expiry.append((now + timeout, sock))
+                else:
+                    if err == 0 and not _self_connected(sock):
+                        hits.append((host, port))
+                    sock.close()
+            if not in_flight:
+                return hits
+
+            for key, _ in selector.select(max(0.0, expiry[0][0] - time.monotonic())):
+                sock = key.fileobj
+                if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0 and not _self_connected(sock):
+                    hits.append(in_flight[sock])
+                selector.unregister(sock)
+                del in_flight[sock]
+                sock.close()
+
+            now = time.monotonic()
+            while expiry and (expiry[0][0] <= now or expiry[0][1] not in in_flight):
+                _, sock = expiry.popleft()
+                if sock in in_flight:
+                    selector.unregister(sock)
+                    del in_flight[sock]
+                    sock.close()
+    finally:
+        for sock in in_flight:
+            sock.close()
+        selector.close()
+
+
+def scan_ports(ports, hosts=None, concurrency=500, timeout=0.2):
+    """
+    Connect-scan `ports` on `hosts` (default: every local interface address)
+    with at most `concurrency` non-blocking connects in flight (fewer if the
+    open-file limit is lower), each bounded by `timeout` seconds. Returns
+    {host: [open ports]}.
+    """
+    hosts = list(hosts) if hosts else local_addresses()
+    ports = list(ports)
+    found = {host: [] for host in hosts}
+    targets = ((host, port) for host in hosts for port in ports)
+    for host, port in _scan(targets, max_concurrency(max(1, concurrency)), timeout):
+        found[host].append(port)
+    return {host: sorted(ports) for host, ports in found.items()}
@@ -0,0 +1,91 @@
+import heapq
+import os
+import threading
+import time
+from collections import Counter, namedtuple
+from operator import attrgetter
+
+import psutil
+
+# Fields read per process. process_iter() fetches them inside oneshot(),
+# so on Linux /proc/<pid>/stat and /proc/<pid>/status are each read once
+# however many of their fields are asked for.
+FD_ATTR = 'num_fds' if os.name == 'posix' else 'num_handles'
+ATTRS = ['pid', 'name', 'status', 'create_time', 'cpu_times', 'memory_info', 'num_threads', FD_ATTR]
+
+# Fields a top-N list can be ranked by
+RANKINGS = ('cpu', 'rss', 'fds', 'threads')
+
+# One process. Unreadable fields (access denied) are -1 so that every
+# record can be ranked; they never make it into a top-N list.
+Process = namedtuple('Process', 'pid name status cpu rss threads fds')
+
+
+class ProcessSampler:
+    """
+    Per-process CPU utilisation without sleeping. The CPU time of every
+    process is remembered between samples, so a sample reports each
+    process's share over the window since the previous one. Processes seen
+    for the first time (and every process in the first sample) report their
+    lifetime average instead: CPU time over time since they started.
+    """
+
+    def __init__(self, backend=psutil, clock=time.monotonic, wall_clock=time.time):
+        self.backend = backend
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self._lock = threading.Lock()
+        self._baseline = None
+
+    def sample(self):
+        """
+        Return (processes, window): a list of Process and the seconds since
+        the previous sample, or None when CPU figures are lifetime averages.
+        """
+        with self._lock:
+            now = self.clock()
+            wall = self.wall_clock()
+            then, previous = self._baseline or (None, {})
+            window = now - then if then is not None and now > then else None
+            cpu_times = {}
+            processes = []
+            append = processes.append
+            for proc in self.backend.process_iter(ATTRS, ad_value=None):
+                info = proc.info
+                pid = info['pid']
+                created = info['create_time']
+                times = info['cpu_times']
+                cpu = -1.0
+                if times is not None:
+                    used = times.user + times.system
+                    key = (pid, created)
+                    cpu_times[key] = used
+                    before = previous.get(key)
+                    if before is not None and window:
+                        cpu = 100.0 * (used - before) / window
+                    elif created is not None and wall > created:
+                        cpu = 100.0 * used / (wall - created)
+                    else:
+                        cpu = 0.0
+                memory = info['memory_info']
+                threads = info['num_threads']
+                fds = info[FD_ATTR]
+                append(Process(pid, info['name'] or '?', info['status'] or 'unknown', cpu,
+                               -1 if memory is None else memory.rss,
+                               -1 if threads is None else threads,
+                               -1 if fds is None else fds))
+            self._baseline = (now, cpu_times)
+        return processes, window
+
+
+def top(processes, field, n):
+    """The `n` processes with the largest `field`, via a bounded heap rather than a full sort."""
+    key = attrgetter(field)
+    return [p for p in heapq.nlargest(n, processes, key=key) if key(p) >= 0]
+
+
+def status_counts(processes):
+    return dict(Counter(p.status for p in processes).most_common())
+
+
+process_sampler = ProcessSampler()
@@ -0,0 +1,302 @@
+import os
+import sys
+import threading
+
+import psutil
+
+# Linux fast path for the counters that are sampled repeatedly (CPU times,
+# memory, per-NIC and per-disk I/O). psutil opens, reads and closes the
+# /proc file on every call and parses it line by line; here each file is
+# opened once, re-read from offset 0 with preadv into a preallocated buffer,
+# and tokenised with a single bytes.split(), with field positions worked out
+# once per file layout rather than per line.
+#
+# Results are psutil's own named tuple types and match psutil's numbers
+# (see tests/test_procfs.py). Everything else is delegated to psutil, and a
+# method falls back to psutil for good the first time its file cannot be
+# read or parsed.
+
+# Set SCRIPT_INFO_PROCFS=0 to always go through psutil
+ENABLED = os.environ.get('SCRIPT_INFO_PROCFS', '1') != '0'
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+SECTOR_SIZE = 512
+# psutil reports swapped pages in 4 KiB units whatever the page size
+SWAP_PAGE = 4 * 1024
+
+_PARSE_ERRORS = (OSError, ValueError, IndexError, KeyError, TypeError, ZeroDivisionError)
+
+
+def available(root='/proc'):
+    return ENABLED and sys.platform.startswith('linux') and hasattr(os, 'preadv') \
+        and os.path.exists(os.path.join(root, 'stat'))
+
+
+class ProcFile:
+    """A /proc file held open and re-read in place."""
+
+    __slots__ = ('path', 'fd', 'buf', 'lock')
+
+    def __init__(self, path, size=16384):
+        self.path = path
+        self.fd = os.open(path, os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0))
+        self.buf = bytearray(size)
+        self.lock = threading.Lock()
+
+    def read(self):
+        """The current contents of the file, as bytes."""
+        with self.lock:
+            buf = self.buf
+            n = 0
+            while True:
+                view = memoryview(buf)[n:]
+                got = os.preadv(self.fd, [view], n)
+                view.release()
+                n += got
+                if n < len(buf):
+                    # seq_file fills the buffer unless it hit the end of the file
+                    break
+                # Outgrew the buffer: double it and keep reading
+                buf.extend(bytes(len(buf)))
+            # One copy out of the reused buffer; parsers need bytes methods
+            with memoryview(buf) as view, view[:n] as data:
+                return bytes(data)
+
+    def close(self):
+        os.close(self.fd)
+
+
+def parse_stat(data):
+    """[(name, [jiffies, ...])] for the 'cpu' and 'cpuN' lines of /proc/stat."""
+    end = data.find(b'\nintr')
+    if end < 0:
+        end = data.find(b'\nctxt')
+    head = data[:end] if end >= 0 else data
+    stride = len(head[:head.find(b'\n')].split())
+    tokens = head.split()
+    if not stride or len(tokens) % stride:
+        raise ValueError('Unexpected /proc/stat layout')
+    return [(tokens[i], tokens[i + 1:i + stride]) for i in range(0, len(tokens), stride)]
+
+
+class MeminfoLayout:
+    """Token positions of the /proc/meminfo fields, reused while the layout holds."""
+
+    __slots__ = ('count', 'positions')
+
+    def __init__(self, tokens):
+        self.count = len(tokens)
+        self.positions = {tokens[i]: i + 1 for i in range(len(tokens) - 1) if tokens[i].endswith(b':')}
+
+    def matches(self, tokens):
+        return len(tokens) == self.count and tokens[0] == b'MemTotal:'
+
+    def values(self, tokens, names):
+        """{name: bytes} for those of `names` present in the file."""
+        positions = self.positions
+        return {name: int(tokens[positions[name]]) * 1024 for name in names if name in positions}
+
+
+def parse_net_dev(data):
+    """Tokens of /proc/net/dev after the header: each interface name and its 16 counters."""
+    start = data.find(b'\n', data.find(b'\n') + 1) + 1
+    # 'eth0: 123 ...' and 'eth0:123 ...' are both possible
+    tokens = data[start:].replace(b':', b' ').split()
+    if len(tokens) % 17:
+        raise ValueError('Unexpected /proc/net/dev layout')
+    return tokens
+
+
+def parse_diskstats(data):
+    """(tokens, stride) of /proc/diskstats; every line has the same number of fields."""
+    stride = len(data[:data.find(b'\n')].split())
+    if stride != 14 and stride < 18:
+        raise ValueError(f'Unsupported /proc/diskstats layout ({stride} fields)')
+    tokens = data.split()
+    if len(tokens) % stride:
+        raise ValueError('Unexpected /proc/diskstats layout')
+    return tokens, stride
+
+
+def _usage_percent(used, total):
+    # psutil._common.usage_percent(used, total, round_=1)
+    if not total:
+        return 0.0
+    return round(float(used) / total * 100, 1)
+
+
+class ProcfsBackend:
+    """
+    Drop-in for the psutil module: cpu_times(), virtual_memory(),
+    swap_memory(), net_io_counters() and disk_io_counters() read /proc
+    directly, everything else goes to `fallback`. Counters are not
+    corrected for wrap-around (psutil's nowrap); the kernel reports them as
+    64-bit values.
+    """
+
+    def __init__(self, fallback=psutil, root='/proc', sys_root='/sys'):
+        self.fallback = fallback
+        self.root = root
+        self.sys_root = sys_root
+        self._files = {}
+        self._types = {}
+        self._broken = set()
+        self._meminfo_layout = None
+        self._storage = {}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        return getattr(self.fallback, name)
+
+    def _file(self, name):
+        f = self._files.get(name)
+        if f is None:
+            with self._lock:
+                f = self._files.get(name)
+                if f is None:
+                    f = self._files[name] = ProcFile(os.path.join(self.root, name))
+        return f
+
+    def _type(self, name, sample):
+        """psutil's named tuple type for a result, learned from one psutil call."""
+        cls = self._types.get(name)
+        if cls is None:
+            result = sample()
+            if result is None:
+                # e.g. no disks: nothing to learn from, leave it to psutil
+                raise ValueError(f'psutil returned no {name}')
+            cls = self._types[name] = type(result)
+        return cls
+
+    def _fast(self, name, fast, *args, **kwargs):
+        if name not in self._broken:
+            try:
+                return fast(*args, **kwargs)
+            except _PARSE_ERRORS:
+                self._broken.add(name)
+        return getattr(self.fallback, name)(*args, **kwargs)
+
+    def close(self):
+        with self._lock:
+            for f in self._files.values():
+                f.close()
+            self._files.clear()
+
+    # CPU
+
+    def cpu_times(self, percpu=False):
+        return self._fast('cpu_times', self._cpu_times, percpu=percpu)
+
+    def _cpu_times(self, percpu=False):
+        cls = self._type('scputimes', self.fallback.cpu_times)
+        width = len(cls._fields)
+        lines = parse_stat(self._file('stat').read())
+        if not percpu:
+            return cls(*[int(x) / CLOCK_TICKS for x in lines[0][1][:width]])
+        return [cls(*[int(x) / CLOCK_TICKS for x in values[:width]])
+                for name, values in lines[1:] if name.startswith(b'cpu')]
+
+    # Memory
+
+    def _meminfo(self, names):
+        tokens = self._file('meminfo').read().split()
+        layout = self._meminfo_layout
+        if layout is None or not layout.matches(tokens):
+            layout = self._meminfo_layout = MeminfoLayout(tokens)
+        return layout.values(tokens, names)
+
+    _VIRTUAL = (b'MemTotal:', b'MemFree:', b'MemAvailable:', b'Buffers:', b'Cached:', b'SReclaimable:',
+                b'Shmem:', b'Active:', b'Inactive:', b'Slab:')
+
+    def virtual_memory(self):
+        return self._fast('virtual_memory', self._virtual_memory)
+
+    def _virtual_memory(self):
+        cls = self._type('svmem', self.fallback.virtual_memory)
+        mems = self._meminfo(self._VIRTUAL)
+        total = mems[b'MemTotal:']
+        free = mems[b'MemFree:']
+        # Without MemAvailable (pre-3.14 kernels) psutil estimates it; let it
+        avail = mems[b'MemAvailable:']
+        if not avail:
+            raise ValueError('MemAvailable is 0')
+        if avail > total:
+            avail = free
+        values = {
+            'total': total, 'available': avail, 'percent': _usage_percent(total - avail, total),
+            'used': total - avail, 'free': free,
+            'active': mems[b'Active:'], 'inactive': mems[b'Inactive:'],
+            'buffers': mems[b'Buffers:'], 'cached': mems[b'Cached:'] + mems.get(b'SReclaimable:', 0),
+            'shared': mems[b'Shmem:'], 'slab': mems.get(b'Slab:', 0),
+        }
+        return cls(*[values[field] for field in cls._fields])
+
+    def swap_memory(self):
+        return self._fast('swap_memory', self._swap_memory)
+
+    def _swap_memory(self):
+        cls = self._type('sswap', self.fallback.swap_memory)
+        mems = self._meminfo((b'SwapTotal:', b'SwapFree:'))
+        total = mems[b'SwapTotal:']
+        free = mems[b'SwapFree:']
+        vmstat = self._file('vmstat').read()
+        pages = []
+        for key in (b'\npswpin ', b'\npswpout '):
+            start = vmstat.index(key) + len(key)
+            pages.append(int(vmstat[start:vmstat.index(b'\n', start)]) * SWAP_PAGE)
+        return cls(total, total - free, free, _usage_percent(total - free, total), *pages)
+
+    # Network
+
+    def net_io_counters(self, pernic=False, nowrap=True):
+        return self._fast('net_io_counters', self._net_io_counters, pernic=pernic, nowrap=nowrap)
+
+    def _net_io_counters(self, pernic=False, nowrap=True):
+        cls = self._type('snetio', self.fallback.net_io_counters)
+        tokens = parse_net_dev(self._file('net/dev').read())
+        # psutil's order: sent, received, packets sent/received, errors in/out, drops in/out
+        fields = (9, 1, 10, 2, 3, 11, 4, 12)
+        if pernic:
+            return {tokens[i].decode(): cls(*[int(tokens[i + f]) for f in fields])
+                    for i in range(0, len(tokens), 17)}
+        totals = [0] * len(fields)
+        for i in range(0, len(tokens), 17):
+            for j, f in enumerate(fields):
+                totals[j] += int(tokens[i + f])
+        return cls(*totals)
+
+    # Disks
+
+    def _is_storage_device(self, name):
+        # Whole disks, not partitions, as psutil counts them for totals
+        known = self._storage.get(name)
+        if known is None:
+            path = os.path.join(self.sys_root, 'block', name.replace('/', '!'))
+            known = self._storage[name] = os.access(path, os.F_OK)
+        return known
+
+    def disk_io_counters(self, perdisk=False, nowrap=True):
+        return self._fast('disk_io_counters', self._disk_io_counters, perdisk=perdisk, nowrap=nowrap)
+
+    def _disk_io_counters(self, perdisk=False, nowrap=True):
+        cls = self._type('sdiskio', self.fallback.disk_io_counters)
+        tokens, stride = parse_diskstats(self._file('diskstats').read())
+        disks = {}
+        for i in range(0, len(tokens), stride):
+            name = tokens[i + 2].decode()
+            if not perdisk and not self._is_storage_device(name):
+                continue
+            (reads, reads_merged, rbytes, rtime, writes, writes_merged,
+             wbytes, wtime, _, busy_time) = map(int, tokens[i + 3:i + 13])
+            disks[name] = (reads, writes, rbytes * SECTOR_SIZE, wbytes * SECTOR_SIZE, rtime, wtime,
+                           reads_merged, writes_merged, busy_time)[:len(cls._fields)]
+        if perdisk:
+            return {name: cls(*values) for name, values in disks.items()}
+        if not disks:
+            return None
+        return cls(*[sum(column) for column in zip(*disks.values())])
+
+
+# psutil with the /proc fast path where available; collectors use this in
+# place of the psutil module
+system = ProcfsBackend(psutil) if available() else psutil
@@ -0,0 +1,67 @@
+import time
+
+STATUS_OK = 'ok'
+STATUS_ERROR = 'error'
+STATUS_TIMED_OUT = 'timed out'
+
+
+class CollectorTiming:
+    """
+    Wall and CPU time spent in one collector run. `cpu` is the CPU time of
+    the collector's own thread and is None when the collector never finished.
+    """
+
+    __slots__ = ('name', 'wall', 'cpu', 'status', 'error')
+
+    def __init__(self, name, wall, cpu=None, status=STATUS_OK, error=None):
+        self.name = name
+        self.wall = wall
+        self.cpu = cpu
+        self.status = status
+        self.error = error
+
+    def as_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __repr__(self):
+        return f"CollectorTiming({self.name!r}, wall={self.wall:.4f}, cpu={self.cpu}, status={self.status!r})"
+
+
+def call_timed(name, func):
+    """
+    Call `func` and return (result, exception, CollectorTiming). Meant to run
+    on the collector's own thread so thread_time() is attributable to it.
+    """
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    result = exc = None
+    try:
+        result = func()
+    except Exception as e:
+        exc = e
+    timing = CollectorTiming(
+        name,
+        time.perf_counter() - wall_start,
+        time.thread_time() - cpu_start,
+        STATUS_ERROR if exc is not None else STATUS_OK,
+        f'{type(exc).__name__}: {exc}' if exc is not None else None,
+    )
+    return result, exc, timing
+
+
+def format_timings(timings):
+    """
+    Render timings (an iterable of CollectorTiming or a dict of them) as
+    lines sorted by wall time, slowest first.
+    """
+    if isinstance(timings, dict):
+        timings = timings.values()
+    rows = sorted(timings, key=lambda t: t.wall, reverse=True)
+    lines = [f"{'Collector':<20} {'Wall (ms)':>10} {'CPU (ms)':>10}  Status"]
+    for t in rows:
+        cpu = f'{t.cpu * 1000:10.1f}' if t.cpu is not None else f"{'-':>10}"
+        status = t.status if t.error is None else f'{t.status} ({t.error})'
+        lines.append(f'{t.name:<20} {t.wall * 1000:10.1f} {cpu}  {status}')
+    total = sum(t.wall for t in rows)
+    lines.append(f"{'Total (sum)':<20} {total * 1000:10.1f}")
+    return lines
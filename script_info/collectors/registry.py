@@ -0,0 +1,137 @@
+import warnings
+
+from .model import from_dict
+
+CHEAP = 'cheap'
+MODERATE = 'moderate'
+EXPENSIVE = 'expensive'
+COST_CLASSES = (CHEAP, MODERATE, EXPENSIVE)
+
+# Third-party packages register collectors under this entry point group.
+# The entry point may name a Collector instance or a plain callable
+# returning a dict; the latter is registered under the entry point name.
+ENTRY_POINT_GROUP = 'script_info.collectors'
+
+
+class Collector:
+    """
+    A named information collector.
+
+    `cost` is one of the COST_CLASSES and lets callers pick only cheap
+    collectors; `timeout` overrides the engine's per-collector deadline;
+    collectors with `default=False` only run when selected by name.
+    """
+
+    def __init__(self, name, func, category, cost=MODERATE, timeout=None, default=True):
+        if cost not in COST_CLASSES:
+            raise ValueError(f"Unknown cost class '{cost}' for collector '{name}'")
+        self.name = name
+        self.func = func
+        self.category = category
+        self.cost = cost
+        self.timeout = timeout
+        self.default = default
+
+    def __call__(self):
+        return self.func()
+
+    def metrics(self):
+        """Run the collector for its Metric list; dict-returning plugins are wrapped."""
+        func = getattr(self.func, 'metrics', None)
+        if func is not None:
+            return func()
+        return from_dict(self.func())
+
+    def __repr__(self):
+        return f"Collector({self.name!r}, category={self.category!r}, cost={self.cost!r})"
+
+
+_collectors = {}
+_entry_points_loaded = False
+
+
+def add_collector(collector):
+    if collector.name in _collectors:
+        raise ValueError(f"Collector '{collector.name}' is already registered")
+    _collectors[collector.name] = collector
+    return collector
+
+
+def register(name, category, cost=MODERATE, timeout=None, default=True):
+    """
+    Decorator registering a collector function. The function itself is
+    returned unchanged so it can still be called directly.
+    """
+    def decorator(func):
+        add_collector(Collector(name, func, category, cost, timeout, default))
+        return func
+    return decorator
+
+
+def _iter_entry_points():
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        return []
+    eps = entry_points()
+    if hasattr(eps, 'select'):
+        return eps.select(group=ENTRY_POINT_GROUP)
+    return eps.get(ENTRY_POINT_GROUP, [])
+
+
+def load_entry_points():
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    for ep in _iter_entry_points():
+        try:
+            obj = ep.load()
+            if not isinstance(obj, Collector):
+                obj = Collector(ep.name, obj, category='Other')
+            add_collector(obj)
+        except Exception as e:
+            warnings.warn(f"Could not load collector plugin '{ep.name}': {e}")
+
+
+def _matches(collector, token):
+    return token in (collector.name, collector.category.lower(), collector.cost)
+
+
+def get_collectors(only=None, skip=None):
+    """
+    Return registered collectors in registration order.
+
+    `only` and `skip` are iterables of selectors; a selector matches a
+    collector by name, category or cost class (e.g. 'dns', 'network',
+    'cheap'). Collectors with default=False run only when `only` names them.
+    """
+    load_entry_points()
+    only = [t.strip().lower() for t in only or [] if t.strip()]
+    skip = [t.strip().lower() for t in skip or [] if t.strip()]
+
+    known = set(COST_CLASSES)
+    for c in _collectors.values():
+        known.update((c.name, c.category.lower()))
+    unknown = [t for t in only + skip if t not in known]
+    if unknown:
+        raise ValueError(f"Unknown collector selector(s): {', '.join(unknown)}")
+
+    selected = []
+    for c in _collectors.values():
+        if only:
+            if not any(_matches(c, t) for t in only):
+                continue
+            if not c.default and c.name not in only:
+                continue
+        elif not c.default:
+            continue
+        if any(_matches(c, t) for t in skip):
+            continue
+        selected.append(c)
+    return selected
+
+
+def all_collectors():
+    load_entry_points()
+    return list(_collectors.values())
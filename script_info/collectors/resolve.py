@@ -0,0 +1,181 @@
+import os
+import socket
+import sys
+import threading
+import time
+
+# Resolver lookups can block for the full resolver timeout (5-30 s) on hosts
+# with a broken resolver config, so they run off the calling thread with a
+# hard deadline and their answers are kept for a while. Local files are
+# consulted first and need no network at all.
+POSITIVE_TTL = 300.0
+NEGATIVE_TTL = 30.0
+
+if sys.platform == 'win32':
+    HOSTS_PATH = os.path.join(os.environ.get('SystemRoot', r'C:\Windows'), 'System32', 'drivers', 'etc', 'hosts')
+else:
+    HOSTS_PATH = '/etc/hosts'
+RESOLV_CONF_PATH = '/etc/resolv.conf'
+
+
+class TTLCache:
+    """Small thread-safe cache whose entries expire after a per-entry TTL."""
+
+    def __init__(self, maxsize=128, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.clock = clock
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires <= self.clock():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            if len(self._data) >= self.maxsize and key not in self._data:
+                # Drop the entry closest to expiry
+                del self._data[min(self._data, key=lambda k: self._data[k][0])]
+            self._data[key] = (self.clock() + ttl, value)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+cache = TTLCache()
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+def bounded_call(key, func, timeout):
+    """
+    Run func() on a daemon thread and wait at most `timeout` seconds.
+    Returns (done, result); exceptions count as a None result. If a lookup
+    for `key` is still stuck from an earlier call, no second thread is
+    started and the caller waits on the existing one instead.
+    """
+    with _in_flight_lock:
+        pending = _in_flight.get(key)
+        if pending is None:
+            pending = {'event': threading.Event(), 'result': None}
+
+            def run():
+                try:
+                    pending['result'] = func()
+                except Exception:
+                    pending['result'] = None
+                finally:
+                    with _in_flight_lock:
+                        _in_flight.pop(key, None)
+                    pending['event'].set()
+
+            _in_flight[key] = pending
+            threading.Thread(target=run, name=f'script-info-resolve-{key}', daemon=True).start()
+    if pending['event'].wait(timeout):
+        return True, pending['result']
+    return False, None
+
+
+def cached_lookup(key, func, timeout):
+    """
+    Cached, deadline-bounded lookup. Successful answers are kept for
+    POSITIVE_TTL and failures or timeouts for NEGATIVE_TTL, so a broken
+    resolver costs at most one timeout per NEGATIVE_TTL, not one per call.
+    """
+    missing = object()
+    value = cache.get(key, missing)
+    if value is not missing:
+        return value
+    done, value = bounded_call(key, func, timeout)
+    cache.set(key, value, POSITIVE_TTL if done and value else NEGATIVE_TTL)
+    return value
+
+
+def read_hosts_file(path=HOSTS_PATH):
+    """
+    Parse a hosts file into a list of (address, [names]) entries.
+    """
+    entries = []
+    try:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            for line in f:
+                fields = line.split('#', 1)[0].split()
+                if len(fields) >= 2:
+                    entries.append((fields[0], fields[1:]))
+    except OSError:
+        pass
+    return entries
+
+
+def read_resolv_conf(path=RESOLV_CONF_PATH):
+    """Return the nameserver addresses listed in resolv.conf, or []."""
+    servers = []
+    try:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            for line in f:
+                fields = line.split('#', 1)[0].split()
+                if len(fields) >= 2 and fields[0] == 'nameserver':
+                    servers.append(fields[1])
+    except OSError:
+        pass
+    return servers
+
+
+def _hosts_entry(hostname, hosts_path):
+    name = hostname.lower()
+    for address, names in read_hosts_file(hosts_path):
+        if name in (n.lower() for n in names):
+            return address, names
+    return None
+
+
+def host_address(hostname, timeout=1.0, hosts_path=HOSTS_PATH):
+    """The address for `hostname`: from the hosts file, else a bounded lookup."""
+    entry = _hosts_entry(hostname, hosts_path)
+    if entry:
+        return entry[0]
+    return cached_lookup(('address', hostname), lambda: socket.gethostbyname(hostname), timeout)
+
+
+def fully_qualified_name(hostname, timeout=1.0, hosts_path=HOSTS_PATH):
+    """
+    The FQDN for `hostname`, like socket.getfqdn(): the hosts file's
+    canonical name when it is qualified, else a bounded resolver lookup.
+    """
+    if '.' in hostname:
+        return hostname
+    entry = _hosts_entry(hostname, hosts_path)
+    if entry:
+        for name in entry[1]:
+            if '.' in name:
+                return name
+    return cached_lookup(('fqdn', hostname), lambda: socket.getfqdn(hostname), timeout)
+
+
+def _dnspython_nameservers():
+    import dns.resolver
+    return list(dns.resolver.Resolver().nameservers)
+
+
+def dns_servers(timeout=1.0, resolv_conf=RESOLV_CONF_PATH):
+    """
+    Configured DNS servers: resolv.conf where it exists, else dnspython's
+    system configuration (registry on Windows), cached between calls.
+    Returns None if dnspython is needed but not installed.
+    """
+    servers = read_resolv_conf(resolv_conf)
+    if servers:
+        return servers
+    try:
+        import dns.resolver  # noqa: F401
+    except ImportError:
+        return None
+    return cached_lookup(('dns_servers',), _dnspython_nameservers, timeout) or []
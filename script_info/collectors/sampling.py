@@ -0,0 +1,103 @@
+import threading
+import time
+
+from .procfs import system
+
+# Modes reported individually when the platform provides them
+CPU_MODES = (
+    ('user', 'User'),
+    ('system', 'System'),
+    ('iowait', 'I/O Wait'),
+    ('steal', 'Steal'),
+)
+
+# Time counted as not busy, matching psutil.cpu_percent()
+IDLE_FIELDS = ('idle', 'iowait')
+# Already included in 'user'/'nice' on Linux
+GUEST_FIELDS = ('guest', 'guest_nice')
+
+# Shorter windows are mostly this process starting up (a one-off CLI run
+# samples ~40 ms after import), so by default they report utilisation since
+# boot instead. watch and serve sample continuously and pass 0.
+MIN_WINDOW = 0.5
+
+
+def _total(times):
+    total = sum(times)
+    for field in GUEST_FIELDS:
+        total -= getattr(times, field, 0)
+    return total
+
+
+def _utilisation(previous, current):
+    total = _total(current) - _total(previous)
+    if total <= 0:
+        return None
+    idle = sum(getattr(current, f, 0) - getattr(previous, f, 0) for f in IDLE_FIELDS)
+    result = {'usage': min(100.0, max(0.0, 100.0 * (total - idle) / total))}
+    for field, _ in CPU_MODES:
+        if hasattr(current, field):
+            delta = getattr(current, field) - getattr(previous, field)
+            result[field] = min(100.0, max(0.0, 100.0 * delta / total))
+    return result
+
+
+class CpuSampler:
+    """
+    Non-blocking CPU utilisation. The baseline is taken when the sampler is
+    created and each sample() reports utilisation over the time elapsed
+    since the previous sample, overall, per mode and per core, then moves
+    the baseline forward. Nothing sleeps: the window is whatever real time
+    passed between calls (process start to collection, or one watch tick).
+    """
+
+    def __init__(self, backend=system, clock=time.monotonic):
+        self.backend = backend
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._baseline = self._read()
+
+    def _read(self):
+        return (self.clock(), self.backend.cpu_times(), self.backend.cpu_times(percpu=True))
+
+    def _since_boot(self, total_now, cores_now):
+        try:
+            window = time.time() - self.backend.boot_time()
+        except Exception:
+            window = None
+        zero = [0.0] * len(total_now)
+        total = _utilisation(type(total_now)(*zero), total_now)
+        if total is None:
+            return None
+        return {
+            'window': window,
+            'since_boot': True,
+            'total': total,
+            'per_core': [_utilisation(type(core)(*zero), core) for core in cores_now],
+        }
+
+    def sample(self, min_window=MIN_WINDOW):
+        """
+        Return {'window': seconds, 'total': {...}, 'per_core': [...]} where
+        'total' and each core map 'usage' and the CPU_MODES fields to
+        percentages, or None if no CPU time has accrued since the baseline
+        (the baseline is then kept so the next window is longer). Windows
+        shorter than `min_window` also keep the baseline and report averages
+        since boot, with 'since_boot' set and 'window' the uptime.
+        """
+        with self._lock:
+            current = self._read()
+            then, total_then, cores_then = self._baseline
+            now, total_now, cores_now = current
+            if now - then < min_window:
+                return self._since_boot(total_now, cores_now)
+            total = _utilisation(total_then, total_now)
+            if total is None:
+                return None
+            self._baseline = current
+        per_core = [_utilisation(a, b) for a, b in zip(cores_then, cores_now)]
+        return {'window': now - then, 'total': total, 'per_core': per_core}
+
+
+# Primed at import so the first snapshot already has a real window
+cpu_sampler = CpuSampler()
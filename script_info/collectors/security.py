@@ -1,20 +1,14 @@
 import platform
+from .registry import register, EXPENSIVE
+from .optional import optional_import
+from .model import Metric, metric_collector
 
-try:
-    import wmi
-    WMI_AVAILABLE = True
-except ImportError:
-    WMI_AVAILABLE = False
-
-try:
-    import winreg
-    WINREG_AVAILABLE = True
-except ImportError:
-    WINREG_AVAILABLE = False
-
+@register('security', 'Security', EXPENSIVE)
+@metric_collector
 def get_security_info():
-    info = {}
-    if WMI_AVAILABLE and platform.system() == 'Windows':
+    metrics = []
+    wmi = optional_import('wmi') if platform.system() == 'Windows' else None
+    if wmi is not None:
         try:
             c = wmi.WMI()
             
@@ -24,9 +18,9 @@ def get_security_info():
                 # Simple loose check
                 products = c.Win32_Product(Name="Windows Defender")
                 if products:
-                     info['Windows Defender'] = 'Installed'
+                     metrics.append(Metric('windows_defender', 'Installed', title='Windows Defender'))
                 else:
-                     info['Windows Defender'] = 'Not found explicitly'
+                     metrics.append(Metric('windows_defender', 'Not found explicitly', title='Windows Defender'))
             except:
                 pass
 
@@ -35,24 +29,25 @@ def get_security_info():
                 firewall = c.Win32_Firewall()
                 if firewall:
                     fw = firewall[0]
-                    info['Firewall Enabled'] = 'Yes' if fw.Enabled else 'No'
+                    metrics.append(Metric('firewall_enabled', 'Yes' if fw.Enabled else 'No', title='Firewall Enabled'))
             except:
                 pass
             
             # UAC
-            if WINREG_AVAILABLE:
+            winreg = optional_import('winreg')
+            if winreg is not None:
                 try:
                     key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Policies\System")
                     uac_level = winreg.QueryValueEx(key, "EnableLUA")[0]
-                    info['UAC Enabled'] = 'Yes' if uac_level else 'No'
+                    metrics.append(Metric('uac_enabled', 'Yes' if uac_level else 'No', title='UAC Enabled'))
                     winreg.CloseKey(key)
                 except:
                     pass
 
         except Exception as e:
-            info['Security Info Error'] = str(e)
+            metrics.append(Metric('security_info_error', str(e), title='Security Info Error'))
             
     else:
-        info['Security Status'] = 'Platform not supported or WMI missing'
+        metrics.append(Metric('security_status', 'Platform not supported or WMI missing', title='Security Status'))
         
-    return info
+    return metrics
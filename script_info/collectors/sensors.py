@@ -0,0 +1,186 @@
+import os
+import re
+import sys
+import threading
+from collections import namedtuple
+
+# Linux hardware sensors from sysfs: hwmon chips (CPU packages and cores,
+# NVMe drives, fans, ...) and ACPI thermal zones. Discovering them means
+# walking and reading dozens of small files, so it is done once; after
+# that every sample only re-reads each sensor's value through a file
+# descriptor that stays open.
+
+SYSFS_CLASS = '/sys/class'
+
+# kind -> (hwmon file prefix, divisor from the raw sysfs value)
+KINDS = {
+    'temperature': ('temp', 1000.0),  # millidegrees Celsius
+    'fan': ('fan', 1),                # RPM
+}
+
+# hwmon threshold suffixes, and what they are reported as
+HWMON_THRESHOLDS = (('min', 'min'), ('max', 'max'), ('crit', 'critical'))
+# Thermal zone trip point types, and the threshold they stand for
+TRIP_THRESHOLDS = {'hot': 'max', 'critical': 'critical'}
+
+# One sensor. `thresholds` is a tuple of (name, value) pairs read at
+# discovery; `path` is the file sampled on every tick.
+Sensor = namedtuple('Sensor', 'chip kind label path thresholds')
+
+_PREFIX_KINDS = {prefix: kind for kind, (prefix, _) in KINDS.items()}
+_INPUT_RE = re.compile(r'^(%s)(\d+)_input$' % '|'.join(_PREFIX_KINDS))
+_TRIP_RE = re.compile(r'^trip_point_(\d+)_type$')
+
+
+def supported(root=SYSFS_CLASS):
+    return sys.platform.startswith('linux') and os.path.isdir(root)
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _read_number(path, divisor):
+    text = _read(path)
+    try:
+        return int(text) / divisor if divisor != 1 else int(text)
+    except (TypeError, ValueError):
+        return None
+
+
+def _natural(name):
+    # hwmon2 before hwmon10
+    match = re.search(r'(\d+)$', name)
+    return (name[:match.start()], int(match.group(1))) if match else (name, -1)
+
+
+def _listdir(path):
+    try:
+        return sorted(os.listdir(path), key=_natural)
+    except OSError:
+        return []
+
+
+def _hwmon_sensors(path, chip):
+    sensors = []
+    base = path
+    files = set(_listdir(base))
+    if not any(map(_INPUT_RE.match, files)):
+        # Older drivers keep their attributes under device/
+        base = os.path.join(path, 'device')
+        files = set(_listdir(base))
+    inputs = sorted((m.group(1), int(m.group(2))) for m in map(_INPUT_RE.match, files) if m)
+    for prefix, index in inputs:
+        kind = _PREFIX_KINDS[prefix]
+        divisor = KINDS[kind][1]
+        stem = f'{prefix}{index}'
+        label = _read(os.path.join(base, f'{stem}_label')) if f'{stem}_label' in files else None
+        thresholds = []
+        for suffix, name in HWMON_THRESHOLDS:
+            if f'{stem}_{suffix}' in files:
+                value = _read_number(os.path.join(base, f'{stem}_{suffix}'), divisor)
+                if value is not None:
+                    thresholds.append((name, value))
+        sensors.append(Sensor(chip, kind, label or stem, os.path.join(base, f'{stem}_input'), tuple(thresholds)))
+    return sensors
+
+
+def _thermal_sensor(path, zone):
+    kind = _read(os.path.join(path, 'type')) or zone
+    files = _listdir(path)
+    thresholds = {}
+    for name in files:
+        match = _TRIP_RE.match(name)
+        if not match:
+            continue
+        threshold = TRIP_THRESHOLDS.get(_read(os.path.join(path, name)))
+        if threshold is None or threshold in thresholds:
+            continue
+        value = _read_number(os.path.join(path, f'trip_point_{match.group(1)}_temp'), 1000.0)
+        if value is not None:
+            thresholds[threshold] = value
+    return Sensor(kind, 'temperature', zone, os.path.join(path, 'temp'), tuple(thresholds.items()))
+
+
+def discover(root=SYSFS_CLASS):
+    """Every hwmon sensor and thermal zone under `root`, with chip names made unique."""
+    sensors = []
+    seen = {}
+
+    def chip_name(name):
+        seen[name] = seen.get(name, 0) + 1
+        return name if seen[name] == 1 else f'{name} #{seen[name]}'
+
+    hwmon = os.path.join(root, 'hwmon')
+    for entry in _listdir(hwmon):
+        path = os.path.join(hwmon, entry)
+        name = _read(os.path.join(path, 'name')) or _read(os.path.join(path, 'device', 'name')) or entry
+        found = _hwmon_sensors(path, name)
+        if found:
+            chip = chip_name(name)
+            sensors.extend(s._replace(chip=chip) for s in found)
+
+    thermal = os.path.join(root, 'thermal')
+    for entry in _listdir(thermal):
+        if entry.startswith('thermal_zone'):
+            sensor = _thermal_sensor(os.path.join(thermal, entry), entry)
+            sensors.append(sensor._replace(chip=chip_name(sensor.chip)))
+    return sensors
+
+
+class SensorSet:
+    """
+    Sensors discovered once, sampled many times. sample() reads each
+    sensor's value with a pread on a descriptor kept open since the first
+    sample; a sensor that cannot be read (e.g. a drive that went to sleep)
+    reports None.
+    """
+
+    def __init__(self, root=SYSFS_CLASS):
+        self.root = root
+        self._sensors = None
+        self._fds = {}
+        self._lock = threading.Lock()
+
+    def sensors(self):
+        if self._sensors is None:
+            with self._lock:
+                if self._sensors is None:
+                    self._sensors = discover(self.root)
+        return self._sensors
+
+    def _value(self, sensor):
+        fd = self._fds.get(sensor.path)
+        try:
+            if fd is None:
+                fd = self._fds[sensor.path] = os.open(sensor.path, os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0))
+            raw = os.pread(fd, 32, 0)
+            value = int(raw)
+        except (OSError, ValueError):
+            return None
+        divisor = KINDS[sensor.kind][1]
+        return value / divisor if divisor != 1 else value
+
+    def sample(self):
+        """[(Sensor, value)] in discovery order."""
+        sensors = self.sensors()
+        with self._lock:
+            return [(sensor, self._value(sensor)) for sensor in sensors]
+
+    def close(self):
+        with self._lock:
+            for fd in self._fds.values():
+                os.close(fd)
+            self._fds.clear()
+
+    def rediscover(self):
+        """Forget the cached sensors, e.g. after hardware was added."""
+        self.close()
+        self._sensors = None
+
+
+sensor_set = SensorSet()
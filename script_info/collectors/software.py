@@ -1,112 +1,80 @@
 import platform
-import shutil
 import subprocess
 import os
-import datetime
-
-# Optional imports
-try:
-    import wmi
-    WMI_AVAILABLE = True
-except ImportError:
-    WMI_AVAILABLE = False
-
-try:
-    import browserhistory as bh
-    BROWSERHISTORY_AVAILABLE = True
-except ImportError:
-    BROWSERHISTORY_AVAILABLE = False
+import sys
+from .registry import register, CHEAP, EXPENSIVE, MODERATE
+from .optional import optional_import
+from .cache import static_fact
+from .devtools import detect_dev_tools
+from .browsers import browser_history_stats
+from .model import Metric, metric_collector, COUNT, TIMESTAMP
 
+@register('python', 'Software', CHEAP)
+@metric_collector
+@static_fact('python', files=lambda: [sys.executable])
 def get_python_info():
-    info = {}
-    info['Python Version'] = platform.python_version()
-    info['Python Implementation'] = platform.python_implementation()
-    info['Python Compiler'] = platform.python_compiler()
-    return info
+    return [
+        Metric('python_version', platform.python_version(), title='Python Version'),
+        Metric('python_implementation', platform.python_implementation(), title='Python Implementation'),
+        Metric('python_compiler', platform.python_compiler(), title='Python Compiler'),
+    ]
 
+@register('dev_tools', 'Software', MODERATE)
+@metric_collector
 def get_dev_tools_info():
-    dev_tools = {
-        'Python': ['python', 'python3'],
-        'Java': ['java'],
-        'GCC': ['gcc'],
-        'Node.js': ['node'],
-        'Git': ['git'],
-        'Docker': ['docker'],
-        'VS Code': ['code'],
-    }
-
-    detected_tools = {}
-    for tool_name, executables in dev_tools.items():
-        found = False
-        for exe in executables:
-            if shutil.which(exe):
-                detected_tools[tool_name] = 'Installed'
-                found = True
-                break
-        if not found:
-            detected_tools[tool_name] = 'Not detected'
-            
-    return {'Development Tools': detected_tools}
+    return [Metric('dev_tool_version', version, None, ('Development Tools', '{tool}'), {'tool': tool})
+            for tool, version in detect_dev_tools().items()]
 
+@register('installed_programs', 'Software', EXPENSIVE, default=False)
+@metric_collector
 def get_installed_programs_info():
-    info = {}
-    if WMI_AVAILABLE and platform.system() == 'Windows':
-        try:
-            c = wmi.WMI()
-            # This can be slow, limiting to top 10
-            programs = c.Win32_Product()
-            # It's an iterator, so we take a slice carefully or list it
-            # Win32_Product is known to be slow and problematic.
-            # A safer/faster way is often Registry, but sticking to WMI for now, simplified.
-            # We'll skip it if it takes too long or just grab a few.
-            # Actually, Win32_Product is discouraged by Microsoft. 
-            # I will wrap this in a very generic try/except and maybe skip it for now 
-            # or replace with a safer check if I had registry access code ready.
-            # For now, I'll comment it out or make it very safe?
-            # The original code had it. I will keep it but limit strictness.
-            installed = []
-            for i, p in enumerate(programs):
-                if i >= 10: break
-                if p.Name: installed.append(p.Name)
-            
-            info['Installed Programs Sample'] = ', '.join(installed)
-        except Exception:
-            info['Installed Programs'] = 'Unable to retrieve (WMI Error)'
-    else:
-        info['Installed Programs'] = 'Not available'
-    return info
+    wmi = optional_import('wmi') if platform.system() == 'Windows' else None
+    if wmi is None:
+        return [Metric('installed_programs', 'Not available', title='Installed Programs')]
+    try:
+        c = wmi.WMI()
+        # Win32_Product is slow and discouraged by Microsoft, hence opt-in;
+        # only a sample of ten names is reported
+        programs = c.Win32_Product()
+        installed = []
+        for i, p in enumerate(programs):
+            if i >= 10: break
+            if p.Name: installed.append(p.Name)
+        return [Metric('installed_programs_sample', installed, title='Installed Programs Sample')]
+    except Exception:
+        return [Metric('installed_programs', 'Unable to retrieve (WMI Error)', title='Installed Programs')]
 
+@register('browser_history', 'Software', EXPENSIVE)
+@metric_collector
 def get_browser_history_info():
-    info = {}
-    if BROWSERHISTORY_AVAILABLE:
-        try:
-            # This can be privacy invasive, ensure it's handled carefully.
-            # We will just get counts, not actual URLs, to be "Professional" and less "Spyware-ish"
-            history = bh.get_history()
-            browser_info = {}
-            for browser_name, browser_history in history.items():
-                if browser_history:
-                    browser_info[f'{browser_name} History Count'] = len(browser_history)
-                    if len(browser_history) > 0:
-                        # Only show the *timestamp* of last visit, not the URL
-                        last_visit = max(browser_history, key=lambda x: x[1] if len(x) > 1 else 0)
-                        datestr = datetime.datetime.fromtimestamp(last_visit[1]).strftime('%Y-%m-%d %H:%M:%S')
-                        browser_info[f'{browser_name} Last Activity'] = datestr
-                else:
-                    browser_info[f'{browser_name}'] = 'No history'
-            info['Browser History Stats'] = browser_info
-        except Exception as e:
-            info['Browser History'] = f'Error: {str(e)}'
-    else:
-        info['Browser History'] = 'Module not installed'
-    return info
+    try:
+        # Counts and the last visit time only, computed inside SQLite;
+        # no URLs are read
+        stats = browser_history_stats()
+    except Exception as e:
+        return [Metric('browser_history', f'Error: {str(e)}', title='Browser History')]
+    if not stats:
+        return [Metric('browser_history', 'No browser profiles found', title='Browser History')]
+
+    metrics = []
+    for browser, entry in stats.items():
+        labels = {'browser': browser}
+        if entry['count']:
+            metrics.append(Metric('browser_history_count', entry['count'], COUNT,
+                                  ('Browser History Stats', '{browser} History Count'), labels))
+            if entry['last']:
+                metrics.append(Metric('browser_last_activity', entry['last'], TIMESTAMP,
+                                      ('Browser History Stats', '{browser} Last Activity'), labels))
+        else:
+            status = 'Unable to read history' if entry['errors'] else 'No history'
+            metrics.append(Metric('browser_history', status, None, ('Browser History Stats', '{browser}'), labels))
+    return metrics
 
 def get_software_info():
     data = {}
     data.update(get_python_info())
     data.update(get_dev_tools_info())
-    # Skipping installed programs for speed/reliability unless requested? 
-    # I'll include it but it's the slowest part often.
-    # data.update(get_installed_programs_info()) 
+    # Installed programs (Win32_Product) is slow and opt-in: select it
+    # explicitly with --only installed_programs.
     data.update(get_browser_history_info())
     return data
@@ -1,45 +1,66 @@
-import psutil
+from .procfs import system
+from .registry import register, CHEAP, MODERATE
+from .mounts import partition_usage, select_partitions
+from .options import options
+from .model import Metric, metric_collector, BYTES, COUNT, PERCENT
 
+@register('disk', 'Storage', CHEAP)
+@metric_collector
 def get_disk_info():
-    info = {}
+    metrics = []
     try:
-        disk = psutil.disk_usage('/')
-        info['Total Disk Space (GB)'] = round(disk.total / (1024**3), 2)
-        info['Used Disk Space (GB)'] = round(disk.used / (1024**3), 2)
-        info['Free Disk Space (GB)'] = round(disk.free / (1024**3), 2)
-        info['Disk Usage (%)'] = disk.percent
+        disk = system.disk_usage('/')
+        metrics.extend([
+            Metric('disk_total', disk.total, BYTES, 'Total Disk Space (GB)'),
+            Metric('disk_used', disk.used, BYTES, 'Used Disk Space (GB)'),
+            Metric('disk_free', disk.free, BYTES, 'Free Disk Space (GB)'),
+            Metric('disk_usage', disk.percent, PERCENT, 'Disk Usage (%)'),
+        ])
     except Exception as e:
-        info['Disk Info'] = f'Error: {str(e)}'
+        metrics.append(Metric('disk', f'Error: {str(e)}', title='Disk Info'))
 
-    disk_io = psutil.disk_io_counters()
+    disk_io = system.disk_io_counters()
     if disk_io:
-        info['Disk Read (MB)'] = round(disk_io.read_bytes / (1024**2), 2)
-        info['Disk Write (MB)'] = round(disk_io.write_bytes / (1024**2), 2)
+        metrics.append(Metric('disk_read', disk_io.read_bytes, BYTES, 'Disk Read (MB)'))
+        metrics.append(Metric('disk_written', disk_io.write_bytes, BYTES, 'Disk Write (MB)'))
     
-    return info
+    return metrics
 
+@register('partitions', 'Storage', MODERATE)
+@metric_collector
 def get_partitions_info():
-    info = {}
+    metrics = []
     try:
-        partitions = psutil.disk_partitions()
+        # all=True also lists network filesystems, which psutil otherwise drops
+        partitions = select_partitions(system.disk_partitions(all=True),
+                                       options.partition_fstypes,
+                                       options.partition_skip_fstypes,
+                                       options.partition_prefixes)
         if partitions:
-            info['Disk Partitions Count'] = len(partitions)
-            for i, part in enumerate(partitions[:5]):  # Limit to 5 partitions
-                info[f'Partition {i+1} Device'] = part.device
-                info[f'Partition {i+1} Mount'] = part.mountpoint
-                info[f'Partition {i+1} Type'] = part.fstype
-                try:
-                    usage = psutil.disk_usage(part.mountpoint)
-                    info[f'Partition {i+1} Total (GB)'] = round(usage.total / (1024**3), 2)
-                    info[f'Partition {i+1} Free (GB)'] = round(usage.free / (1024**3), 2)
-                except Exception:
-                    info[f'Partition {i+1} Usage'] = 'Unable to access'
+            usages = partition_usage(partitions, system, timeout=options.partition_timeout)
+            metrics.append(Metric('partitions', len(usages), COUNT, 'Disk Partitions Count'))
+            merged = sum(len(bound) for _, _, bound in usages)
+            if merged:
+                metrics.append(Metric('bind_mounts_merged', merged, COUNT, 'Bind Mounts Merged'))
+            for i, (part, usage, bound) in enumerate(usages, 1):
+                labels = {'index': i, 'mount': part.mountpoint}
+                metrics.append(Metric('partition_device', part.device, None, 'Partition {index} Device', labels))
+                metrics.append(Metric('partition_mount', part.mountpoint, None, 'Partition {index} Mount', labels))
+                metrics.append(Metric('partition_fstype', part.fstype, None, 'Partition {index} Type', labels))
+                if isinstance(usage, str):
+                    metrics.append(Metric('partition_status', usage, None, 'Partition {index} Usage', labels))
+                    continue
+                metrics.append(Metric('partition_total', usage.total, BYTES, 'Partition {index} Total (GB)', labels))
+                metrics.append(Metric('partition_free', usage.free, BYTES, 'Partition {index} Free (GB)', labels))
+                if bound:
+                    metrics.append(Metric('partition_bind_mounts', len(bound), COUNT,
+                                          'Partition {index} Also Mounted At', labels))
         else:
-            info['Disk Partitions'] = 'None found'
+            metrics.append(Metric('partitions', 'None found', title='Disk Partitions'))
     except Exception as e:
-        info['Partitions'] = f'Error: {str(e)}'
+        metrics.append(Metric('partitions', f'Error: {str(e)}', title='Partitions'))
         
-    return info
+    return metrics
 
 def get_storage_info():
     data = {}
@@ -0,0 +1,18 @@
+import os
+import sys
+
+from .isolation import serve
+
+# Entry point of isolated collector workers (see isolation.py). Requests
+# arrive on stdin and replies leave on stdout; both are moved to private
+# descriptors first, so that anything a collector or its children print or
+# read cannot corrupt the protocol.
+
+if __name__ == '__main__':
+    requests = os.fdopen(os.dup(0), 'rb')
+    replies = os.fdopen(os.dup(1), 'wb')
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    sys.stdout = sys.stderr
+    serve(requests, replies)
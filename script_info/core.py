@@ -1,9 +1,83 @@
-from .collectors import collect_all
+import threading
 
-def get_system_info():
+from .collectors import collect_snapshot, iter_sections, DEFAULT_TIMEOUT
+from .formatting import display_dict
+
+def get_system_info(only=None, skip=None, timeout=DEFAULT_TIMEOUT, collector_timeout=None,
+                    with_timings=False):
     """
     Collect comprehensive system information.
     Returns a dictionary with various system metadata.
-    Refactored to use modular collectors.
+    `only`/`skip` select collectors by name, category or cost class, e.g.
+    get_system_info(only=['cheap']) or get_system_info(skip=['network']).
+    Collectors run concurrently; any that exceed `timeout` (whole run) or
+    `collector_timeout` (per collector) are marked as timed out.
+    With `with_timings=True` returns (info, timings), where timings maps each
+    collector name to a CollectorTiming.
+    """
+    timings = {} if with_timings else None
+    info = collect_snapshot(only, skip, timeout, collector_timeout, timings).to_dict()
+    if with_timings:
+        return info, timings
+    return info
+
+
+def get_snapshot(only=None, skip=None, timeout=DEFAULT_TIMEOUT, collector_timeout=None, timings=None):
+    """
+    Collect a Snapshot: typed per-collector Sections holding raw metric
+    values, units and categories, for programs that consume the numbers.
+    Use snapshot.to_dict() for the display dict get_system_info() returns.
     """
-    return collect_all()
\ No newline at end of file
+    return collect_snapshot(only, skip, timeout, collector_timeout, timings)
+
+
+def iter_system_info(only=None, skip=None, timeout=DEFAULT_TIMEOUT, collector_timeout=None, timings=None):
+    """
+    Generator form of get_system_info(): yield (collector name, info dict)
+    as each collector finishes, fastest first, instead of waiting for the
+    slowest one. Merging every yielded dict gives get_system_info()'s keys.
+    """
+    for section in iter_sections(only, skip, timeout, collector_timeout, timings):
+        yield section.collector, display_dict(section.metrics)
+
+
+_DONE = object()
+
+
+async def aiter_system_info(only=None, skip=None, timeout=DEFAULT_TIMEOUT, collector_timeout=None,
+                            timings=None):
+    """
+    Async iterator over the same (collector name, info dict) pairs as
+    iter_system_info(). Collection runs on a background thread, so the
+    event loop is never blocked:
+
+        async for name, info in aiter_system_info(only=['cheap']):
+            ...
+    """
+    import asyncio  # only async callers pay for importing it
+    loop = asyncio.get_running_loop()
+    results = asyncio.Queue()
+
+    def put(item):
+        try:
+            loop.call_soon_threadsafe(results.put_nowait, item)
+        except RuntimeError:
+            # The event loop was closed before collection finished
+            pass
+
+    def produce():
+        try:
+            for item in iter_system_info(only, skip, timeout, collector_timeout, timings):
+                put(item)
+        except Exception as e:
+            put(e)
+        put(_DONE)
+
+    threading.Thread(target=produce, name='script-info-aiter', daemon=True).start()
+    while True:
+        item = await results.get()
+        if item is _DONE:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
@@ -0,0 +1,106 @@
+import json
+
+from .collectors.model import SKIP_LABELS, Snapshot
+
+# Deltas between nested dicts, such as the values() of two snapshots. Most
+# keys (OS, BIOS, partitions, tools) are the same from one run to the next,
+# so a delta only lists what changed:
+#
+#     {'set': {key: value}, 'del': [key], 'sub': {key: delta}}
+#
+# 'set' holds new or changed values, 'del' keys that went away and 'sub'
+# the delta of a nested dict such as one collector's values. Empty parts
+# are left out, so an unchanged snapshot diffs to {}. Deltas are plain JSON.
+
+_MISSING = object()
+
+
+def values(snapshot):
+    """
+    {collector: {metric id: Metric.value}} of a Snapshot: the typed values
+    (bytes, seconds, percent) rather than display strings. A metric's id is
+    its name plus its identifying labels, e.g. 'interface_mtu{interface=eth0}'.
+    """
+    result = {}
+    for section in snapshot:
+        section_values = result[section.collector] = {}
+        for metric in section.metrics:
+            labels = metric.labels
+            key = metric.name
+            if labels:
+                ident = ','.join(f'{k}={v}' for k, v in sorted(labels.items()) if k not in SKIP_LABELS)
+                if ident:
+                    key = f'{key}{{{ident}}}'
+            section_values[key] = metric.value
+    return result
+
+
+def diff(old, new):
+    """Return the delta that turns dict `old` into dict `new`."""
+    changed = {}
+    nested = {}
+    added = 0
+    get = old.get
+    for key, value in new.items():
+        before = get(key, _MISSING)
+        if before is value:
+            continue
+        if before is _MISSING:
+            added += 1
+            changed[key] = value
+        elif before.__class__ is dict and value.__class__ is dict:
+            sub = diff(before, value)
+            if sub:
+                nested[key] = sub
+        elif before != value or before.__class__ is not value.__class__:
+            # 1 == True, but the type change is still a change
+            changed[key] = value
+
+    delta = {}
+    if changed:
+        delta['set'] = changed
+    # Every key of `new` we did not add also exists in `old`; when the sizes
+    # line up nothing can have been removed
+    if len(new) - added != len(old):
+        delta['del'] = [key for key in old if key not in new]
+    if nested:
+        delta['sub'] = nested
+    return delta
+
+
+def apply(base, delta):
+    """
+    Rebuild the newer dict from `base` and a delta made by diff(). `base` is
+    not modified; a Snapshot stands for its values().
+    """
+    if isinstance(base, Snapshot):
+        base = values(base)
+    result = dict(base)
+    for key in delta.get('del', ()):
+        result.pop(key, None)
+    result.update(delta.get('set', ()))
+    for key, sub in delta.get('sub', {}).items():
+        before = result.get(key)
+        result[key] = apply(before if isinstance(before, dict) else {}, sub)
+    return result
+
+
+def changed_keys(delta):
+    """Number of top-level and nested values a delta sets or removes."""
+    return (len(delta.get('set', ())) + len(delta.get('del', ()))
+            + sum(changed_keys(sub) for sub in delta.get('sub', {}).values()))
+
+
+def write_delta(baseline, snapshot, out):
+    """
+    Write the changes in values() from Snapshot `baseline` to `snapshot` as
+    one JSON document, with enough context to find the baseline it applies to.
+    """
+    doc = {
+        'host': snapshot.host,
+        'taken_at': snapshot.taken_at,
+        'since': baseline.taken_at,
+        'delta': diff(values(baseline), values(snapshot)),
+    }
+    json.dump(doc, out, ensure_ascii=False, separators=(',', ':'), default=str)
+    out.write('\n')
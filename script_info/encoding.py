@@ -0,0 +1,410 @@
+import json
+import struct
+
+from .collectors.model import Metric, Section, Snapshot
+
+# Machine-readable snapshot encodings: JSON, NDJSON and a compact binary
+# format. All three write to a stream as they go; the binary format has a
+# matching decoder so snapshots can be shipped between hosts and read back.
+
+FORMATS = ('json', 'ndjson', 'binary')
+
+# --- JSON / NDJSON ---------------------------------------------------------
+
+_dumps = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=str).encode
+
+
+def _metric_json(metric):
+    item = {'name': metric.name, 'value': metric.value}
+    if metric.unit is not None:
+        item['unit'] = metric.unit
+    if metric.labels:
+        item['labels'] = metric.labels
+    item['title'] = metric.title
+    return item
+
+
+def write_json(snapshot, out):
+    """One JSON document per snapshot, written section by section."""
+    out.write('{"host":%s,"taken_at":%s,"sections":[' % (_dumps(snapshot.host), _dumps(snapshot.taken_at)))
+    for i, section in enumerate(snapshot.sections):
+        if i:
+            out.write(',')
+        out.write('{"collector":%s,"category":%s,"status":%s,"metrics":%s}' % (
+            _dumps(section.collector), _dumps(section.category), _dumps(section.status),
+            _dumps([_metric_json(m) for m in section.metrics])))
+    out.write(']}\n')
+
+
+def _snapshot_from_json(doc):
+    sections = []
+    for section in doc['sections']:
+        metrics = [Metric.from_tuple((m['name'], m['value'], m.get('unit'), m['title'], m.get('labels')))
+                   for m in section['metrics']]
+        sections.append(Section(section['collector'], section['category'], metrics, section['status']))
+    return Snapshot(sections, doc['taken_at'], doc['host'])
+
+
+def read_json(stream):
+    """Read back a Snapshot written by write_json."""
+    return _snapshot_from_json(json.load(stream))
+
+
+def write_ndjson(snapshot, out):
+    """One JSON object per metric and line, each carrying its host and section."""
+    host, taken_at = snapshot.host, snapshot.taken_at
+    for section in snapshot.sections:
+        for metric in section.metrics:
+            item = {'host': host, 'taken_at': taken_at, 'collector': section.collector,
+                    'category': section.category}
+            item.update(_metric_json(metric))
+            out.write(_dumps(item))
+            out.write('\n')
+
+
+# --- Binary ----------------------------------------------------------------
+#
+# frame    := MAGIC varint(len(body)) body
+# body     := VERSION f64(taken_at) sym(host) section* END
+# section  := SECTION sym(collector) sym(category) sym(status) varint(n) metric*n
+# metric   := varint(0) schema label-value*k value   (defines the next schema)
+#           | varint(id + 1) label-value*k value      (reuses schema `id`)
+# schema   := sym(name) sym(unit) title varint(k) sym(label key)*k
+# title    := 0 sym | 1 sym(group) sym(key)
+# value    := NONE | TRUE | FALSE | INT zigzag-varint | FLOAT f64
+#           | STR varint(len) utf8 | LIST varint(n) value*n | SYM sym
+# sym      := varint(0) varint(len) utf8   (defines the next symbol)
+#           | varint(index + 1)            (reuses a symbol)
+#
+# The schema of a metric (name, unit, title and label keys) is sent once
+# per frame; every further metric of that shape, e.g. each interface's MAC,
+# costs a schema reference plus its values. String label values are
+# interned as symbols. Frames are length prefixed and can be concatenated,
+# e.g. snapshots from many hosts.
+
+MAGIC = b'SIv'
+VERSION = 1
+
+_END, _SECTION = 0, 1
+_NONE, _TRUE, _FALSE, _INT, _FLOAT, _STR, _LIST, _SYM = range(8)
+
+_f64 = struct.Struct('<d')
+
+
+class BinaryError(ValueError):
+    pass
+
+
+def _varint(buf, n):
+    while n > 0x7f:
+        buf.append((n & 0x7f) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+class _Encoder:
+    __slots__ = ('buf', 'symbols', 'schemas')
+
+    def __init__(self):
+        self.buf = bytearray()
+        self.symbols = {}
+        self.schemas = {}
+
+    def sym(self, text):
+        index = self.symbols.get(text)
+        if index is not None:
+            index += 1
+            if index < 0x80:
+                self.buf.append(index)
+            else:
+                _varint(self.buf, index)
+            return
+        self.symbols[text] = len(self.symbols)
+        data = text.encode('utf-8')
+        self.buf.append(0)
+        _varint(self.buf, len(data))
+        self.buf += data
+
+    def value(self, value):
+        buf = self.buf
+        kind = value.__class__
+        if kind is str:
+            data = value.encode('utf-8')
+            buf.append(_STR)
+            _varint(buf, len(data))
+            buf += data
+        elif kind is float:
+            buf.append(_FLOAT)
+            buf += _f64.pack(value)
+        elif kind is int:
+            buf.append(_INT)
+            _varint(buf, (value << 1) if value >= 0 else ((-value << 1) - 1))
+        elif value is None:
+            buf.append(_NONE)
+        elif value is True:
+            buf.append(_TRUE)
+        elif value is False:
+            buf.append(_FALSE)
+        elif isinstance(value, int):
+            self.value(int(value))
+        elif isinstance(value, float):
+            self.value(float(value))
+        elif isinstance(value, (list, tuple)):
+            buf.append(_LIST)
+            _varint(buf, len(value))
+            for item in value:
+                self.value(item)
+        else:
+            self.value(str(value))
+
+    def metrics(self, metrics):
+        buf = self.buf
+        schemas = self.schemas
+        sym = self.sym
+        value = self.value
+        for metric in metrics:
+            labels = metric.labels
+            key = (metric.name, metric.unit, metric.title, tuple(labels) if labels else ())
+            schema = schemas.get(key)
+            if schema is None:
+                schemas[key] = len(schemas)
+                buf.append(0)
+                sym(metric.name)
+                sym(metric.unit or '')
+                title = metric.title
+                if isinstance(title, tuple):
+                    buf.append(1)
+                    sym(title[0])
+                    sym(title[1])
+                else:
+                    buf.append(0)
+                    sym(title)
+                _varint(buf, len(key[3]))
+                for label in key[3]:
+                    sym(label)
+            elif schema < 0x7f:
+                buf.append(schema + 1)
+            else:
+                _varint(buf, schema + 1)
+            if labels:
+                for label_value in labels.values():
+                    # Label values repeat (interface and mount names)
+                    if label_value.__class__ is str:
+                        buf.append(_SYM)
+                        sym(label_value)
+                    else:
+                        value(label_value)
+            value(metric.value)
+
+
+def encode_binary(snapshot):
+    """Encode a Snapshot as one self-contained binary frame."""
+    enc = _Encoder()
+    buf = enc.buf
+    buf.append(VERSION)
+    buf += _f64.pack(snapshot.taken_at)
+    enc.sym(snapshot.host)
+    for section in snapshot.sections:
+        buf.append(_SECTION)
+        enc.sym(section.collector)
+        enc.sym(section.category)
+        enc.sym(section.status)
+        _varint(buf, len(section.metrics))
+        enc.metrics(section.metrics)
+    buf.append(_END)
+    frame = bytearray(MAGIC)
+    _varint(frame, len(buf))
+    frame += buf
+    return bytes(frame)
+
+
+def write_binary(snapshot, out):
+    out.write(encode_binary(snapshot))
+
+
+class _Decoder:
+    __slots__ = ('data', 'pos', 'end', 'symbols', 'schemas')
+
+    def __init__(self, data, pos=0, end=None):
+        self.data = data
+        self.pos = pos
+        self.end = len(data) if end is None else end
+        self.symbols = []
+        self.schemas = []
+
+    def byte(self):
+        pos = self.pos
+        if pos >= self.end:
+            raise BinaryError('Truncated snapshot')
+        self.pos = pos + 1
+        return self.data[pos]
+
+    def varint(self):
+        b = self.byte()
+        if b < 0x80:
+            return b
+        result = b & 0x7f
+        shift = 7
+        while True:
+            b = self.byte()
+            result |= (b & 0x7f) << shift
+            if b < 0x80:
+                return result
+            shift += 7
+
+    def take(self, n):
+        start = self.pos
+        end = start + n
+        if end > self.end:
+            raise BinaryError('Truncated snapshot')
+        self.pos = end
+        return start, end
+
+    def text(self, n):
+        start, end = self.take(n)
+        return str(self.data[start:end], 'utf-8')
+
+    def f64(self):
+        start, _ = self.take(8)
+        return _f64.unpack_from(self.data, start)[0]
+
+    def sym(self):
+        index = self.varint()
+        if index:
+            try:
+                return self.symbols[index - 1]
+            except IndexError:
+                raise BinaryError(f'Unknown symbol {index - 1}') from None
+        text = self.text(self.varint())
+        self.symbols.append(text)
+        return text
+
+    def value(self):
+        tag = self.byte()
+        if tag == _STR:
+            return self.text(self.varint())
+        if tag == _FLOAT:
+            return self.f64()
+        if tag == _INT:
+            n = self.varint()
+            return (n >> 1) if not n & 1 else -((n + 1) >> 1)
+        if tag == _SYM:
+            return self.sym()
+        if tag == _NONE:
+            return None
+        if tag == _TRUE:
+            return True
+        if tag == _FALSE:
+            return False
+        if tag == _LIST:
+            return [self.value() for _ in range(self.varint())]
+        raise BinaryError(f'Unknown value tag {tag}')
+
+    def schema(self):
+        name = self.sym()
+        unit = self.sym() or None
+        title = (self.sym(), self.sym()) if self.byte() else self.sym()
+        label_keys = tuple(self.sym() for _ in range(self.varint()))
+        schema = (name, unit, title, label_keys)
+        self.schemas.append(schema)
+        return schema
+
+    def metrics(self, count):
+        metrics = []
+        schemas = self.schemas
+        value = self.value
+        for _ in range(count):
+            ref = self.varint()
+            if ref:
+                try:
+                    name, unit, title, label_keys = schemas[ref - 1]
+                except IndexError:
+                    raise BinaryError(f'Unknown schema {ref - 1}') from None
+            else:
+                name, unit, title, label_keys = self.schema()
+            labels = {key: value() for key in label_keys} if label_keys else None
+            metrics.append(Metric(name, value(), unit, title, labels))
+        return metrics
+
+    def snapshot(self):
+        version = self.byte()
+        if version != VERSION:
+            raise BinaryError(f'Unsupported snapshot version {version}')
+        taken_at = self.f64()
+        host = self.sym()
+        sections = []
+        while True:
+            marker = self.byte()
+            if marker == _END:
+                break
+            if marker != _SECTION:
+                raise BinaryError(f'Unexpected marker {marker}')
+            collector, category, status = self.sym(), self.sym(), self.sym()
+            sections.append(Section(collector, category, self.metrics(self.varint()), status))
+        return Snapshot(sections, taken_at, host)
+
+
+def _frame(data, pos):
+    """Return (body start, body end) of the frame at `pos`."""
+    if bytes(data[pos:pos + len(MAGIC)]) != MAGIC:
+        raise BinaryError('Not a script-info snapshot')
+    header = _Decoder(data, pos + len(MAGIC))
+    length = header.varint()
+    end = header.pos + length
+    if end > len(data):
+        raise BinaryError('Truncated snapshot')
+    return header.pos, end
+
+
+def decode_binary(data):
+    """Decode one binary frame (as produced by encode_binary) to a Snapshot."""
+    start, end = _frame(data, 0)
+    return _Decoder(data, start, end).snapshot()
+
+
+def iter_binary(data):
+    """Decode every frame in a buffer of concatenated snapshots."""
+    pos = 0
+    while pos < len(data):
+        start, end = _frame(data, pos)
+        yield _Decoder(data, start, end).snapshot()
+        pos = end
+
+
+def read_binary(stream):
+    """Yield Snapshots from a binary stream (file or pipe), one frame at a time."""
+    while True:
+        magic = stream.read(len(MAGIC))
+        if not magic:
+            return
+        if magic != MAGIC:
+            raise BinaryError('Not a script-info snapshot')
+        length = shift = 0
+        while True:
+            b = stream.read(1)
+            if not b:
+                raise BinaryError('Truncated snapshot')
+            length |= (b[0] & 0x7f) << shift
+            if b[0] < 0x80:
+                break
+            shift += 7
+        body = stream.read(length)
+        if len(body) != length:
+            raise BinaryError('Truncated snapshot')
+        yield _Decoder(body).snapshot()
+
+
+def read_snapshot(path):
+    """Load a Snapshot saved with --format json or --format binary."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data.startswith(MAGIC):
+        return decode_binary(data)
+    try:
+        doc = json.loads(data.decode('utf-8'))
+        return _snapshot_from_json(doc)
+    except (UnicodeDecodeError, ValueError, KeyError, TypeError) as e:
+        raise ValueError(f'{path} is not a script-info snapshot ({e})') from None
+
+
+WRITERS = {'json': write_json, 'ndjson': write_ndjson, 'binary': write_binary}
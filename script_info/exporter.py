@@ -0,0 +1,225 @@
+import http.server
+import json
+import re
+import urllib.parse
+import threading
+import time
+
+from .collectors import DEFAULT_TIMEOUT, collect_snapshot, configure
+from .collectors.model import (BYTES, CELSIUS, COUNTERS, DURATION, MBPS, MHZ, PERCENT, SECONDS, SKIP_LABELS,
+                               TIMESTAMP)
+from .collectors.profiling import STATUS_OK
+from .history import HistoryStore
+from .watch import ticks
+
+# OpenMetrics exporter: a background thread collects on a fixed schedule
+# and renders the payload once; scrapes only ever read the latest payload,
+# so any number of scrapers cause no extra collector runs.
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+PREFIX = 'script_info_'
+DEFAULT_PORT = 9184
+DEFAULT_INTERVAL = 15.0
+# Window of /history summaries unless ?window= says otherwise
+DEFAULT_HISTORY_WINDOW = 3600
+
+# Collectors with numeric metrics worth scraping
+DEFAULT_COLLECTORS = ('boot', 'cpu', 'memory', 'disk', 'partitions', 'network_io',
+                      'interfaces', 'battery', 'gpu', 'sensors')
+
+# unit -> (OpenMetrics unit, factor to base units)
+UNITS = {
+    BYTES: ('bytes', 1),
+    SECONDS: ('seconds', 1),
+    DURATION: ('seconds', 1),
+    TIMESTAMP: ('seconds', 1),
+    PERCENT: ('percent', 1),
+    CELSIUS: ('celsius', 1),
+    MHZ: ('hertz', 1_000_000),
+    MBPS: ('bits_per_second', 1_000_000),
+}
+
+_INVALID = re.compile(r'[^a-zA-Z0-9_]')
+
+
+def _label_value(value):
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _number(value):
+    if value != value:
+        return 'NaN'
+    if value in (float('inf'), float('-inf')):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(value)
+
+
+def _sample_name(metric):
+    unit, _ = UNITS.get(metric.unit, (None, 1))
+    name = PREFIX + _INVALID.sub('_', metric.name)
+    if metric.unit == TIMESTAMP:
+        name += '_timestamp'
+    if unit and not name.endswith('_' + unit):
+        name += '_' + unit
+    return name, unit
+
+
+def render_openmetrics(snapshot, timings=None):
+    """
+    Render the numeric metrics of a Snapshot as OpenMetrics text. Samples
+    of one family are kept together as the format requires; text values
+    are left out. `timings` adds per-collector duration gauges.
+    """
+    families = {}
+    for section in snapshot:
+        for metric in section.metrics:
+            value = metric.value
+            if isinstance(value, bool):
+                value = int(value)
+            elif not isinstance(value, (int, float)):
+                continue
+            name, unit = _sample_name(metric)
+            family = families.get(name)
+            if family is None:
+                kind = 'counter' if metric.name in COUNTERS else 'gauge'
+                family = families[name] = (kind, unit, [])
+            labels = metric.labels
+            if labels:
+                label_text = ','.join(f'{_INVALID.sub("_", k)}="{_label_value(v)}"'
+                                      for k, v in labels.items() if k not in SKIP_LABELS)
+            else:
+                label_text = ''
+            family[2].append((label_text, value * UNITS.get(metric.unit, (None, 1))[1]))
+
+    lines = []
+    for name, (kind, unit, samples) in families.items():
+        lines.append(f'# TYPE {name} {kind}')
+        if unit:
+            lines.append(f'# UNIT {name} {unit}')
+        suffix = '_total' if kind == 'counter' else ''
+        for label_text, value in samples:
+            labels = f'{{{label_text}}}' if label_text else ''
+            lines.append(f'{name}{suffix}{labels} {_number(value)}')
+
+    lines.append(f'# TYPE {PREFIX}collector_up gauge')
+    for section in snapshot:
+        lines.append(f'{PREFIX}collector_up{{collector="{section.collector}"}} {int(section.status == STATUS_OK)}')
+    if timings:
+        lines.append(f'# TYPE {PREFIX}collector_duration_seconds gauge')
+        lines.append(f'# UNIT {PREFIX}collector_duration_seconds seconds')
+        for name, timing in timings.items():
+            lines.append(f'{PREFIX}collector_duration_seconds{{collector="{name}"}} {timing.wall!r}')
+    lines.append(f'# TYPE {PREFIX}snapshot_timestamp_seconds gauge')
+    lines.append(f'# UNIT {PREFIX}snapshot_timestamp_seconds seconds')
+    lines.append(f'{PREFIX}snapshot_timestamp_seconds {snapshot.taken_at!r}')
+    lines.append('# EOF\n')
+    return '\n'.join(lines)
+
+
+class MetricsCache:
+    """
+    Holds the latest rendered payload. refresh() is only called from the
+    refresher thread, so collector runs never overlap; readers take the
+    current bytes object, which is replaced atomically. Every run is also
+    recorded in `history`.
+    """
+
+    def __init__(self, only=None, skip=None, timeout=DEFAULT_TIMEOUT, collector_timeout=None):
+        self.only = list(only) if only else list(DEFAULT_COLLECTORS)
+        self.skip = skip
+        self.timeout = timeout
+        self.collector_timeout = collector_timeout
+        self.payload = None
+        self.refreshed_at = None
+        self.runs = 0
+        self.history = HistoryStore()
+
+    def refresh(self):
+        timings = {}
+        snapshot = collect_snapshot(self.only, self.skip, self.timeout, self.collector_timeout, timings)
+        self.payload = render_openmetrics(snapshot, timings).encode('utf-8')
+        self.history.record(snapshot)
+        self.refreshed_at = time.time()
+        self.runs += 1
+
+
+def refresh_loop(cache, interval, stop):
+    """Refresh `cache` every `interval` seconds until `stop` is set."""
+    for _ in ticks(interval, sleep=stop.wait):
+        if stop.is_set():
+            return
+        try:
+            cache.refresh()
+        except Exception:
+            # Keep serving the previous payload
+            pass
+
+
+class MetricsHandler(http.server.BaseHTTPRequestHandler):
+    cache = None
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        if url.path == '/history':
+            self.send_history(urllib.parse.parse_qs(url.query))
+            return
+        if url.path not in ('/metrics', '/'):
+            self.send_error(404)
+            return
+        payload = self.cache.payload
+        if payload is None:
+            self.send_error(503, 'First collection still running')
+            return
+        self.send_body(payload, CONTENT_TYPE)
+
+    def send_history(self, query):
+        try:
+            window = float(query.get('window', [DEFAULT_HISTORY_WINDOW])[0])
+        except ValueError:
+            window = None
+        if window is None or not 0 < window < float('inf'):
+            # Also keeps NaN out of the JSON
+            self.send_error(400, 'window must be a positive number of seconds')
+            return
+        series = [dict(name=name, labels=dict(labels), **summary._asdict())
+                  for (name, labels), summary in self.cache.history.summaries(window)]
+        history = {'window': window, 'dropped': self.cache.history.dropped, 'series': series}
+        self.send_body(json.dumps(history).encode('utf-8'), 'application/json')
+
+    def send_body(self, payload, content_type):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(cache, host='127.0.0.1', port=DEFAULT_PORT):
+    handler = type('Handler', (MetricsHandler,), {'cache': cache})
+    server = http.server.ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(host='127.0.0.1', port=DEFAULT_PORT, interval=DEFAULT_INTERVAL, only=None, skip=None,
+          timeout=DEFAULT_TIMEOUT, out=print):
+    """Collect once, then serve /metrics while refreshing in the background."""
+    # Scrapes want utilisation over each refresh interval, never the since-boot average
+    configure(cpu_min_window=0)
+    cache = MetricsCache(only, skip, timeout)
+    cache.refresh()
+    stop = threading.Event()
+    refresher = threading.Thread(target=refresh_loop, args=(cache, interval, stop),
+                                 name='script-info-refresh', daemon=True)
+    refresher.start()
+    server = make_server(cache, host, port)
+    out(f"Serving OpenMetrics on http://{host}:{server.server_address[1]}/metrics "
+        f"(refreshing every {interval:g}s)")
+    try:
+        server.serve_forever()
+    finally:
+        stop.set()
+        server.server_close()
@@ -0,0 +1,87 @@
+import datetime
+
+from .collectors.model import BYTES, CELSIUS, COUNT, DURATION, MBPS, MHZ, PERCENT, RPM, SECONDS, TIMESTAMP
+
+# Units whose values are shown as they are
+PLAIN_UNITS = frozenset({None, COUNT, MHZ, MBPS, RPM})
+
+# Display units a title may end with, and what a raw byte count is divided by
+BYTE_SCALES = {'(GB)': 1024 ** 3, '(MB)': 1024 ** 2, '(KB)': 1024}
+
+
+def format_bytes(value):
+    for unit in ('B', 'KB', 'MB', 'GB', 'TB'):
+        if abs(value) < 1024 or unit == 'TB':
+            return f'{value:.0f} {unit}' if unit == 'B' else f'{value:.2f} {unit}'
+        value /= 1024
+
+
+def metric_key(metric):
+    """The display key of a metric; (group, key) for nested titles."""
+    title = metric.title
+    labels = metric.labels
+    if not labels:
+        return title
+    if isinstance(title, tuple):
+        return tuple(part.format_map(labels) for part in title)
+    return title.format_map(labels)
+
+
+def format_value(metric, key=None):
+    """Render a metric's raw value the way it is shown to people."""
+    value = metric.value
+    unit = metric.unit
+    if isinstance(value, (list, tuple)):
+        return ', '.join(map(str, value))
+    if unit is None or isinstance(value, (str, bool)):
+        return value
+    if value is None:
+        return 'N/A'
+    if unit in (BYTES, SECONDS):
+        key = key if key is not None else metric_key(metric)
+        suffix = (key[-1] if isinstance(key, tuple) else key).rsplit(' ', 1)[-1]
+        if unit == SECONDS:
+            # '(s)' titles show the number, others a '12.34s' string
+            return round(value, 3) if suffix == '(s)' else f'{value:.2f}s'
+        scale = BYTE_SCALES.get(suffix)
+        return round(value / scale, 2) if scale else format_bytes(value)
+    if unit in (PERCENT, CELSIUS):
+        return round(value, 1)
+    if unit == DURATION:
+        return str(datetime.timedelta(seconds=int(value)))
+    if unit == TIMESTAMP:
+        return datetime.datetime.fromtimestamp(value).strftime('%Y-%m-%d %H:%M:%S')
+    return value
+
+
+def display_dict(metrics):
+    """
+    Flatten metrics into the display dict the CLI, GUI and PDF report have
+    always shown: {title: formatted value}, with (group, key) titles nested.
+    """
+    info = {}
+    for metric in metrics:
+        # metric_key() and format_value() inlined for the common cases:
+        # snapshots of large hosts hold tens of thousands of metrics
+        title = metric.title
+        labels = metric.labels
+        if labels:
+            key = tuple(part.format_map(labels) for part in title) if isinstance(title, tuple) \
+                else title.format_map(labels)
+        else:
+            key = title
+        value = metric.value
+        unit = metric.unit
+        if unit in PLAIN_UNITS:
+            if isinstance(value, (list, tuple)):
+                value = format_value(metric, key)
+        else:
+            value = format_value(metric, key)
+        if isinstance(key, tuple):
+            group = info.get(key[0])
+            if not isinstance(group, dict):
+                group = info[key[0]] = {}
+            group[key[1]] = value
+        else:
+            info[key] = value
+    return info
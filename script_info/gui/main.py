@@ -1,10 +1,36 @@
 import tkinter as tk
 from tkinter import scrolledtext, messagebox, filedialog
+import queue
 import threading
-from ..core import get_system_info
+from ..collectors import iter_sections, in_declaration_order
+from ..collectors.model import Snapshot
+from ..formatting import display_dict
 from ..reporting import PDFReporter
 import datetime
 
+# How often the main loop checks for finished collectors
+POLL_MS = 50
+# Rows per text_area.insert() call, and the most rows rendered before
+# handing control back to the Tk event loop
+BATCH_ROWS = 500
+ROWS_PER_TICK = 5000
+
+
+def section_rows(section):
+    """(text, tag) pairs for one collector's results, as shown in the text area."""
+    rows = [(f"\n[{section.category}] {section.collector}\n", "section")]
+    for key, value in display_dict(section.metrics).items():
+        if isinstance(value, dict):
+            rows.append((f"{key}:\n", "key"))
+            for k, v in value.items():
+                rows.append((f"  {k}: ", "key"))
+                rows.append((f"{v}\n", "value"))
+        else:
+            rows.append((f"{key}: ", "key"))
+            rows.append((f"{value}\n", "value"))
+    return rows
+
+
 class SystemInfoGUI:
     def __init__(self, root):
         self.root = root
@@ -13,6 +39,11 @@ class SystemInfoGUI:
         
         # Data store
         self.current_info = {}
+        # Collection in progress: sections received, rows not yet rendered
+        self.generation = 0
+        self.sections = []
+        self.pending_rows = []
+        self.item_count = 0
 
         # Styles
         self.bg_color = "#f0f0f0"
@@ -57,6 +88,7 @@ class SystemInfoGUI:
 
         # Tags
         self.text_area.tag_config("header", font=("Consolas", 12, "bold"), foreground="#1976D2")
+        self.text_area.tag_config("section", font=("Consolas", 11, "bold"), foreground="#616161")
         self.text_area.tag_config("key", font=("Consolas", 10, "bold"), foreground="#388E3C")
         self.text_area.tag_config("value", font=("Consolas", 10), foreground="#000000")
 
@@ -84,39 +116,73 @@ class SystemInfoGUI:
         self.set_buttons_state(tk.DISABLED)
         self.log("Collecting system information... Please wait.", "blue")
         self.text_area.delete(1.0, tk.END)
-        self.text_area.insert(tk.END, "Loading...\n")
-        
+        self.text_area.insert(tk.END, "System Information Report\n", "header", "=" * 30 + "\n", "header")
+
+        # Results from an earlier, abandoned collection are ignored
+        self.generation += 1
+        self.sections = []
+        self.pending_rows = []
+        self.item_count = 0
+        results = queue.Queue()
+
         # Run in thread
-        thread = threading.Thread(target=self.collect_bg)
+        thread = threading.Thread(target=self.collect_bg, args=(results,))
         thread.daemon = True
         thread.start()
+        self.root.after(POLL_MS, self.drain_results, self.generation, results, False)
 
-    def collect_bg(self):
+    def collect_bg(self, results):
+        # Tk is not thread safe: hand each section to the main loop via the queue
         try:
-            info = get_system_info()
-            # Schedule UI update on main thread
-            self.root.after(0, self.collection_complete, info)
+            for section in iter_sections():
+                results.put(('section', section))
+            results.put(('done', None))
         except Exception as e:
-            self.root.after(0, self.collection_error, str(e))
+            results.put(('error', str(e)))
 
-    def collection_complete(self, info):
-        self.current_info = info
-        self.text_area.delete(1.0, tk.END)
-        
-        self.text_area.insert(tk.END, "System Information Report\n", "header")
-        self.text_area.insert(tk.END, "=" * 30 + "\n\n", "header")
-
-        for key, value in info.items():
-            if isinstance(value, dict):
-                 self.text_area.insert(tk.END, f"{key}:\n", "key")
-                 for k, v in value.items():
-                     self.text_area.insert(tk.END, f"  {k}: ", "key")
-                     self.text_area.insert(tk.END, f"{v}\n", "value")
+    def drain_results(self, generation, results, finished):
+        if generation != self.generation:
+            return
+        while True:
+            try:
+                kind, payload = results.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'section':
+                self.sections.append(payload)
+                rows = section_rows(payload)
+                self.item_count += sum(1 for _, tag in rows if tag == "key")
+                self.pending_rows.extend(rows)
+            elif kind == 'done':
+                finished = True
             else:
-                self.text_area.insert(tk.END, f"{key}: ", "key")
-                self.text_area.insert(tk.END, f"{value}\n", "value")
-
-        self.log(f"Collection complete. Found {len(info)} items.", "green")
+                self.collection_error(payload)
+                return
+
+        self.render_pending()
+        if self.pending_rows or not finished:
+            if not finished:
+                self.log(f"Collecting system information... {len(self.sections)} collectors done.", "blue")
+            # Keep going straight away while there is a backlog to render
+            delay = 1 if self.pending_rows else POLL_MS
+            self.root.after(delay, self.drain_results, generation, results, finished)
+        else:
+            self.collection_complete(Snapshot(in_declaration_order(self.sections)))
+
+    def render_pending(self):
+        """Insert up to ROWS_PER_TICK pending rows, BATCH_ROWS per insert() call."""
+        rows = self.pending_rows[:ROWS_PER_TICK]
+        del self.pending_rows[:ROWS_PER_TICK]
+        for start in range(0, len(rows), BATCH_ROWS):
+            args = []
+            for text, tag in rows[start:start + BATCH_ROWS]:
+                args.append(text)
+                args.append(tag)
+            self.text_area.insert(tk.END, *args)
+
+    def collection_complete(self, snapshot):
+        self.current_info = snapshot
+        self.log(f"Collection complete. Found {self.item_count} items.", "green")
         self.set_buttons_state(tk.NORMAL)
 
     def collection_error(self, error_msg):
@@ -0,0 +1,327 @@
+import math
+import threading
+import time
+from array import array
+from collections import namedtuple
+
+from .collectors.model import COUNTERS, SKIP_LABELS
+
+# In-process history of numeric metrics in bounded memory. Each series
+# keeps one ring buffer per tier, as two flat arrays: (bucket number,
+# sample count) as uint32 and (min, max, sum) as float32, 20 bytes a
+# bucket. A sample updates the current bucket of every tier, so coarser
+# tiers are downsampled as samples arrive and nothing is ever
+# re-aggregated. Rings grow only while their oldest bucket is still within
+# the tier's span, so a series sampled every 15 s never holds more than 40
+# one-second buckets.
+
+# (bucket seconds, buckets kept): 10 minutes by the second, a day by the
+# minute and a week by the hour
+TIERS = ((1, 600), (60, 1440), (3600, 168))
+
+# Collectors whose numeric metrics are recorded
+HISTORY_COLLECTORS = ('cpu', 'memory', 'disk', 'network_io', 'interfaces', 'gpu', 'sensors')
+
+# Metrics that do not change while the host runs; recording them would only cost memory
+STATIC_METRICS = frozenset({
+    'cpu_physical_cores', 'cpu_logical_cores', 'cpu_usage_window',
+    'memory_total', 'swap_total', 'disk_total', 'gpu_memory_total',
+    'interface_mtu', 'interface_speed',
+    'temperature_min', 'temperature_max', 'temperature_critical',
+    'fan_speed_min', 'fan_speed_max', 'fan_speed_critical',
+})
+
+# Series kept at most (about 44 KB each when every tier is full); values of
+# further series are dropped and counted in HistoryStore.dropped
+MAX_SERIES = 5000
+
+# How often (in seconds of sample time) series that stopped reporting are
+# looked for, e.g. the veth of a container that is gone
+EXPIRE_EVERY = 60
+
+Summary = namedtuple('Summary', 'min max mean p95 count')
+
+
+def _f32(value):
+    # Values are stored as float32: drop the digits that are noise
+    return float(f'{value:.7g}')
+
+
+class Tier:
+    """
+    A ring of up to `capacity` buckets of `resolution` seconds each, oldest
+    first from head + 1. Samples older than the current bucket (a clock
+    that stepped back) are dropped.
+    """
+
+    __slots__ = ('resolution', 'capacity', 'ints', 'floats', 'head')
+
+    def __init__(self, resolution, capacity):
+        self.resolution = resolution
+        self.capacity = capacity
+        self.ints = array('I')
+        self.floats = array('f')
+        self.head = -1
+
+    def __len__(self):
+        return len(self.ints) // 2
+
+    @property
+    def span(self):
+        return self.resolution * self.capacity
+
+    @property
+    def nbytes(self):
+        return self.ints.itemsize * len(self.ints) + self.floats.itemsize * len(self.floats)
+
+    def add(self, when, value):
+        bucket = int(when // self.resolution)
+        ints = self.ints
+        floats = self.floats
+        head = self.head
+        if head >= 0 and bucket <= ints[2 * head]:
+            if bucket < ints[2 * head]:
+                return
+            f = 3 * head
+            if value < floats[f]:
+                floats[f] = value
+            if value > floats[f + 1]:
+                floats[f + 1] = value
+            floats[f + 2] += value
+            ints[2 * head + 1] += 1
+            return
+        size = len(ints) // 2
+        oldest = (head + 1) % size if size else 0
+        if size < self.capacity and (not size or ints[2 * oldest] > bucket - self.capacity):
+            # The oldest bucket is still wanted: grow, inserting after head
+            head += 1
+            ints[2 * head:2 * head] = array('I', (bucket, 1))
+            floats[3 * head:3 * head] = array('f', (value, value, value))
+        else:
+            head = oldest
+            ints[2 * head] = bucket
+            ints[2 * head + 1] = 1
+            floats[3 * head] = floats[3 * head + 1] = floats[3 * head + 2] = value
+        self.head = head
+
+    @property
+    def latest(self):
+        return self.ints[2 * self.head] * self.resolution if self.head >= 0 else None
+
+    def _slices(self, since):
+        """
+        The physical bucket ranges, oldest first, of the buckets starting at
+        or after `since`: at most two, as the ring may wrap.
+        """
+        size = len(self)
+        if not size:
+            return []
+        first = (self.head + 1) % size
+        ints = self.ints
+        since = since // self.resolution
+        # Bucket numbers increase around the ring: binary search the oldest one to keep
+        lo, hi = 0, size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if ints[2 * ((first + mid) % size)] < since:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == size:
+            return []
+        begin = (first + lo) % size
+        end = self.head + 1
+        if begin < end:
+            return [(begin, end)]
+        return [(begin, size), (0, end)]
+
+    def _means(self, a, b):
+        return map(float.__truediv__, self.floats[3 * a + 2:3 * b:3], map(float, self.ints[2 * a + 1:2 * b:2]))
+
+    def summary(self, since):
+        slices = self._slices(since)
+        if not slices:
+            return None
+        floats = self.floats
+        count = sum(sum(self.ints[2 * a + 1:2 * b:2]) for a, b in slices)
+        means = []
+        for a, b in slices:
+            means.extend(self._means(a, b))
+        means.sort()
+        return Summary(
+            _f32(min(min(floats[3 * a:3 * b:3]) for a, b in slices)),
+            _f32(max(max(floats[3 * a + 1:3 * b:3]) for a, b in slices)),
+            _f32(sum(sum(floats[3 * a + 2:3 * b:3]) for a, b in slices) / count),
+            _f32(means[max(0, math.ceil(0.95 * len(means)) - 1)]),
+            count,
+        )
+
+    def points(self, since):
+        points = []
+        resolution = self.resolution
+        for a, b in self._slices(since):
+            points.extend((bucket * resolution, _f32(mean))
+                          for bucket, mean in zip(self.ints[2 * a:2 * b:2], self._means(a, b)))
+        return points
+
+
+class Series:
+    """The tiers of one metric instance."""
+
+    __slots__ = ('tiers',)
+
+    def __init__(self, tiers=TIERS):
+        self.tiers = [Tier(resolution, capacity) for resolution, capacity in tiers]
+
+    def add(self, when, value):
+        for tier in self.tiers:
+            tier.add(when, value)
+
+    @property
+    def latest(self):
+        return self.tiers[0].latest
+
+    @property
+    def nbytes(self):
+        return sum(tier.nbytes for tier in self.tiers)
+
+    def tier_for(self, seconds):
+        """The finest tier that still covers the last `seconds`, else the coarsest."""
+        for tier in self.tiers:
+            if tier.span >= seconds:
+                return tier
+        return self.tiers[-1]
+
+
+def series_key(name, labels=None):
+    """A series' identity: its metric name and identifying labels."""
+    if not labels:
+        return (name, ())
+    return (name, tuple(sorted((k, str(v)) for k, v in labels.items() if k not in SKIP_LABELS)))
+
+
+class HistoryStore:
+    """
+    Numeric metric values over time. record() takes each Snapshot (or any
+    iterable of Sections) as it is collected and skips STATIC_METRICS; at
+    most `max_series` series are kept. Counters (see COUNTERS) are
+    stored as per-second rates since their previous sample, everything else
+    as measured. summary() and points() answer window queries from the
+    finest tier that covers the window; p95 is taken over that tier's
+    bucket means, so it is exact when there is one sample per bucket.
+    """
+
+    def __init__(self, tiers=TIERS, collectors=HISTORY_COLLECTORS, clock=time.time, max_series=MAX_SERIES):
+        self.tiers = tuple(tiers)
+        self.max_series = max_series
+        # Values not recorded because max_series was reached
+        self.dropped = 0
+        self.collectors = frozenset(collectors) if collectors is not None else None
+        self.clock = clock
+        self.retention = max(resolution * capacity for resolution, capacity in self.tiers)
+        self._series = {}
+        # series key -> (time, raw value) of the last counter reading
+        self._counters = {}
+        self._expired_at = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._series)
+
+    def keys(self):
+        with self._lock:
+            return list(self._series)
+
+    def add(self, name, value, labels=None, when=None):
+        """Record one value; `name` in COUNTERS records its rate instead."""
+        when = self.clock() if when is None else when
+        with self._lock:
+            self._add(series_key(name, labels), name in COUNTERS, value, when)
+            self._expire(when)
+
+    @property
+    def nbytes(self):
+        """Bytes held in the ring buffers of all series."""
+        with self._lock:
+            return sum(series.nbytes for series in self._series.values())
+
+    def _add(self, key, counter, value, when):
+        if key not in self._series and len(self._series) >= self.max_series:
+            self.dropped += 1
+            return
+        if counter:
+            previous = self._counters.get(key)
+            if previous is None and len(self._counters) >= self.max_series:
+                self.dropped += 1
+                return
+            self._counters[key] = (when, value)
+            if previous is None or when <= previous[0]:
+                return
+            # Counters reset (reboot, driver reload): never record a negative rate
+            value = max(0, value - previous[1]) / (when - previous[0])
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = Series(self.tiers)
+        series.add(when, value)
+
+    def record(self, sections, when=None):
+        """Record the numeric metrics of the wanted collectors' sections."""
+        if when is None:
+            when = getattr(sections, 'taken_at', None) or self.clock()
+        collectors = self.collectors
+        with self._lock:
+            for section in sections:
+                if collectors is not None and section.collector not in collectors:
+                    continue
+                for metric in section.metrics:
+                    value = metric.value
+                    if not isinstance(value, (int, float)) or isinstance(value, bool) \
+                            or metric.name in STATIC_METRICS:
+                        continue
+                    self._add(series_key(metric.name, metric.labels), metric.name in COUNTERS, value, when)
+            self._expire(when)
+
+    def _expire(self, when):
+        if self._expired_at is not None and when - self._expired_at < EXPIRE_EVERY:
+            return
+        self._expired_at = when
+        cutoff = when - self.retention
+        for key in [key for key, series in self._series.items() if series.latest < cutoff]:
+            del self._series[key]
+        for key in [key for key, (seen, _) in self._counters.items() if seen < cutoff]:
+            del self._counters[key]
+
+    def _window(self, name, labels, seconds, now):
+        series = self._series.get(series_key(name, labels))
+        if series is None:
+            return None, None
+        now = self.clock() if now is None else now
+        tier = series.tier_for(seconds)
+        # Include the bucket the window starts in
+        since = now - seconds
+        return tier, since - since % tier.resolution
+
+    def summary(self, name, labels=None, seconds=60, now=None):
+        """Summary(min, max, mean, p95, count) over the last `seconds`, or None without data."""
+        with self._lock:
+            tier, since = self._window(name, labels, seconds, now)
+            return tier.summary(since) if tier is not None else None
+
+    def summaries(self, seconds=60, now=None):
+        """[((name, labels), Summary)] of every series with data in the last `seconds`."""
+        now = self.clock() if now is None else now
+        result = []
+        with self._lock:
+            for key, series in self._series.items():
+                tier = series.tier_for(seconds)
+                since = now - seconds
+                summary = tier.summary(since - since % tier.resolution)
+                if summary is not None:
+                    result.append((key, summary))
+        return result
+
+    def points(self, name, labels=None, seconds=60, now=None):
+        """[(bucket start, mean)] over the last `seconds`, oldest first, e.g. for a sparkline."""
+        with self._lock:
+            tier, since = self._window(name, labels, seconds, now)
+            return tier.points(since) if tier is not None else []
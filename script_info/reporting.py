@@ -1,10 +1,37 @@
 import datetime
 
+from .collectors.model import Snapshot
+from .formatting import display_dict
+
 class PDFReporter:
     def __init__(self, filename):
         self.filename = filename
 
+    # Keyword heuristic for plain display dicts; Snapshots carry categories
+    CATEGORIES = {
+        'System': ['OS', 'Hostname', 'User', 'Uptime', 'Boot'],
+        'Hardware': ['CPU', 'Memory', 'GPU', 'Battery', 'BIOS'],
+        'Storage': ['Disk', 'Partition'],
+        'Network': ['IP', 'Interface', 'DNS', 'WiFi', 'Port', 'Network'],
+        'Software': ['Python', 'Tool', 'Program', 'Browser'],
+        'Security': ['Defender', 'Firewall', 'UAC', 'Update']
+    }
+
+    def _categorize(self, info):
+        def get_category(key):
+            for cat, keywords in self.CATEGORIES.items():
+                if any(k.lower() in key.lower() for k in keywords):
+                    return cat
+            return 'Other'
+
+        grouped_info = {cat: [] for cat in self.CATEGORIES}
+        grouped_info['Other'] = []
+        for k, v in info.items():
+            grouped_info[get_category(k)].append((k, v))
+        return grouped_info
+
     def generate(self, info):
+        """Write `info`, a Snapshot or a get_system_info() dict, to the PDF file."""
         try:
             from reportlab.lib.pagesizes import letter
             from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -56,31 +83,14 @@ class PDFReporter:
             content.append(Paragraph(f"Generated on: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
             content.append(Spacer(1, 20))
 
-            # Categorize the flattened info dict for better display
-            # This is a heuristic mapping based on keys
-            categories = {
-                'System': ['OS', 'Hostname', 'User', 'Uptime', 'Boot'],
-                'Hardware': ['CPU', 'Memory', 'GPU', 'Battery', 'BIOS'],
-                'Storage': ['Disk', 'Partition'],
-                'Network': ['IP', 'Interface', 'DNS', 'WiFi', 'Port', 'Network'],
-                'Software': ['Python', 'Tool', 'Program', 'Browser'],
-                'Security': ['Defender', 'Firewall', 'UAC', 'Update']
-            }
-            
-            # Helper to check if key matches category
-            def get_category(key):
-                for cat, keywords in categories.items():
-                    if any(k.lower() in key.lower() for k in keywords):
-                        return cat
-                return 'Other'
-
-            # Grouping
-            grouped_info = {cat: [] for cat in categories}
-            grouped_info['Other'] = []
-            
-            for k, v in info.items():
-                cat = get_category(k)
-                grouped_info[cat].append((k, v))
+            if isinstance(info, Snapshot):
+                # Sections carry their collector's category; no guessing
+                grouped_info = {}
+                for cat, sections in info.categories().items():
+                    merged = display_dict(m for section in sections for m in section.metrics)
+                    grouped_info[cat] = list(merged.items())
+            else:
+                grouped_info = self._categorize(info)
 
             # Render
             for cat, items in grouped_info.items():
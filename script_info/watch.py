@@ -0,0 +1,168 @@
+import time
+
+from .collectors.procfs import system
+from .collectors.sampling import CPU_MODES, cpu_sampler
+
+NET_FIELDS = (
+    ('bytes_sent', 'Sent (B/s)'),
+    ('bytes_recv', 'Received (B/s)'),
+    ('packets_sent', 'Packets Sent/s'),
+    ('packets_recv', 'Packets Received/s'),
+)
+
+DISK_FIELDS = (
+    ('read_bytes', 'Read (B/s)'),
+    ('write_bytes', 'Write (B/s)'),
+    ('read_count', 'Read IOPS'),
+    ('write_count', 'Write IOPS'),
+)
+
+
+def _rates(previous, current, fields, elapsed):
+    # Counters can reset (driver reload, hot-unplug); never report negative rates
+    return {label: max(0, getattr(current, field) - getattr(previous, field)) / elapsed
+            for field, label in fields}
+
+
+def _per_device_rates(previous, current, fields, elapsed):
+    return {name: _rates(previous[name], counters, fields, elapsed)
+            for name, counters in current.items() if name in previous}
+
+
+class CounterSampler:
+    """
+    Turns psutil's cumulative network and disk counters into per-interval
+    rates, in total and per NIC / per disk. The first sample() only primes
+    the baseline and returns None.
+    """
+
+    def __init__(self, backend=system, clock=time.monotonic):
+        self.backend = backend
+        self.clock = clock
+        self._previous = None
+
+    def _read(self):
+        try:
+            disk = self.backend.disk_io_counters()
+            perdisk = self.backend.disk_io_counters(perdisk=True) or {}
+        except Exception:
+            disk, perdisk = None, {}
+        return {
+            'time': self.clock(),
+            'net': self.backend.net_io_counters(),
+            'pernic': self.backend.net_io_counters(pernic=True),
+            'disk': disk,
+            'perdisk': perdisk,
+        }
+
+    def sample(self):
+        current = self._read()
+        previous, self._previous = self._previous, current
+        if previous is None:
+            return None
+        elapsed = current['time'] - previous['time']
+        if elapsed <= 0:
+            return None
+
+        rates = {
+            'Interval (s)': elapsed,
+            'Network': _rates(previous['net'], current['net'], NET_FIELDS, elapsed),
+            'Per NIC': _per_device_rates(previous['pernic'], current['pernic'], NET_FIELDS, elapsed),
+            'Per Disk': _per_device_rates(previous['perdisk'], current['perdisk'], DISK_FIELDS, elapsed),
+        }
+        if previous['disk'] is not None and current['disk'] is not None:
+            rates['Disk'] = _rates(previous['disk'], current['disk'], DISK_FIELDS, elapsed)
+        return rates
+
+
+def ticks(interval, count=None, clock=time.monotonic, sleep=time.sleep):
+    """
+    Sleep until each tick of a steady `interval`-second schedule and yield
+    its number. Ticks are anchored to the start time so they do not drift;
+    if a tick is overrun the missed ones are skipped rather than bunched up.
+    """
+    start = clock()
+    n = 0
+    emitted = 0
+    while count is None or emitted < count:
+        n += 1
+        now = clock()
+        if now > start + n * interval:
+            n = int((now - start) // interval) + 1
+        sleep(start + n * interval - now)
+        yield n
+        emitted += 1
+
+
+def format_bytes_rate(value):
+    for unit in ('B/s', 'KB/s', 'MB/s', 'GB/s'):
+        if value < 1024 or unit == 'GB/s':
+            return f'{value:.1f} {unit}'
+        value /= 1024
+
+
+def format_cpu(cpu):
+    modes = ', '.join(f"{label.lower()} {cpu['total'][field]:.1f}%"
+                      for field, label in CPU_MODES if field in cpu['total'])
+    cores = ' '.join(f"{core['usage']:.0f}" if core else '-' for core in cpu['per_core'])
+    return [f"CPU: {cpu['total']['usage']:.1f}% ({modes})", f"  per core (%): {cores}"]
+
+
+def format_rates(rates):
+    lines = []
+    net = rates['Network']
+    lines.append(
+        f"Network: sent {format_bytes_rate(net['Sent (B/s)'])}, received {format_bytes_rate(net['Received (B/s)'])}"
+        f" ({net['Packets Sent/s']:.0f} pkt/s out, {net['Packets Received/s']:.0f} pkt/s in)"
+    )
+    disk = rates.get('Disk')
+    if disk:
+        lines.append(
+            f"Disk: read {format_bytes_rate(disk['Read (B/s)'])}, write {format_bytes_rate(disk['Write (B/s)'])}"
+            f" ({disk['Read IOPS']:.0f} r/s, {disk['Write IOPS']:.0f} w/s)"
+        )
+
+    # Only show devices that moved; hosts with thousands of veths stay readable
+    idle = 0
+    for name, nic in rates['Per NIC'].items():
+        if not any(nic.values()):
+            idle += 1
+            continue
+        lines.append(
+            f"  {name}: sent {format_bytes_rate(nic['Sent (B/s)'])}, received {format_bytes_rate(nic['Received (B/s)'])}"
+            f" ({nic['Packets Sent/s']:.0f}/{nic['Packets Received/s']:.0f} pkt/s)"
+        )
+    for name, d in rates['Per Disk'].items():
+        if not any(d.values()):
+            idle += 1
+            continue
+        lines.append(
+            f"  {name}: read {format_bytes_rate(d['Read (B/s)'])}, write {format_bytes_rate(d['Write (B/s)'])}"
+            f" ({d['Read IOPS']:.0f} r/s, {d['Write IOPS']:.0f} w/s)"
+        )
+    if idle:
+        lines.append(f"  ({idle} idle devices not shown)")
+    return lines
+
+
+def watch(interval, count=None, out=print):
+    """
+    Sample counters every `interval` seconds and print per-interval rates
+    and CPU utilisation.
+    `count` limits the number of reports; None runs until interrupted.
+    """
+    sampler = CounterSampler()
+    sampler.sample()
+    # Every tick is a real window, however short the interval
+    cpu_sampler.sample(min_window=0)
+    for _ in ticks(interval, count):
+        rates = sampler.sample()
+        if rates is None:
+            continue
+        out(f"[{time.strftime('%H:%M:%S')}] interval {rates['Interval (s)']:.2f}s")
+        cpu = cpu_sampler.sample(min_window=0)
+        if cpu:
+            for line in format_cpu(cpu):
+                out(line)
+        for line in format_rates(rates):
+            out(line)
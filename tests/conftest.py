@@ -0,0 +1,13 @@
+import os
+import shutil
+import tempfile
+
+# Keep the static-facts cache of every test run, and of the subprocesses the
+# tests start (they inherit the environment), out of the developer's
+# ~/.cache. Set before any collector builds the process-wide cache.
+_CACHE_DIR = tempfile.mkdtemp(prefix='script-info-test-cache-')
+os.environ['SCRIPT_INFO_CACHE_DIR'] = _CACHE_DIR
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_CACHE_DIR, ignore_errors=True)
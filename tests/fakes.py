@@ -0,0 +1,263 @@
+"""
+Deterministic stand-ins for the system backends the collectors talk to.
+
+FakePsutil mimics the subset of the psutil API used by the collectors, sized
+like a large container host, so collectors can be timed and checked without
+touching the real machine. Patch it in with `patch_psutil()`.
+"""
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections import namedtuple
+from contextlib import ExitStack
+from unittest import mock
+
+import psutil
+
+from script_info.collectors.cache import Uncached
+from script_info.collectors.isolation import isolated
+from script_info.collectors.model import Metric
+
+svmem = namedtuple('svmem', 'total available percent used free')
+sswap = namedtuple('sswap', 'total used free percent sin sout')
+scputimes = namedtuple('scputimes', 'user nice system idle iowait irq softirq steal')
+scpufreq = namedtuple('scpufreq', 'current min max')
+sdiskusage = namedtuple('sdiskusage', 'total used free percent')
+sdiskio = namedtuple('sdiskio', 'read_count write_count read_bytes write_bytes read_time write_time')
+sdiskpart = namedtuple('sdiskpart', 'device mountpoint fstype opts')
+snetio = namedtuple('snetio', 'bytes_sent bytes_recv packets_sent packets_recv errin errout dropin dropout')
+snicaddr = namedtuple('snicaddr', 'family address netmask broadcast ptp')
+snicstats = namedtuple('snicstats', 'isup duplex speed mtu flags')
+suser = namedtuple('suser', 'name terminal host started pid')
+sbattery = namedtuple('sbattery', 'percent secsleft power_plugged')
+pmem = namedtuple('pmem', 'rss vms')
+pcputimes = namedtuple('pcputimes', 'user system children_user children_system')
+
+GB = 1024 ** 3
+BOOT_TIME = 1_700_000_000.0
+
+
+class FakeProcess:
+    def __init__(self, pid):
+        self.pid = pid
+        self.info = {
+            'pid': pid,
+            'name': f'proc-{pid}',
+            'username': 'root' if pid % 7 == 0 else 'app',
+            'status': 'sleeping',
+            'create_time': BOOT_TIME + pid,
+            'cpu_times': pcputimes(pid % 97 * 0.5, pid % 13 * 0.25, 0.0, 0.0),
+            'memory_info': pmem((pid % 1000) * 1024 * 1024, (pid % 1000) * 4 * 1024 * 1024),
+            'num_threads': pid % 64 + 1,
+            'num_fds': pid % 256,
+        }
+
+    def oneshot(self):
+        return ExitStack()
+
+    def __getattr__(self, name):
+        info = self.__dict__.get('info', {})
+        if name in info:
+            return lambda: info[name]
+        raise AttributeError(name)
+
+
+class FakePsutil:
+    """
+    Scaled fake of the psutil module. Counters advance by a fixed step on
+    every read so rate computations see deterministic deltas.
+    """
+
+    AF_LINK = psutil.AF_LINK
+    AccessDenied = psutil.AccessDenied
+    NoSuchProcess = psutil.NoSuchProcess
+    CONN_LISTEN = psutil.CONN_LISTEN
+
+    def __init__(self, processes=10_000, mounts=500, interfaces=2_000, cpus=16):
+        self.cpus = cpus
+        self.ticks = 0
+        self._processes = [FakeProcess(pid) for pid in range(1, processes + 1)]
+        self._partitions = []
+        for i in range(mounts):
+            if i == 0:
+                self._partitions.append(sdiskpart('/dev/sda1', '/', 'ext4', 'rw'))
+            elif i % 5 == 0:
+                # Bind mounts of the root filesystem
+                self._partitions.append(sdiskpart('/dev/sda1', f'/var/lib/kubelet/pods/{i}/volume', 'ext4', 'rw,bind'))
+            else:
+                self._partitions.append(sdiskpart('overlay', f'/var/lib/docker/overlay2/{i:04d}/merged', 'overlay', 'rw'))
+        self._interfaces = ['lo', 'eth0'] + [
+            f'veth{i:05x}' if i % 2 else f'cali{i:011x}' for i in range(interfaces - 2)
+        ]
+        self._addrs = {}
+        for i, name in enumerate(self._interfaces):
+            self._addrs[name] = [
+                snicaddr(socket.AF_INET, f'10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}', '255.255.255.0', None, None),
+                snicaddr(socket.AF_INET6, f'fe80::{i:x}', 'ffff:ffff:ffff:ffff::', None, None),
+                snicaddr(psutil.AF_LINK, ':'.join(f'{(i >> s) & 0xff:02x}' for s in (40, 32, 24, 16, 8, 0)), None, None, None),
+            ]
+        self._stats = {name: snicstats(True, 2, 10000, 1500, 'up,running') for name in self._interfaces}
+
+    # CPU
+    def cpu_count(self, logical=True):
+        return self.cpus if logical else self.cpus // 2
+
+    def cpu_freq(self, percpu=False):
+        return scpufreq(2400.0, 800.0, 3600.0)
+
+    def cpu_percent(self, interval=None, percpu=False):
+        return [12.5] * self.cpus if percpu else 12.5
+
+    def cpu_times(self, percpu=False):
+        self.ticks += 1
+        t = self.ticks
+
+        def times(i):
+            return scputimes(100.0 * t + i, 1.0 * t, 50.0 * t, 800.0 * t, 5.0 * t, 0.5 * t, 0.5 * t, 0.0)
+        return [times(i) for i in range(self.cpus)] if percpu else times(0)
+
+    def getloadavg(self):
+        return (1.0, 0.5, 0.25)
+
+    # Memory
+    def virtual_memory(self):
+        return svmem(64 * GB, 40 * GB, 37.5, 24 * GB, 30 * GB)
+
+    def swap_memory(self):
+        return sswap(8 * GB, 1 * GB, 7 * GB, 12.5, 0, 0)
+
+    # Disks
+    def disk_usage(self, path):
+        return sdiskusage(500 * GB, 200 * GB, 300 * GB, 40.0)
+
+    def disk_partitions(self, all=False):
+        return list(self._partitions)
+
+    def disk_io_counters(self, perdisk=False, nowrap=True):
+        self.ticks += 1
+        t = self.ticks
+
+        def io(i):
+            return sdiskio(1000 * t + i, 500 * t, 4096 * 1000 * t, 4096 * 500 * t, 10 * t, 5 * t)
+        if perdisk:
+            return {f'sd{chr(97 + i)}': io(i) for i in range(4)}
+        return io(0)
+
+    # Network
+    def net_io_counters(self, pernic=False, nowrap=True):
+        self.ticks += 1
+        t = self.ticks
+
+        def io(i):
+            return snetio(1500 * t + i, 3000 * t, 10 * t, 20 * t, 0, 0, 0, 0)
+        if pernic:
+            return {name: io(i) for i, name in enumerate(self._interfaces)}
+        return io(0)
+
+    def net_if_addrs(self):
+        return dict(self._addrs)
+
+    def net_if_stats(self):
+        return dict(self._stats)
+
+    def net_connections(self, kind='inet'):
+        return []
+
+    # System
+    def boot_time(self):
+        return BOOT_TIME
+
+    def users(self):
+        return [suser('root', 'pts/0', 'localhost', BOOT_TIME, 1)]
+
+    def sensors_battery(self):
+        return sbattery(80, 3600, False)
+
+    # Processes
+    def pids(self):
+        return [p.pid for p in self._processes]
+
+    def process_iter(self, attrs=None, ad_value=None):
+        return iter(self._processes)
+
+
+def slow_call(seconds, result=None):
+    """A stand-in for a blocking call, e.g. a resolver that times out."""
+    def call(*args, **kwargs):
+        time.sleep(seconds)
+        return result
+    return call
+
+
+def hanging_subprocess_run(*args, **kwargs):
+    """subprocess.run for a child that never exits (ignores `timeout`)."""
+    time.sleep(3600)
+
+
+class _DisabledCache:
+    def get(self, key):
+        return None
+
+    def set(self, key, value, files=()):
+        pass
+
+    def set_many(self, items):
+        pass
+
+
+_DISABLED_CACHE = _DisabledCache()
+
+
+def patch_psutil(fake):
+    """
+    Context manager replacing the psutil backend of every collector module
+    (psutil itself, or procfs.system) with `fake`.
+    The static-facts cache is bypassed so fake results never reach disk.
+    """
+    from script_info.collectors import basic, hardware, network, storage, sampling, cache, processes
+
+    stack = ExitStack()
+    stack.enter_context(mock.patch.object(basic, 'psutil', fake))
+    for module in (hardware, network, storage):
+        stack.enter_context(mock.patch.object(module, 'system', fake))
+    stack.enter_context(mock.patch.object(sampling, 'cpu_sampler', sampling.CpuSampler(fake)))
+    stack.enter_context(mock.patch.object(processes, 'process_sampler', processes.ProcessSampler(fake)))
+    stack.enter_context(mock.patch.object(cache, 'get_cache', lambda: _DISABLED_CACHE))
+    return stack
+
+
+# Collectors for the worker-process tests; the workers import them from here
+
+# Set by tests before a worker starts; the hanging collector writes the pid
+# of the child it leaves behind to this file
+CHILD_PIDFILE_ENV = 'SCRIPT_INFO_TEST_PIDFILE'
+
+
+@isolated()
+def isolated_pid():
+    return [Metric('pid', os.getpid(), title='PID'), Metric('flags', ['a', 'b'], title=('CPU', 'Flags'))]
+
+
+@isolated()
+def isolated_placeholder():
+    return Uncached([Metric('pid', os.getpid(), title='PID')])
+
+
+@isolated()
+def isolated_error():
+    raise ValueError('boom')
+
+
+@isolated()
+def isolated_exit():
+    os._exit(3)
+
+
+@isolated(timeout=2.0)
+def isolated_hang():
+    child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(3600)'])
+    with open(os.environ[CHILD_PIDFILE_ENV], 'w') as f:
+        f.write(str(child.pid))
+    time.sleep(3600)
@@ -0,0 +1,220 @@
+"""
+Collector benchmarks against the deterministic fakes in tests/fakes.py.
+
+Baseline timings live in benchmark_baseline.json and depend on the machine
+they were taken on, so timings are only compared when asked for:
+
+    SCRIPT_INFO_BENCHMARKS=1 python -m pytest tests/test_benchmarks.py
+
+A benchmark then fails when it is slower than `threshold` times its
+baseline plus `slack_ms`, and the /proc counters path fails unless it beats
+psutil. A plain test run still runs each benchmark once, and the deadline
+checks at the end always apply. To refresh the baseline
+after an intentional change run:
+
+    SCRIPT_INFO_UPDATE_BENCHMARKS=1 python -m pytest tests/test_benchmarks.py
+"""
+import json
+import os
+import time
+import unittest
+from unittest import mock
+
+import psutil as real_psutil
+
+from fakes import FakePsutil, hanging_subprocess_run, patch_psutil, slow_call
+from script_info.collectors import basic, hardware, network, processes, procfs, resolve, storage
+from script_info.collectors.options import options
+from script_info.collectors.engine import TIMED_OUT, collect
+from script_info.collectors.model import Section, Snapshot
+from script_info.diff import diff
+from script_info.encoding import encode_binary
+from script_info.history import HistoryStore
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'benchmark_baseline.json')
+UPDATE = os.environ.get('SCRIPT_INFO_UPDATE_BENCHMARKS') == '1'
+TIMED = UPDATE or os.environ.get('SCRIPT_INFO_BENCHMARKS') == '1'
+REPEAT = 5
+
+
+def load_baseline():
+    try:
+        with open(BASELINE_PATH) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'threshold': 3.0, 'slack_ms': 20.0, 'benchmarks': {}}
+
+
+def best_of(func, repeat=REPEAT):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+class TestCollectorBenchmarks(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.baseline = load_baseline()
+        cls.measured = {}
+        cls.fake = FakePsutil()
+        cls.patcher = patch_psutil(cls.fake)
+        cls.patcher.__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.patcher.__exit__(None, None, None)
+        if UPDATE:
+            cls.baseline['benchmarks'].update(
+                {name: round(seconds, 6) for name, seconds in cls.measured.items()})
+            with open(BASELINE_PATH, 'w') as f:
+                json.dump(cls.baseline, f, indent=2, sort_keys=True)
+                f.write('\n')
+
+    def check(self, name, func):
+        if not TIMED:
+            # Still exercise the code path
+            func()
+            return
+        seconds = best_of(func)
+        self.measured[name] = seconds
+        if UPDATE:
+            return
+        baseline = self.baseline['benchmarks'].get(name)
+        if baseline is None:
+            self.skipTest(f'no baseline for {name}')
+        limit = baseline * self.baseline['threshold'] + self.baseline['slack_ms'] / 1000
+        self.assertLess(seconds, limit,
+                        f'{name} regressed: {seconds * 1000:.2f} ms vs baseline {baseline * 1000:.2f} ms')
+
+    def test_memory(self):
+        self.check('memory', hardware.get_memory_info)
+
+    def test_cpu(self):
+        self.check('cpu', hardware.get_cpu_info)
+
+    def test_boot_and_users(self):
+        self.check('boot_and_users', lambda: (basic.get_boot_info(), basic.get_users_info()))
+
+    def test_disk(self):
+        self.check('disk', storage.get_disk_info)
+
+    def test_partitions_500_mounts(self):
+        self.check('partitions_500_mounts', storage.get_partitions_info)
+
+    def test_network_io(self):
+        self.check('network_io', network.get_network_io_info)
+
+    def test_interfaces_2000_nics(self):
+        self.check('interfaces_2000_nics', network.get_interfaces_info)
+
+    def test_interfaces_5000_nics(self):
+        with mock.patch.object(network, 'system', FakePsutil(processes=0, interfaces=5_000)):
+            self.check('interfaces_5000_nics', network.get_interfaces_info)
+
+    def test_interfaces_5000_nics_metrics(self):
+        # The Snapshot path: typed metrics, no display formatting
+        with mock.patch.object(network, 'system', FakePsutil(processes=0, interfaces=5_000)):
+            self.check('interfaces_5000_nics_metrics', network.get_interfaces_info.metrics)
+
+    def test_encode_binary_5000_nics(self):
+        with mock.patch.object(network, 'system', FakePsutil(processes=0, interfaces=5_000)):
+            snapshot = Snapshot([Section('interfaces', 'Network', network.get_interfaces_info.metrics())])
+        self.check('encode_binary_5000_nics', lambda: encode_binary(snapshot))
+
+    def test_processes_20000(self):
+        fake = FakePsutil(processes=20_000, interfaces=2)
+        with mock.patch.object(processes, 'process_sampler', processes.ProcessSampler(fake)):
+            self.check('processes_20000', basic.get_processes_info.metrics)
+
+    def sampling_round(self, backend, rounds=100):
+        # What one 1 Hz --watch/serve tick reads, 100 times over
+        def run():
+            for _ in range(rounds):
+                backend.cpu_times(percpu=True)
+                backend.virtual_memory()
+                backend.swap_memory()
+                backend.net_io_counters(pernic=True)
+                backend.disk_io_counters(perdisk=True)
+        return run
+
+    def test_counters_psutil(self):
+        # The reference the /proc fast path is measured against
+        if not procfs.available():
+            self.skipTest('Linux /proc not available')
+        self.check('counters_psutil_100_rounds', self.sampling_round(real_psutil))
+
+    def test_counters_procfs(self):
+        if not procfs.available():
+            self.skipTest('Linux /proc fast path not available')
+        backend = procfs.ProcfsBackend(real_psutil)
+        self.addCleanup(backend.close)
+        self.check('counters_procfs_100_rounds', self.sampling_round(backend))
+        if TIMED:
+            # Timed side by side on this machine, so no baseline is involved
+            reference = best_of(self.sampling_round(real_psutil))
+            measured = self.measured['counters_procfs_100_rounds']
+            self.assertLess(measured, reference,
+                            f'/proc path {measured * 1000:.2f} ms is not faster than psutil {reference * 1000:.2f} ms')
+
+    def test_diff_5000_nics(self):
+        fake = FakePsutil(processes=0, interfaces=5_000)
+        with mock.patch.object(network, 'system', fake):
+            # Traffic counters advance between the two runs
+            old = network.get_interfaces_info()
+            new = network.get_interfaces_info()
+        self.check('diff_5000_nics', lambda: diff(old, new))
+
+    def test_history_record_5000_nics(self):
+        fake = FakePsutil(processes=0, interfaces=5_000)
+        with mock.patch.object(network, 'system', fake):
+            snapshot = Snapshot([Section('interfaces', 'Network', network.get_interfaces_info.metrics())])
+        store = HistoryStore()
+        store.record(snapshot, when=0)
+        ticks = iter(range(1, 1_000_000))
+        self.check('history_record_5000_nics', lambda: store.record(snapshot, when=next(ticks)))
+
+    def test_history_summary_1h(self):
+        store = HistoryStore()
+        for i in range(3600):
+            store.add('cpu_usage', float(i % 100), when=i)
+        self.check('history_summary_1h', lambda: [store.summary('cpu_usage', seconds=s, now=3600)
+                                                  for s in (60, 600, 3600)])
+
+    def test_slow_dns_is_bounded_by_deadline(self):
+        with mock.patch('socket.getfqdn', slow_call(2.0, 'host.example')), \
+                mock.patch('socket.gethostbyname', slow_call(2.0, '10.0.0.1')):
+            start = time.perf_counter()
+            data = collect([('hostname', network.get_basic_network_info)], collector_timeout=0.2)
+            elapsed = time.perf_counter() - start
+        self.assertIn(TIMED_OUT, data['hostname Collector'])
+        self.assertLess(elapsed, 0.5)
+
+    def test_slow_dns_is_bounded_inside_the_collector(self):
+        resolve.cache.clear()
+        with mock.patch('socket.gethostname', return_value='unlisted-host'), \
+                mock.patch('socket.getfqdn', slow_call(2.0, 'host.example')), \
+                mock.patch('socket.gethostbyname', slow_call(2.0, '10.0.0.1')), \
+                mock.patch.object(options, 'resolve_timeout', 0.1):
+            start = time.perf_counter()
+            info = network.get_basic_network_info()
+            elapsed = time.perf_counter() - start
+        resolve.cache.clear()
+        self.assertEqual(info['Hostname'], 'unlisted-host')
+        self.assertLess(elapsed, 0.5)
+
+    def test_hanging_subprocess_is_bounded_by_deadline(self):
+        with mock.patch.object(network.subprocess, 'run', hanging_subprocess_run):
+            start = time.perf_counter()
+            data = collect([('wifi', network.get_wifi_info), ('memory', hardware.get_memory_info)],
+                           collector_timeout=0.2)
+            elapsed = time.perf_counter() - start
+        self.assertIn(TIMED_OUT, data['wifi Collector'])
+        self.assertIn('Total Memory (GB)', data)
+        self.assertLess(elapsed, 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
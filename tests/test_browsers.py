@@ -0,0 +1,90 @@
+import datetime
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from script_info.collectors import browsers
+
+# 2024-01-02 03:04:05 UTC
+LAST_VISIT = datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc).timestamp()
+
+
+def make_chromium_history(path, rows):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE urls (id INTEGER PRIMARY KEY, url TEXT, title TEXT, last_visit_time INTEGER)')
+    last = int((LAST_VISIT + 11644473600) * 1_000_000)
+    conn.executemany('INSERT INTO urls (url, title, last_visit_time) VALUES (?, ?, ?)',
+                     ((f'https://example.com/{i}', 'Example', last - i) for i in range(rows)))
+    conn.commit()
+    return conn
+
+
+def make_firefox_places(path, visited, unvisited=0):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE moz_places (id INTEGER PRIMARY KEY, url TEXT, last_visit_date INTEGER)')
+    last = int(LAST_VISIT * 1_000_000)
+    conn.executemany('INSERT INTO moz_places (url, last_visit_date) VALUES (?, ?)',
+                     [(f'https://example.org/{i}', last - i) for i in range(visited)] +
+                     [('place:bookmark', None)] * unvisited)
+    conn.commit()
+    conn.close()
+
+
+class TestBrowserHistory(unittest.TestCase):
+    def setUp(self):
+        self.home = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.home, ignore_errors=True)
+        self.chrome = os.path.join(self.home, '.config', 'google-chrome')
+
+    def test_counts_and_last_visit_across_profiles(self):
+        make_chromium_history(os.path.join(self.chrome, 'Default', 'History'), 3).close()
+        make_chromium_history(os.path.join(self.chrome, 'Profile 1', 'History'), 2).close()
+        make_firefox_places(os.path.join(self.home, '.mozilla', 'firefox', 'abc.default', 'places.sqlite'), 4, unvisited=5)
+
+        stats = browsers.browser_history_stats(self.home, 'linux')
+
+        self.assertEqual(stats['Chrome']['count'], 5)
+        self.assertAlmostEqual(stats['Chrome']['last'], LAST_VISIT, places=3)
+        self.assertEqual(stats['Firefox']['count'], 4)
+        self.assertAlmostEqual(stats['Firefox']['last'], LAST_VISIT, places=3)
+        self.assertNotIn('Edge', stats)
+
+    def test_database_is_not_modified(self):
+        path = os.path.join(self.chrome, 'Default', 'History')
+        make_chromium_history(path, 1).close()
+        mtime = os.stat(path).st_mtime_ns
+        browsers.browser_history_stats(self.home, 'linux')
+        self.assertEqual(os.stat(path).st_mtime_ns, mtime)
+        self.assertEqual(sorted(os.listdir(os.path.dirname(path))), ['History'])
+
+    def test_locked_database_is_read_from_a_copy(self):
+        path = os.path.join(self.chrome, 'Default', 'History')
+        conn = make_chromium_history(path, 3)
+        self.addCleanup(conn.close)
+        # A running browser holds an exclusive lock on its history
+        conn.execute('PRAGMA locking_mode=EXCLUSIVE')
+        conn.execute('BEGIN EXCLUSIVE')
+
+        count, last = browsers.history_stats(path, 'chromium')
+
+        self.assertEqual(count, 3)
+        self.assertAlmostEqual(last, LAST_VISIT, places=3)
+
+    def test_unreadable_database_is_reported(self):
+        path = os.path.join(self.chrome, 'Default', 'History')
+        os.makedirs(os.path.dirname(path))
+        with open(path, 'wb') as f:
+            f.write(b'not a database' * 100)
+        stats = browsers.browser_history_stats(self.home, 'linux')
+        self.assertEqual(stats['Chrome'], {'count': 0, 'last': None, 'errors': 1})
+
+    def test_no_profiles(self):
+        self.assertEqual(browsers.browser_history_stats(self.home, 'linux'), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from script_info.collectors import cache
+from script_info.collectors.cache import StaticCache, Uncached, static_fact
+from script_info.collectors.model import COUNT, Metric
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+class TestStaticCache(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'static-facts.json')
+        self.cache = StaticCache(self.path)
+        self.cache.enabled = True
+
+    def tearDown(self):
+        cache.set_cache(None)
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def reopen(self, **kwargs):
+        reopened = StaticCache(self.path, **kwargs)
+        reopened.enabled = True
+        return reopened
+
+    def test_round_trip_across_instances(self):
+        self.cache.set('os', {'OS Name': 'Linux'})
+        self.assertEqual(self.reopen().get('os'), {'OS Name': 'Linux'})
+        self.assertEqual(os.listdir(self.dir), ['static-facts.json'])
+
+    def test_ttl_expiry(self):
+        self.cache.set('os', {'OS Name': 'Linux'})
+        with mock.patch.object(cache.time, 'time', return_value=time.time() + 10):
+            self.assertIsNone(self.reopen(ttl=5).get('os'))
+
+    def test_boot_time_change_invalidates(self):
+        self.cache.set('os', {'OS Name': 'Linux'})
+        rebooted = dict(cache.current_fingerprint(), boot_time=0.0)
+        with mock.patch.object(cache, 'current_fingerprint', return_value=rebooted):
+            self.assertIsNone(self.reopen().get('os'))
+
+    def test_path_change_invalidates(self):
+        self.cache.set('dev_tools', {'Git': 'Installed'})
+        with mock.patch.dict(os.environ, {'PATH': '/nonexistent'}):
+            self.assertIsNone(self.reopen().get('dev_tools'))
+
+    def test_file_mtime_change_invalidates(self):
+        binary = os.path.join(self.dir, 'tool')
+        open(binary, 'w').close()
+        self.cache.set('tool', {'Tool': '1.0'}, files=[binary])
+        self.assertIsNotNone(self.reopen().get('tool'))
+        os.utime(binary, (1, 1))
+        self.assertIsNone(self.reopen().get('tool'))
+
+    def test_static_fact_decorator(self):
+        cache.set_cache(self.cache)
+        calls = []
+
+        @static_fact('counted')
+        def collector():
+            calls.append(1)
+            return [Metric('value', 1, COUNT, ('Group', '{item}'), {'item': 'a'})]
+
+        expected = [Metric('value', 1, COUNT, ('Group', '{item}'), {'item': 'a'})]
+        self.assertEqual(collector(), expected)
+        # Served from the cache, with the tuple title intact
+        cache.set_cache(self.reopen())
+        self.assertEqual(collector(), expected)
+        self.assertEqual(len(calls), 1)
+
+    def test_uncached_results_are_not_stored(self):
+        cache.set_cache(self.cache)
+        results = [Uncached([Metric('tool', 'not installed')]), [Metric('tool', '1.0')]]
+
+        @static_fact('placeholder')
+        def collector():
+            return results.pop(0)
+
+        self.assertEqual(collector(), [Metric('tool', 'not installed')])
+        self.assertIsNone(self.cache.get('placeholder'))
+        self.assertEqual(collector(), [Metric('tool', '1.0')])
+        self.assertEqual(collector(), [Metric('tool', '1.0')])
+
+    def test_runs_do_not_touch_the_user_cache(self):
+        # tests/conftest.py points the static-facts cache at a temp directory
+        cache_dir = os.environ.get(cache.CACHE_DIR_ENV)
+        if not cache_dir:
+            self.skipTest('not run through pytest')
+        code = 'from script_info.collectors.cache import get_cache; print(get_cache().path)'
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=ROOT, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertTrue(result.stdout.strip().startswith(cache_dir))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from script_info.collectors import cache, devtools
+from script_info.collectors.cache import StaticCache
+from script_info.collectors.devtools import build_path_index, detect_dev_tools, parse_version
+
+TOOLS = {
+    'Foo': (['foo'], ['--version']),
+    'Bar': (['bar'], ['--version']),
+    'Missing': (['missing'], ['--version']),
+}
+
+
+def write_tool(directory, name, output):
+    path = os.path.join(directory, name)
+    with open(path, 'w') as f:
+        f.write(f'#!/bin/sh\necho "{output}"\n')
+    os.chmod(path, 0o755)
+    return path
+
+
+@unittest.skipIf(sys.platform == 'win32', 'uses shell scripts as fake tools')
+class TestDevTools(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.first = os.path.join(self.dir, 'first')
+        self.second = os.path.join(self.dir, 'second')
+        os.mkdir(self.first)
+        os.mkdir(self.second)
+        self.path = os.pathsep.join([self.first, os.path.join(self.dir, 'nonexistent'), self.second])
+        self.foo = write_tool(self.first, 'foo', 'foo version 1.2.3')
+        write_tool(self.second, 'foo', 'foo version 9.9.9')
+        write_tool(self.second, 'bar', 'bar (build 7) 4.5')
+        test_cache = StaticCache(os.path.join(self.dir, 'cache.json'))
+        test_cache.enabled = True
+        cache.set_cache(test_cache)
+
+    def tearDown(self):
+        cache.set_cache(None)
+        shutil.rmtree(self.dir)
+
+    def test_path_index_prefers_first_directory(self):
+        index = build_path_index(self.path)
+        self.assertEqual(index['foo'], self.foo)
+        self.assertIn('bar', index)
+
+    def test_versions_are_probed_once_and_cached_by_mtime(self):
+        expected = {'Foo': '1.2.3', 'Bar': '4.5', 'Missing': 'Not detected'}
+        self.assertEqual(detect_dev_tools(TOOLS, self.path), expected)
+
+        with mock.patch.object(devtools.subprocess, 'run', side_effect=AssertionError('probed again')):
+            self.assertEqual(detect_dev_tools(TOOLS, self.path), expected)
+
+        write_tool(self.first, 'foo', 'foo version 2.0')
+        os.utime(self.foo, (1, 1))
+        self.assertEqual(detect_dev_tools(TOOLS, self.path)['Foo'], '2.0')
+
+    def test_parse_version(self):
+        self.assertEqual(parse_version('openjdk version "17.0.2" 2022-01-18'), '17.0.2')
+        self.assertEqual(parse_version('go version go1.21.6 linux/amd64'), '1.21.6')
+        self.assertEqual(parse_version('\nThis is perl 5, version 36, subversion 0 (v5.36.0)'), '5.36.0')
+        self.assertIsNone(parse_version('no digits here'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import io
+import json
+import unittest
+
+from script_info import diff
+from script_info.collectors.model import Metric, Section, Snapshot
+
+
+BASE = {
+    'OS Name': 'Linux',
+    'Uptime': '1:00:00',
+    'Battery Plugged In': 1,
+    'Development Tools': {'Python': '3.11.7', 'Git': '2.43.0', 'Node.js': '20.1.0'},
+    'Browser History Stats': {'Firefox History Count': 120},
+}
+
+
+class TestDiff(unittest.TestCase):
+    def round_trip(self, old, new):
+        delta = diff.diff(old, new)
+        # Deltas are plain JSON
+        delta = json.loads(json.dumps(delta))
+        self.assertEqual(diff.apply(old, delta), new)
+        return delta
+
+    def test_unchanged_is_empty(self):
+        self.assertEqual(diff.diff(BASE, json.loads(json.dumps(BASE))), {})
+
+    def test_changed_added_removed(self):
+        new = dict(BASE, Uptime='1:00:15', Hostname='node-1')
+        del new['OS Name']
+        delta = self.round_trip(BASE, new)
+        self.assertEqual(delta, {'set': {'Uptime': '1:00:15', 'Hostname': 'node-1'}, 'del': ['OS Name']})
+
+    def test_nested_dicts_diff_by_key(self):
+        tools = {'Python': '3.12.0', 'Git': '2.43.0', 'Go': '1.22'}
+        new = dict(BASE, **{'Development Tools': tools})
+        delta = self.round_trip(BASE, new)
+        self.assertEqual(delta, {'sub': {'Development Tools': {
+            'set': {'Python': '3.12.0', 'Go': '1.22'}, 'del': ['Node.js']}}})
+        self.assertEqual(diff.changed_keys(delta), 3)
+
+    def test_type_changes(self):
+        self.assertEqual(self.round_trip(BASE, dict(BASE, **{'Battery Plugged In': True})),
+                         {'set': {'Battery Plugged In': True}})
+        # A nested dict replaced by a value, and back
+        flat = dict(BASE, **{'Browser History Stats': 'Not available'})
+        self.round_trip(BASE, flat)
+        self.round_trip(flat, BASE)
+
+    def test_apply_leaves_base_alone(self):
+        copy = json.loads(json.dumps(BASE))
+        diff.apply(BASE, {'set': {'Uptime': '2:00:00'}, 'del': ['OS Name'],
+                          'sub': {'Development Tools': {'del': ['Git']}}})
+        self.assertEqual(BASE, copy)
+
+    def test_write_delta(self):
+        def snapshot(usage, taken_at):
+            return Snapshot([Section('cpu', 'Hardware', [
+                Metric('os_name', 'Linux', title='OS Name'),
+                Metric('cpu_usage', usage, 'percent', 'CPU Usage (%)'),
+            ])], taken_at=taken_at, host='node-1')
+
+        baseline = snapshot(10.0, 100.0)
+        out = io.StringIO()
+        diff.write_delta(baseline, snapshot(12.5, 160.0), out)
+        doc = json.loads(out.getvalue())
+        self.assertEqual(doc, {'host': 'node-1', 'taken_at': 160.0, 'since': 100.0,
+                               'delta': {'sub': {'cpu': {'set': {'cpu_usage': 12.5}}}}})
+        self.assertEqual(diff.apply(baseline, doc['delta']), diff.values(snapshot(12.5, 160.0)))
+
+    def test_deltas_carry_typed_values(self):
+        def snapshot(sent, uptime):
+            return Snapshot([
+                Section('boot', 'System', [Metric('uptime', uptime, 'duration', 'Uptime')]),
+                Section('interfaces', 'Network', [
+                    Metric('interface_bytes_sent', sent, 'bytes', 'Interface {index} Sent (MB)',
+                           {'index': 1, 'interface': 'eth0'}),
+                    Metric('interface_mtu', 1500, 'count', 'Interface {index} MTU',
+                           {'index': 1, 'interface': 'eth0'}),
+                ]),
+            ], taken_at=0.0, host='h')
+
+        baseline = snapshot(1024, 600.0)
+        new = snapshot(4096, 660.57)
+        delta = json.loads(json.dumps(diff.diff(diff.values(baseline), diff.values(new))))
+        self.assertEqual(delta, {'sub': {
+            'boot': {'set': {'uptime': 660.57}},
+            'interfaces': {'set': {'interface_bytes_sent{interface=eth0}': 4096}},
+        }})
+        self.assertEqual(diff.apply(baseline, delta), diff.values(new))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from script_info import encoding
+from script_info.collectors.model import BYTES, COUNT, PERCENT, Metric, Section, Snapshot
+
+
+def sample_snapshot(interfaces=3):
+    metrics = [Metric('interfaces', interfaces, COUNT, 'Network Interfaces Count')]
+    for i in range(1, interfaces + 1):
+        labels = {'index': i, 'interface': f'veth{i:x}'}
+        metrics.append(Metric('interface_name', f'veth{i:x}', None, 'Interface {index} Name', labels))
+        metrics.append(Metric('interface_bytes_sent', i * 1500, BYTES, 'Interface {index} Sent (MB)', labels))
+    return Snapshot([
+        Section('os', 'System', [Metric('os_name', 'Linux', title='OS Name'),
+                                 Metric('timezone', 'Zürich ☀', title='Timezone')]),
+        Section('cpu', 'Hardware', [
+            Metric('cpu_usage', 12.5, PERCENT, 'CPU Usage (%)'),
+            Metric('cpu_core_usage', None, PERCENT, ('CPU Per-Core Usage (%)', 'Core {core}'), {'core': 1}),
+            Metric('offset', -3, None, 'Offset'),
+            Metric('plugged', True, None, 'Battery Plugged In'),
+            Metric('ports', [22, 80, 65535], None, 'Listening TCP Ports'),
+        ]),
+        Section('interfaces', 'Network', metrics),
+        Section('wifi', 'Network', [Metric('wifi Collector', 'Timed out after 2s')], 'timed out'),
+    ], taken_at=1700000000.25, host='node-1')
+
+
+def flatten(snapshot):
+    return (snapshot.host, snapshot.taken_at,
+            [(s.collector, s.category, s.status, [m.as_tuple() for m in s.metrics]) for s in snapshot])
+
+
+class TestBinary(unittest.TestCase):
+    def test_round_trip(self):
+        snapshot = sample_snapshot()
+        decoded = encoding.decode_binary(encoding.encode_binary(snapshot))
+        self.assertEqual(flatten(decoded), flatten(snapshot))
+        self.assertEqual(decoded.to_dict(), snapshot.to_dict())
+
+    def test_schemas_and_symbols_beyond_one_byte_references(self):
+        snapshot = sample_snapshot(interfaces=300)
+        data = encoding.encode_binary(snapshot)
+        self.assertEqual(flatten(encoding.decode_binary(data)), flatten(snapshot))
+        # Repeated names, titles and label keys are sent once
+        json_size = len(json.dumps([m.as_tuple() for m in snapshot.metrics()]))
+        self.assertLess(len(data), json_size / 3)
+
+    def test_concatenated_frames(self):
+        frames = b''.join(encoding.encode_binary(Snapshot([], host=f'host-{i}')) for i in range(3))
+        self.assertEqual([s.host for s in encoding.iter_binary(frames)], ['host-0', 'host-1', 'host-2'])
+        self.assertEqual([s.host for s in encoding.read_binary(io.BytesIO(frames))],
+                         ['host-0', 'host-1', 'host-2'])
+
+    def test_corrupt_input(self):
+        data = encoding.encode_binary(sample_snapshot())
+        with self.assertRaises(encoding.BinaryError):
+            encoding.decode_binary(data[:-5])
+        with self.assertRaises(encoding.BinaryError):
+            encoding.decode_binary(b'JUNK' + data)
+        with self.assertRaises(encoding.BinaryError):
+            list(encoding.read_binary(io.BytesIO(data[:-1])))
+
+
+class TestJson(unittest.TestCase):
+    def test_json_document(self):
+        out = io.StringIO()
+        encoding.write_json(sample_snapshot(), out)
+        doc = json.loads(out.getvalue())
+        self.assertEqual(doc['host'], 'node-1')
+        cpu = doc['sections'][1]
+        self.assertEqual((cpu['collector'], cpu['category']), ('cpu', 'Hardware'))
+        self.assertEqual(cpu['metrics'][0], {'name': 'cpu_usage', 'value': 12.5, 'unit': 'percent',
+                                             'title': 'CPU Usage (%)'})
+
+    def test_ndjson_line_per_metric(self):
+        snapshot = sample_snapshot()
+        out = io.StringIO()
+        encoding.write_ndjson(snapshot, out)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(lines), len(list(snapshot.metrics())))
+        self.assertEqual(lines[-1]['collector'], 'wifi')
+        self.assertEqual(lines[3]['labels'], {'core': 1})
+
+
+    def test_json_round_trip(self):
+        snapshot = sample_snapshot()
+        out = io.StringIO()
+        encoding.write_json(snapshot, out)
+        decoded = encoding.read_json(io.StringIO(out.getvalue()))
+        self.assertEqual(flatten(decoded), flatten(snapshot))
+
+
+class TestReadSnapshot(unittest.TestCase):
+    def test_reads_json_and_binary_files(self):
+        snapshot = sample_snapshot()
+        with tempfile.TemporaryDirectory() as tmp:
+            for fmt in ('json', 'binary'):
+                path = os.path.join(tmp, f'snapshot.{fmt}')
+                with open(path, 'wb') as f:
+                    if fmt == 'binary':
+                        encoding.write_binary(snapshot, f)
+                    else:
+                        f.write(json.dumps(json.loads(self.dump_json(snapshot))).encode('utf-8'))
+                self.assertEqual(flatten(encoding.read_snapshot(path)), flatten(snapshot))
+
+            junk = os.path.join(tmp, 'junk')
+            with open(junk, 'wb') as f:
+                f.write(b'{"not": "a snapshot"}')
+            with self.assertRaises(ValueError):
+                encoding.read_snapshot(junk)
+
+    @staticmethod
+    def dump_json(snapshot):
+        out = io.StringIO()
+        encoding.write_json(snapshot, out)
+        return out.getvalue()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import time
+import unittest
+
+from script_info.collectors.engine import TIMED_OUT, UNFINISHED, collect, map_with_deadline, run_collectors
+from script_info.collectors.profiling import format_timings
+
+
+def fast():
+    return {'Fast': 1}
+
+def slow():
+    time.sleep(0.5)
+    return {'Slow': 1}
+
+def broken():
+    raise RuntimeError('boom')
+
+
+class TestEngine(unittest.TestCase):
+    def test_results_merge_in_declaration_order(self):
+        data = collect([('B', lambda: {'b': 2}), ('A', lambda: {'a': 1})])
+        self.assertEqual(list(data), ['b', 'a'])
+
+    def test_collector_timeout_marks_only_the_slow_collector(self):
+        start = time.monotonic()
+        data = collect([('Fast', fast), ('Slow', slow)], collector_timeout={'Slow': 0.05})
+        self.assertLess(time.monotonic() - start, 0.4)
+        self.assertEqual(data['Fast'], 1)
+        self.assertTrue(data['Slow Collector'].startswith(TIMED_OUT))
+
+    def test_global_timeout(self):
+        results = dict(run_collectors([('Slow', slow)], timeout=0.05))
+        self.assertIn(TIMED_OUT, results['Slow']['Slow Collector'])
+
+    def test_errors_do_not_abort_the_run(self):
+        data = collect([('Broken', broken), ('Fast', fast)])
+        self.assertEqual(data['Broken Collector'], 'Error: boom')
+        self.assertEqual(data['Fast'], 1)
+
+    def test_timings_record_status_and_errors(self):
+        timings = {}
+        collect([('Fast', fast), ('Broken', broken), ('Slow', slow)],
+                collector_timeout={'Slow': 0.05}, timings=timings)
+        self.assertEqual(timings['Fast'].status, 'ok')
+        self.assertGreaterEqual(timings['Fast'].cpu, 0)
+        self.assertEqual(timings['Broken'].status, 'error')
+        self.assertIn('RuntimeError: boom', timings['Broken'].error)
+        self.assertEqual(timings['Slow'].status, 'timed out')
+        self.assertIsNone(timings['Slow'].cpu)
+        lines = format_timings(timings)
+        self.assertTrue(lines[1].startswith('Slow'))
+
+    def test_map_with_deadline(self):
+        def work(x):
+            if x == 'hang':
+                time.sleep(1)
+            if x == 'bad':
+                raise OSError
+            return x * 2
+
+        start = time.monotonic()
+        results = map_with_deadline(work, ['a', 'hang', 'bad', 'b'], timeout=0.2, max_workers=2)
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(results, ['aa', UNFINISHED, None, 'bb'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,214 @@
+import importlib
+import json
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from script_info import exporter
+from script_info.cli import main as cli
+from script_info.collectors import hardware, isolation
+from script_info.history import series_key
+
+# The package re-exports the `options` object under the module's name
+options_module = importlib.import_module('script_info.collectors.options')
+from script_info.collectors.model import BYTES, COUNT, DURATION, MHZ, PERCENT, Metric, Section, Snapshot
+from script_info.collectors.profiling import STATUS_TIMED_OUT
+
+
+def sample_snapshot():
+    return Snapshot([
+        Section('memory', 'Hardware', [
+            Metric('memory_total', 8 * 1024 ** 3, BYTES, 'Total Memory (GB)'),
+            Metric('memory_usage', 41.5, PERCENT, 'Memory Usage (%)'),
+        ]),
+        Section('cpu', 'Hardware', [
+            Metric('cpu_frequency', 2400.0, MHZ, 'CPU Frequency'),
+            Metric('cpu_time_user', 12.5, 'seconds', 'CPU Time User (s)'),
+        ]),
+        Section('interfaces', 'Network', [
+            Metric('interfaces', 2, COUNT, 'Network Interfaces Count'),
+            Metric('interface_name', 'eth0', None, 'Interface {index} Name', {'index': 1, 'interface': 'eth0'}),
+            Metric('interface_is_up', True, None, 'Interface {index} Up', {'index': 1, 'interface': 'eth0'}),
+            Metric('interface_bytes_sent', 1500, BYTES, 'Interface {index} Sent (MB)',
+                   {'index': 1, 'interface': 'eth0'}),
+            Metric('interface_bytes_sent', 3000, BYTES, 'Interface {index} Sent (MB)',
+                   {'index': 2, 'interface': 'we"ird\\'}),
+        ]),
+        Section('boot', 'System', [Metric('uptime', 3600, DURATION, 'Uptime')]),
+        Section('gpu', 'Hardware', [Metric('gpu Collector', 'Timed out after 2s')], STATUS_TIMED_OUT),
+    ], taken_at=1700000000.5, host='node-1')
+
+
+class TestRender(unittest.TestCase):
+    def setUp(self):
+        self.text = exporter.render_openmetrics(sample_snapshot())
+        self.lines = self.text.splitlines()
+
+    def test_units_and_types(self):
+        self.assertIn('# TYPE script_info_memory_total_bytes gauge', self.lines)
+        self.assertIn('# UNIT script_info_memory_total_bytes bytes', self.lines)
+        self.assertIn(f'script_info_memory_total_bytes {8 * 1024 ** 3}', self.lines)
+        self.assertIn('script_info_cpu_frequency_hertz 2400000000.0', self.lines)
+        self.assertIn('script_info_uptime_seconds 3600', self.lines)
+        self.assertIn('script_info_interfaces 2', self.lines)
+
+    def test_counters_get_total_suffix(self):
+        self.assertIn('# TYPE script_info_cpu_time_user_seconds counter', self.lines)
+        self.assertIn('script_info_cpu_time_user_seconds_total 12.5', self.lines)
+
+    def test_labels_and_families(self):
+        self.assertIn('script_info_interface_is_up{interface="eth0"} 1', self.lines)
+        self.assertIn('script_info_interface_bytes_sent_bytes_total{interface="we\\"ird\\\\"} 3000', self.lines)
+        # Text values are left out, and each family is declared once
+        self.assertNotIn('interface_name', self.text)
+        self.assertEqual(self.text.count('# TYPE script_info_interface_bytes_sent_bytes '), 1)
+
+    def test_collector_status_and_eof(self):
+        self.assertIn('script_info_collector_up{collector="memory"} 1', self.lines)
+        self.assertIn('script_info_collector_up{collector="gpu"} 0', self.lines)
+        self.assertIn('script_info_snapshot_timestamp_seconds 1700000000.5', self.lines)
+        self.assertEqual(self.lines[-1], '# EOF')
+        self.assertTrue(self.text.endswith('\n'))
+
+    def test_identical_gpus_are_distinct_series(self):
+        gpu = namedtuple('GPU', 'id uuid name memoryTotal memoryUsed memoryFree load temperature')
+        gputil = mock.Mock(getGPUs=mock.Mock(return_value=[
+            gpu(0, 'GPU-aaaa', 'NVIDIA A100', 40960, 1024, 39936, 0.5, 40.0),
+            gpu(1, 'GPU-bbbb', 'NVIDIA A100', 40960, 2048, 38912, 0.25, 45.0),
+        ]))
+        with mock.patch.object(isolation, 'ENABLED', False), \
+                mock.patch.object(hardware, 'optional_import', return_value=gputil), \
+                mock.patch.object(hardware, 'find_nvidia_smi', return_value='/usr/bin/nvidia-smi'):
+            metrics = hardware.get_gpu_info.metrics()
+        lines = exporter.render_openmetrics(Snapshot([Section('gpu', 'Hardware', metrics)], 1.0, 'h')).splitlines()
+        usage = [line for line in lines if line.startswith('script_info_gpu_usage_percent{')]
+        self.assertEqual(usage, [
+            'script_info_gpu_usage_percent{gpu="NVIDIA A100",uuid="GPU-aaaa"} 50.0',
+            'script_info_gpu_usage_percent{gpu="NVIDIA A100",uuid="GPU-bbbb"} 25.0',
+        ])
+        self.assertEqual(len(set(series_key(m.name, m.labels) for m in metrics)), len(metrics))
+
+    def test_special_floats(self):
+        text = exporter.render_openmetrics(Snapshot([Section('x', 'System', [
+            Metric('a', float('nan')), Metric('b', float('inf'))])], taken_at=1.0, host='h'))
+        self.assertIn('script_info_a NaN', text)
+        self.assertIn('script_info_b +Inf', text)
+
+
+class CountingCache(exporter.MetricsCache):
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+        self.active = 0
+        self.overlapped = False
+
+    def refresh(self):
+        with self.lock:
+            self.active += 1
+            self.overlapped |= self.active > 1
+        try:
+            snapshot = sample_snapshot()
+            self.payload = exporter.render_openmetrics(snapshot).encode('utf-8')
+            self.history.record(snapshot)
+            self.runs += 1
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class TestServer(unittest.TestCase):
+    def setUp(self):
+        self.cache = CountingCache()
+        self.server = exporter.make_server(self.cache, port=0)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def get(self, path='/metrics'):
+        with urllib.request.urlopen(self.url + path, timeout=5) as response:
+            return response.headers['Content-Type'], response.read()
+
+    def test_unavailable_before_first_collection(self):
+        with self.assertRaises(urllib.error.HTTPError) as cm:
+            self.get()
+        self.assertEqual(cm.exception.code, 503)
+
+    def test_scrapes_never_collect(self):
+        self.cache.refresh()
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(lambda _: self.get(), range(32)))
+        self.assertEqual(self.cache.runs, 1)
+        for content_type, body in results:
+            self.assertEqual(content_type, exporter.CONTENT_TYPE)
+            self.assertEqual(body, self.cache.payload)
+
+    def test_history(self):
+        self.cache.refresh()
+        self.cache.history.add('memory_usage', 45.5, when=1700000001.5)
+        content_type, body = self.get('/history?window=1e9')
+        self.assertEqual(content_type, 'application/json')
+        series = {entry['name']: entry for entry in json.loads(body)['series']}
+        self.assertEqual(series['memory_usage']['min'], 41.5)
+        self.assertEqual(series['memory_usage']['max'], 45.5)
+        self.assertEqual(series['memory_usage']['count'], 2)
+        self.assertEqual(series['cpu_frequency']['labels'], {})
+        # Text values and other collectors are not recorded
+        self.assertNotIn('uptime', series)
+        for window in ('soon', 'nan', 'inf', '-inf', '-60', '0'):
+            with self.assertRaises(urllib.error.HTTPError) as cm:
+                self.get(f'/history?window={window}')
+            self.assertEqual(cm.exception.code, 400, window)
+
+    def test_unknown_path(self):
+        self.cache.refresh()
+        with self.assertRaises(urllib.error.HTTPError) as cm:
+            self.get('/nope')
+        self.assertEqual(cm.exception.code, 404)
+
+    def test_refresh_loop(self):
+        stop = threading.Event()
+        thread = threading.Thread(target=exporter.refresh_loop, args=(self.cache, 0.01, stop))
+        thread.start()
+        with ThreadPoolExecutor(4) as pool:
+            for _ in range(20):
+                list(pool.map(lambda _: self.cache.payload, range(4)))
+                if self.cache.runs >= 3:
+                    break
+                stop.wait(0.02)
+        stop.set()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertGreaterEqual(self.cache.runs, 3)
+        self.assertFalse(self.cache.overlapped)
+
+
+class TestServeCommand(unittest.TestCase):
+    def test_collector_options_apply_to_serve(self):
+        fresh = options_module.Options()
+        seen = {}
+
+        def fake_serve(*args):
+            seen.update(vars(fresh))
+
+        argv = ['script-info-cli', 'serve', '--exclude-interfaces', 'veth*,cali*', '--interfaces', 'eth*',
+                '--fstype', 'ext4', '--mount-prefix', '/data', '--top', '3']
+        with mock.patch.object(options_module, 'options', fresh), \
+                mock.patch('sys.argv', argv), \
+                mock.patch.object(exporter, 'serve', fake_serve):
+            cli.main()
+        self.assertEqual(seen['interface_exclude'], ['veth*', 'cali*'])
+        self.assertEqual(seen['interface_include'], ['eth*'])
+        self.assertEqual(seen['partition_fstypes'], {'ext4'})
+        self.assertEqual(seen['partition_prefixes'], ['/data'])
+        self.assertEqual(seen['process_top'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
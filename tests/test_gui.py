@@ -0,0 +1,95 @@
+import queue
+import unittest
+
+try:
+    from script_info.gui import main as gui
+except ImportError:  # Python built without Tk
+    gui = None
+
+from script_info.collectors.model import COUNT, Metric, Section
+
+
+class FakeWidget:
+    def __init__(self):
+        self.inserts = []
+
+    def config(self, **kwargs):
+        pass
+
+    def insert(self, index, *args):
+        self.inserts.append(args)
+
+    def delete(self, start, end):
+        self.inserts = []
+
+
+class FakeRoot:
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, func, *args):
+        self.scheduled.append((func, args))
+
+    def run(self):
+        ticks = 0
+        while self.scheduled:
+            func, args = self.scheduled.pop(0)
+            func(*args)
+            ticks += 1
+        return ticks
+
+
+def interfaces_section(count):
+    metrics = [Metric('interfaces', count, COUNT, 'Network Interfaces Count')]
+    for i in range(1, count + 1):
+        metrics.append(Metric('interface_name', f'veth{i}', None, 'Interface {index} Name', {'index': i}))
+    return Section('interfaces', 'Network', metrics)
+
+
+@unittest.skipIf(gui is None, 'tkinter is not available')
+class TestIncrementalRendering(unittest.TestCase):
+    def make_app(self):
+        app = object.__new__(gui.SystemInfoGUI)
+        app.root = FakeRoot()
+        app.text_area = FakeWidget()
+        app.status_label = app.collect_button = app.refresh_button = FakeWidget()
+        app.clear_button = app.pdf_button = FakeWidget()
+        app.current_info = {}
+        app.generation = 1
+        app.sections = []
+        app.pending_rows = []
+        app.item_count = 0
+        return app
+
+    def test_sections_render_in_batches_across_ticks(self):
+        app = self.make_app()
+        results = queue.Queue()
+        results.put(('section', Section('os', 'System', [Metric('os_name', 'Linux', title='OS Name')])))
+        results.put(('section', interfaces_section(6000)))
+        results.put(('done', None))
+
+        app.drain_results(1, results, False)
+        ticks = app.root.run()
+
+        rows = 1 + 2 + 1 + 2 * 6001
+        self.assertGreater(ticks, rows // gui.ROWS_PER_TICK - 1)
+        self.assertTrue(all(len(args) <= 2 * gui.BATCH_ROWS for args in app.text_area.inserts))
+        text = ''.join(''.join(args[0::2]) for args in app.text_area.inserts)
+        self.assertIn('OS Name: Linux\n', text)
+        self.assertIn('Interface 6000 Name: veth6000\n', text)
+        self.assertEqual(app.item_count, 6002)
+        # The snapshot keeps declaration order whatever order sections arrived in
+        self.assertEqual([s.collector for s in app.current_info], ['os', 'interfaces'])
+
+    def test_stale_collection_is_dropped(self):
+        app = self.make_app()
+        results = queue.Queue()
+        results.put(('section', interfaces_section(3)))
+        app.generation = 2
+        app.drain_results(1, results, False)
+        self.assertEqual(app.text_area.inserts, [])
+        self.assertEqual(app.root.scheduled, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
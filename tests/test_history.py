@@ -0,0 +1,162 @@
+import statistics
+import tracemalloc
+import unittest
+from unittest import mock
+
+from fakes import FakePsutil
+from script_info.collectors import network
+from script_info.collectors.model import BYTES, PERCENT, Metric, Section, Snapshot
+from script_info.history import HistoryStore, Tier, series_key
+
+START = 1_700_000_000.0
+
+
+class TestTier(unittest.TestCase):
+    def test_buckets_wrap_and_queries_span_the_wrap(self):
+        tier = Tier(1, 10)
+        for i in range(25):
+            tier.add(START + i, float(i))
+        self.assertEqual(len(tier), 10)
+        self.assertEqual([v for _, v in tier.points(0)], [float(i) for i in range(15, 25)])
+        summary = tier.summary(START + 18)
+        self.assertEqual((summary.min, summary.max, summary.mean, summary.count), (18.0, 24.0, 21.0, 7))
+        self.assertIsNone(tier.summary(START + 100))
+
+    def test_downsampling(self):
+        tier = Tier(60, 4)
+        for i in range(120):
+            tier.add(START - START % 60 + i, float(i))
+        points = tier.points(0)
+        self.assertEqual([v for _, v in points], [29.5, 89.5])
+        summary = tier.summary(0)
+        self.assertEqual((summary.min, summary.max, summary.mean, summary.count), (0.0, 119.0, 59.5, 120))
+
+    def test_sparse_samples_only_keep_the_span(self):
+        tier = Tier(1, 600)
+        # One sample every 15 s for an hour: 10 minutes' worth is kept
+        for i in range(0, 3600, 15):
+            tier.add(START + i, 1.0)
+        self.assertEqual(len(tier), 40)
+        self.assertEqual(tier.nbytes, 40 * 20)
+        self.assertEqual(tier.points(0)[0][0], START + 3600 - 600)
+
+    def test_clock_stepping_back_is_dropped(self):
+        tier = Tier(1, 10)
+        tier.add(START + 5, 1.0)
+        tier.add(START + 2, 100.0)
+        self.assertEqual(tier.points(0), [(START + 5, 1.0)])
+
+
+class TestHistoryStore(unittest.TestCase):
+    def snapshot(self, when, usage, sent):
+        return Snapshot([
+            Section('memory', 'Hardware', [
+                Metric('memory_usage', usage, PERCENT, 'Memory Usage (%)'),
+                Metric('memory_total', 'n/a'),
+            ]),
+            Section('interfaces', 'Network', [
+                Metric('interface_bytes_sent', sent, BYTES, 'Interface {index} Sent (MB)',
+                       {'index': 1, 'interface': 'eth0'}),
+                Metric('interface_is_up', True, None, 'Interface {index} Up', {'index': 1, 'interface': 'eth0'}),
+            ]),
+            Section('os', 'System', [Metric('uptime_days', 3)]),
+        ], taken_at=when, host='h')
+
+    def test_record_and_query(self):
+        store = HistoryStore()
+        for i in range(100):
+            store.record(self.snapshot(START + i, float(i), 1000 * i))
+        self.assertEqual(sorted(store.keys()), [
+            series_key('interface_bytes_sent', {'interface': 'eth0'}),
+            series_key('memory_usage'),
+        ])
+        usage = store.summary('memory_usage', seconds=20, now=START + 99)
+        self.assertEqual((usage.min, usage.max, usage.count), (79.0, 99.0, 21))
+        self.assertEqual(usage.mean, statistics.mean(range(79, 100)))
+        self.assertEqual(usage.p95, 98.0)
+        # Counters are stored as per-second rates; 'index' does not identify a series
+        sent = store.summary('interface_bytes_sent', {'interface': 'eth0', 'index': 7}, 60, START + 99)
+        self.assertEqual((sent.min, sent.max, sent.count), (1000.0, 1000.0, 61))
+        self.assertIsNone(store.summary('memory_usage', seconds=5, now=START + 500))
+        self.assertIsNone(store.summary('missing'))
+
+    def test_long_windows_use_coarser_tiers(self):
+        store = HistoryStore()
+        for i in range(0, 3 * 3600, 5):
+            store.add('cpu_usage', 50.0 + (i // 3600), when=START + i)
+        points = store.points('cpu_usage', seconds=3 * 3600, now=START + 3 * 3600)
+        # One point per minute, not per sample
+        self.assertLessEqual(len(points), 3 * 60 + 1)
+        summary = store.summary('cpu_usage', seconds=3 * 3600, now=START + 3 * 3600)
+        self.assertEqual((summary.min, summary.max, summary.count), (50.0, 52.0, 3 * 720))
+        self.assertEqual(len(store.points('cpu_usage', seconds=60, now=START + 3 * 3600)), 12)
+
+    def test_counter_reset_is_not_negative(self):
+        store = HistoryStore()
+        for when, value in ((0, 500), (1, 900), (2, 100)):
+            store.add('disk_read', value, when=START + when)
+        self.assertEqual([v for _, v in store.points('disk_read', now=START + 2)], [400.0, 0.0])
+
+    def test_memory_stays_flat(self):
+        store = HistoryStore(tiers=((1, 60), (60, 60)))
+        for i in range(200):
+            store.add('memory_usage', float(i), when=START + i)
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            for i in range(200, 5000):
+                store.add('memory_usage', float(i), when=START + i)
+            grown = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(before, 'filename'))
+        finally:
+            tracemalloc.stop()
+        self.assertLess(grown, 4096)
+
+    def test_bytes_per_series(self):
+        fake = FakePsutil(processes=0, interfaces=1000)
+        with mock.patch.object(network, 'system', fake):
+            metrics = network.get_interfaces_info.metrics()
+        store = HistoryStore()
+        # Five minutes of a 15 s scrape interval
+        for i in range(21):
+            store.record([Section('interfaces', 'Network', metrics)], when=START + 15 * i)
+        # Sent and received per NIC plus the totals; MTU and speed are static
+        self.assertLess(len(store), 2 * 1000 + 10)
+        per_series = store.nbytes / len(store)
+        self.assertLessEqual(per_series, 20 * (20 + 7 + 2))
+        # Bounded by the tier capacities however long it runs
+        full = HistoryStore(tiers=((1, 600), (60, 1440), (3600, 168)))
+        for i in range(0, 8 * 24 * 3600, 30):
+            full.add('memory_usage', 1.0, when=START + i)
+        self.assertLessEqual(full.nbytes, 20 * (600 + 1440 + 168))
+        self.assertLessEqual(full.nbytes, 20 * (20 + 1440 + 168))
+
+    def test_series_are_capped(self):
+        store = HistoryStore(max_series=3)
+        for when in (START, START + 1):
+            for i in range(5):
+                store.add('interface_bytes_sent', i, {'interface': f'veth{i}'}, when=when)
+        self.assertEqual(len(store), 3)
+        self.assertEqual(len(store._counters), 3)
+        store.add('memory_usage', 1.0, when=START + 1)
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store.dropped, 5)
+
+    def test_static_metrics_are_not_recorded(self):
+        store = HistoryStore()
+        store.record([Section('memory', 'Hardware', [
+            Metric('memory_total', 8 * 1024 ** 3, BYTES), Metric('memory_usage', 40.0, PERCENT)])], when=START)
+        self.assertEqual(store.keys(), [series_key('memory_usage')])
+
+    def test_stale_series_expire(self):
+        store = HistoryStore(tiers=((1, 10), (60, 10)))
+        store.add('interface_bytes_sent', 1, {'interface': 'veth1'}, when=START)
+        store.add('interface_bytes_sent', 2, {'interface': 'veth1'}, when=START + 1)
+        store.add('memory_usage', 1.0, when=START)
+        self.assertEqual(len(store), 2)
+        store.add('memory_usage', 1.0, when=START + 700)
+        self.assertEqual(store.keys(), [series_key('memory_usage')])
+        self.assertEqual(store._counters, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from fakes import FakePsutil, snicstats
+from script_info.collectors import interfaces
+
+
+class TestInterfaces(unittest.TestCase):
+    def setUp(self):
+        self.fake = FakePsutil(interfaces=10)
+
+    def test_inventory_combines_addresses_stats_and_counters(self):
+        nics = {nic.name: nic for nic in interfaces.interface_inventory(self.fake)}
+        self.assertEqual(len(nics), 10)
+        eth0 = nics['eth0']
+        self.assertEqual(eth0.type, 'ethernet')
+        self.assertEqual(eth0.ipv4, '10.0.0.1')
+        self.assertEqual(eth0.ipv6, 'fe80::1')
+        # The MAC comes from the AF_LINK entry, not the first non-IP family
+        self.assertEqual(eth0.mac, '00:00:00:00:00:01')
+        self.assertEqual((eth0.is_up, eth0.mtu, eth0.speed), (True, 1500, 10000))
+        self.assertIsNotNone(eth0.bytes_sent)
+
+    def test_interface_without_addresses_is_listed(self):
+        self.fake._stats['bond0'] = snicstats(False, 0, 0, 1500, '')
+        nics = {nic.name: nic for nic in interfaces.interface_inventory(self.fake)}
+        self.assertEqual(nics['bond0'].type, 'bond')
+        self.assertFalse(nics['bond0'].is_up)
+        self.assertIsNone(nics['bond0'].ipv4)
+
+    def test_include_and_exclude_globs(self):
+        names = [nic.name for nic in interfaces.interface_inventory(self.fake, include=['e*', 'LO'])]
+        self.assertEqual(names, ['lo', 'eth0'])
+        names = [nic.name for nic in interfaces.interface_inventory(self.fake, exclude=['veth*', 'cali*'])]
+        self.assertEqual(names, ['lo', 'eth0'])
+
+    def test_summary_by_type(self):
+        summary = interfaces.summarise(interfaces.interface_inventory(self.fake))
+        self.assertEqual(summary, {'calico': 4, 'veth': 4, 'loopback': 1, 'ethernet': 1})
+
+    def test_types(self):
+        for name, kind in [('lo', 'loopback'), ('enp0s3', 'ethernet'), ('eth0.100', 'vlan'),
+                           ('docker0', 'bridge'), ('wg0', 'tunnel'), ('Wi-Fi', 'wireless'),
+                           ('Ethernet 2', 'ethernet'), ('something', 'other')]:
+            self.assertEqual(interfaces.interface_type(name), kind, name)
+
+
+if __name__ == '__main__':
+    unittest.main()
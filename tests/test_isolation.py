@@ -0,0 +1,163 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import psutil
+
+import fakes
+from script_info.collectors import cache, hardware, isolation
+from script_info.collectors.cache import StaticCache, Uncached, static_fact
+from script_info.collectors.isolation import IsolationError, WorkerPool
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# A script without an `if __name__ == '__main__'` guard, as in the README
+UNGUARDED_SCRIPT = '''\
+import os
+import sys
+sys.path[:0] = [{root!r}, {tests!r}]
+import fakes
+from script_info.core import iter_system_info
+print('RUN')
+for name, info in iter_system_info(only=['cpu_details']):
+    print(name, info)
+print('PIDS', fakes.isolated_pid()[0].value, os.getpid())
+'''
+
+
+class TestWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = WorkerPool(size=1)
+        self.addCleanup(self.pool.close)
+        patcher = mock.patch.object(isolation, 'pool', self.pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_runs_in_a_reused_worker(self):
+        first = fakes.isolated_pid()
+        self.assertNotEqual(first[0].value, os.getpid())
+        self.assertEqual(first[1].title, ('CPU', 'Flags'))
+        self.assertEqual(first[1].value, ['a', 'b'])
+        self.assertEqual(fakes.isolated_pid()[0].value, first[0].value)
+
+    def test_errors_keep_the_worker(self):
+        pid = fakes.isolated_pid()[0].value
+        with self.assertRaisesRegex(IsolationError, 'ValueError: boom'):
+            fakes.isolated_error()
+        self.assertEqual(fakes.isolated_pid()[0].value, pid)
+
+    def test_dead_worker_is_replaced(self):
+        pid = fakes.isolated_pid()[0].value
+        with self.assertRaisesRegex(IsolationError, 'exited'):
+            fakes.isolated_exit()
+        self.assertNotEqual(fakes.isolated_pid()[0].value, pid)
+
+    @unittest.skipUnless(hasattr(os, 'killpg'), 'needs process groups')
+    def test_hang_is_killed_with_its_children(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        pidfile = os.path.join(directory, 'child.pid')
+        with mock.patch.dict(os.environ, {fakes.CHILD_PIDFILE_ENV: pidfile}):
+            start = time.monotonic()
+            with self.assertRaisesRegex(IsolationError, 'Killed after 2s'):
+                fakes.isolated_hang()
+        self.assertLess(time.monotonic() - start, 5)
+        with open(pidfile) as f:
+            child = int(f.read())
+        deadline = time.monotonic() + 5
+        while psutil.pid_exists(child) and psutil.Process(child).status() != psutil.STATUS_ZOMBIE:
+            self.assertLess(time.monotonic(), deadline, 'child of the killed worker survived')
+            time.sleep(0.05)
+        # The pool is usable again
+        self.assertNotEqual(fakes.isolated_pid()[0].value, os.getpid())
+
+    def test_disabled_runs_in_process(self):
+        with mock.patch.object(isolation, 'ENABLED', False):
+            self.assertEqual(fakes.isolated_pid()[0].value, os.getpid())
+        self.assertEqual(self.pool._busy, set())
+        self.assertEqual(self.pool._idle, [])
+
+    def test_static_results_are_cached_in_the_parent(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        static_cache = StaticCache(os.path.join(directory, 'static-facts.json'))
+        static_cache.enabled = True
+        cache.set_cache(static_cache)
+        self.addCleanup(cache.set_cache, None)
+        cached = static_fact('isolated_pid')(fakes.isolated_pid)
+        first = cached()
+        with mock.patch.object(self.pool, 'call', side_effect=AssertionError('worker used')):
+            self.assertEqual(cached(), first)
+
+    def test_uncached_results_stay_uncached(self):
+        metrics = fakes.isolated_placeholder()
+        self.assertIsInstance(metrics, Uncached)
+        self.assertNotEqual(metrics[0].value, os.getpid())
+        self.assertNotIsInstance(fakes.isolated_pid(), Uncached)
+
+
+@unittest.skipUnless(isolation.ENABLED, 'isolation disabled')
+class TestUnguardedScript(unittest.TestCase):
+    def test_runs_once_with_real_results(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        script = os.path.join(directory, 'script.py')
+        with open(script, 'w') as f:
+            f.write(UNGUARDED_SCRIPT.format(root=ROOT, tests=os.path.dirname(__file__)))
+        env = dict(os.environ, SCRIPT_INFO_NO_CACHE='1')
+        result = subprocess.run([sys.executable, script], capture_output=True, text=True,
+                                cwd=directory, env=env, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        lines = result.stdout.splitlines()
+        self.assertEqual(lines.count('RUN'), 1)
+        details = next(line for line in lines if line.startswith('cpu_details '))
+        self.assertNotIn('Error', details)
+        worker, parent = next(line for line in lines if line.startswith('PIDS ')).split()[1:]
+        self.assertNotEqual(worker, parent)
+
+
+class TestCpuDetails(unittest.TestCase):
+    def test_cpuinfo_fields(self):
+        info = {'brand_raw': 'Example CPU', 'arch': 'X86_64', 'bits': 64, 'l2_cache_size': 2 * 1024 ** 2,
+                'l3_cache_size': '32 MiB', 'hz_advertised': [2_400_000_000, 0], 'flags': ['sse2', 'avx']}
+        fake = mock.Mock(get_cpu_info=mock.Mock(return_value=info))
+        with mock.patch.object(isolation, 'ENABLED', False), \
+                mock.patch.object(hardware, 'optional_import', return_value=fake), \
+                mock.patch.object(cache, 'get_cache', lambda: fakes._DISABLED_CACHE):
+            details = hardware.get_cpu_details_info()
+        self.assertEqual(details, {
+            'CPU Brand': 'Example CPU', 'CPU Architecture': 'X86_64', 'CPU Bits': 64,
+            'CPU L2 Cache': '2.00 MB', 'CPU L3 Cache': '32 MiB',
+            'CPU Advertised Frequency (MHz)': 2400.0, 'CPU Flags': 'avx, sse2',
+        })
+
+    def test_missing_cpuinfo_is_not_cached(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        static_cache = StaticCache(os.path.join(directory, 'static-facts.json'))
+        static_cache.enabled = True
+        with mock.patch.object(isolation, 'ENABLED', False), \
+                mock.patch.object(hardware, 'optional_import', return_value=None), \
+                mock.patch.object(cache, 'get_cache', lambda: static_cache):
+            details = hardware.get_cpu_details_info()
+        self.assertEqual(details, {'CPU Details': 'py-cpuinfo not installed'})
+        self.assertIsNone(static_cache.get('cpu_details'))
+
+
+class TestGpu(unittest.TestCase):
+    def test_no_worker_without_nvidia_smi(self):
+        gputil = mock.Mock(getGPUs=mock.Mock(side_effect=AssertionError('GPUtil called')))
+        with mock.patch.object(isolation, 'ENABLED', True), \
+                mock.patch.object(isolation.pool, 'call', side_effect=AssertionError('worker used')), \
+                mock.patch.object(hardware, 'optional_import', return_value=gputil), \
+                mock.patch.object(hardware, 'find_nvidia_smi', return_value=None):
+            self.assertEqual(hardware.get_gpu_info(), {'GPU': 'No GPU detected'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import datetime
+import os
+import tempfile
+import time
+import unittest
+
+from script_info.collectors import collect_snapshot, hardware
+from script_info.collectors.model import (
+    BYTES, COUNT, DURATION, PERCENT, SECONDS, TIMESTAMP, Metric, Section, Snapshot, from_dict,
+)
+from script_info.collectors.profiling import STATUS_OK, STATUS_TIMED_OUT
+from script_info.collectors.registry import Collector
+from script_info.formatting import display_dict
+from script_info.reporting import PDFReporter
+
+GB = 1024 ** 3
+
+
+class TestDisplay(unittest.TestCase):
+    def test_units_are_formatted_for_display_only(self):
+        boot = datetime.datetime(2024, 1, 2, 3, 4, 5).timestamp()
+        metrics = [
+            Metric('memory_total', 16 * GB, BYTES, 'Total Memory (GB)'),
+            Metric('disk_read', 5 * 1024 ** 2, BYTES, 'Disk Read (MB)'),
+            Metric('cpu_usage', 12.345, PERCENT, 'CPU Usage (%)'),
+            Metric('cpu_time_user', 1.5, SECONDS, 'CPU User Time'),
+            Metric('window', 0.12345, SECONDS, 'CPU Usage Window (s)'),
+            Metric('uptime', 3725.9, DURATION, 'Uptime'),
+            Metric('boot_time', boot, TIMESTAMP, 'Boot Time'),
+            Metric('ports', [22, 80], None, 'Listening TCP Ports'),
+            Metric('gpu_usage', None, PERCENT, 'GPU Usage (%)'),
+        ]
+        self.assertEqual(display_dict(metrics), {
+            'Total Memory (GB)': 16.0,
+            'Disk Read (MB)': 5.0,
+            'CPU Usage (%)': 12.3,
+            'CPU User Time': '1.50s',
+            'CPU Usage Window (s)': 0.123,
+            'Uptime': '1:02:05',
+            'Boot Time': '2024-01-02 03:04:05',
+            'Listening TCP Ports': '22, 80',
+            'GPU Usage (%)': 'N/A',
+        })
+        # The raw values are untouched
+        self.assertEqual(metrics[0].value, 16 * GB)
+
+    def test_labelled_and_nested_titles(self):
+        metrics = [
+            Metric('partition_free', GB, BYTES, 'Partition {index} Free (GB)', {'index': 1, 'mount': '/'}),
+            Metric('tool', '2.43', None, ('Development Tools', '{tool}'), {'tool': 'Git'}),
+            Metric('tool', 'Not detected', None, ('Development Tools', '{tool}'), {'tool': 'Go'}),
+        ]
+        self.assertEqual(display_dict(metrics), {
+            'Partition 1 Free (GB)': 1.0,
+            'Development Tools': {'Git': '2.43', 'Go': 'Not detected'},
+        })
+
+    def test_collectors_keep_their_display_dicts(self):
+        info = hardware.get_memory_info()
+        self.assertIsInstance(info['Total Memory (GB)'], float)
+        metrics = {m.name: m for m in hardware.get_memory_info.metrics()}
+        self.assertEqual(metrics['memory_total'].unit, BYTES)
+        self.assertIsInstance(metrics['memory_total'].value, int)
+
+
+class TestSnapshot(unittest.TestCase):
+    def test_sections_carry_category_and_status(self):
+        snapshot = collect_snapshot(only=['memory', 'os'])
+        self.assertEqual([(s.collector, s.category, s.status) for s in snapshot],
+                         [('os', 'System', STATUS_OK), ('memory', 'Hardware', STATUS_OK)])
+        self.assertEqual(list(snapshot.categories()), ['System', 'Hardware'])
+        self.assertIn('Total Memory (GB)', snapshot.to_dict())
+
+    def test_plugin_dicts_and_timeouts_become_sections(self):
+        from script_info.collectors import registry
+        plugin = Collector('plugin_test', lambda: {'Plugin Value': 42}, 'Plugins', default=False)
+        slow = Collector('slow_test', lambda: time.sleep(1) or {}, 'Plugins', default=False)
+        registry.add_collector(plugin)
+        registry.add_collector(slow)
+        self.addCleanup(registry._collectors.pop, 'plugin_test')
+        self.addCleanup(registry._collectors.pop, 'slow_test')
+
+        snapshot = collect_snapshot(only=['plugin_test', 'slow_test'], collector_timeout=0.1)
+
+        self.assertEqual(snapshot.section('plugin_test').metrics, from_dict({'Plugin Value': 42}))
+        self.assertEqual(snapshot.section('slow_test').status, STATUS_TIMED_OUT)
+        self.assertIn('Timed out', snapshot.to_dict()['slow_test Collector'])
+
+    def test_iter_sections_yields_fastest_first(self):
+        from script_info.collectors import registry, iter_sections
+        slow = Collector('slow_first', lambda: time.sleep(0.2) or {'Slow': 1}, 'Plugins', default=False)
+        fast = Collector('fast_second', lambda: {'Fast': 2}, 'Plugins', default=False)
+        registry.add_collector(slow)
+        registry.add_collector(fast)
+        self.addCleanup(registry._collectors.pop, 'slow_first')
+        self.addCleanup(registry._collectors.pop, 'fast_second')
+
+        sections = list(iter_sections(only=['slow_first', 'fast_second']))
+        self.assertEqual([s.collector for s in sections], ['fast_second', 'slow_first'])
+        self.assertEqual([s.collector for s in collect_snapshot(only=['slow_first', 'fast_second'])],
+                         ['slow_first', 'fast_second'])
+
+    def test_pdf_groups_by_section_category(self):
+        snapshot = Snapshot([
+            Section('custom', 'Hardware', [Metric('oddly_named', 3, COUNT, 'Widgets')]),
+        ])
+        fd, path = tempfile.mkstemp(suffix='.pdf')
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        self.assertTrue(PDFReporter(path).generate(snapshot))
+        self.assertGreater(os.path.getsize(path), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import threading
+import time
+import unittest
+from collections import namedtuple
+
+from fakes import GB, sdiskpart, sdiskusage
+from script_info.collectors import mounts
+
+stat_result = namedtuple('stat_result', 'st_dev')
+
+
+class FakeDisks:
+    """disk_usage/stat backend with per-mountpoint devices and hangs."""
+
+    def __init__(self, devices, hang=()):
+        self.devices = devices
+        self.hang = set(hang)
+        self.release = threading.Event()
+
+    def stat(self, path):
+        if path in self.hang:
+            self.release.wait()
+        return stat_result(self.devices[path])
+
+    def disk_usage(self, path):
+        return sdiskusage(100 * GB, 40 * GB, 60 * GB, 40.0)
+
+
+class TestMounts(unittest.TestCase):
+    def test_pseudo_filesystems_are_skipped_by_default(self):
+        parts = [sdiskpart('/dev/sda1', '/', 'ext4', 'rw'),
+                 sdiskpart('proc', '/proc', 'proc', 'rw'),
+                 sdiskpart('tmpfs', '/run', 'tmpfs', 'rw'),
+                 sdiskpart('server:/export', '/mnt/nfs', 'nfs4', 'rw')]
+        selected = mounts.select_partitions(parts)
+        self.assertEqual([p.mountpoint for p in selected], ['/', '/mnt/nfs'])
+        selected = mounts.select_partitions(parts, fstypes={'tmpfs'})
+        self.assertEqual([p.mountpoint for p in selected], ['/run'])
+
+    def test_prefix_filter(self):
+        parts = [sdiskpart('/dev/sda1', '/', 'ext4', 'rw'),
+                 sdiskpart('/dev/sdb1', '/srv/data', 'xfs', 'rw'),
+                 sdiskpart('/dev/sdc1', '/srv/database', 'xfs', 'rw')]
+        selected = mounts.select_partitions(parts, prefixes=['/srv/data/'])
+        self.assertEqual([p.mountpoint for p in selected], ['/srv/data'])
+
+    def test_bind_mounts_are_merged_by_device(self):
+        parts = [sdiskpart('/dev/sda1', '/', 'ext4', 'rw'),
+                 sdiskpart('overlay', '/a/merged', 'overlay', 'rw'),
+                 sdiskpart('/dev/sda1', '/b/volume', 'ext4', 'rw,bind'),
+                 sdiskpart('overlay', '/c/merged', 'overlay', 'rw')]
+        disks = FakeDisks({'/': 1, '/a/merged': 2, '/b/volume': 1, '/c/merged': 3})
+        usages = mounts.partition_usage(parts, disks, disks.stat)
+        self.assertEqual([(p.mountpoint, bound) for p, _, bound in usages],
+                         [('/', ['/b/volume']), ('/a/merged', []), ('/c/merged', [])])
+
+    def test_hung_mount_is_reported_without_blocking(self):
+        parts = [sdiskpart('/dev/sda1', '/', 'ext4', 'rw'),
+                 sdiskpart('server:/export', '/mnt/dead', 'nfs4', 'rw')]
+        disks = FakeDisks({'/': 1, '/mnt/dead': 2}, hang=['/mnt/dead'])
+        self.addCleanup(disks.release.set)
+
+        start = time.perf_counter()
+        usages = mounts.partition_usage(parts, disks, disks.stat, timeout=0.2)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(usages[1][1], mounts.UNREACHABLE)
+        self.assertEqual(usages[0][1].total, 100 * GB)
+
+        # The first probe is still stuck: no new thread, no new wait
+        start = time.perf_counter()
+        usages = mounts.partition_usage(parts, disks, disks.stat, timeout=0.2)
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertEqual(usages[1][1], mounts.STILL_HUNG)
+
+        disks.release.set()
+        deadline = time.monotonic() + 1
+        while '/mnt/dead' in mounts.hung_mounts() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertNotIn('/mnt/dead', mounts.hung_mounts())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import errno
+import os
+import shutil
+import socket
+import struct
+import tempfile
+import unittest
+from unittest import mock
+
+from script_info.collectors import ports
+from script_info.collectors.ports import listening_sockets, parse_ports, scan_ports
+
+PROC_HEADER = '  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode\n'
+
+
+def proc_addr(ip, port):
+    packed = socket.inet_pton(socket.AF_INET6 if ':' in ip else socket.AF_INET, ip)
+    words = struct.unpack(f'!{len(packed) // 4}I', packed)
+    return struct.pack(f'={len(words)}I', *words).hex().upper() + f':{port:04X}'
+
+
+class TestPorts(unittest.TestCase):
+    def test_parse_ports(self):
+        self.assertEqual(parse_ports('80, 22,8000-8002,22'), [22, 80, 8000, 8001, 8002])
+        with self.assertRaises(ValueError):
+            parse_ports('0-10')
+
+    def test_listening_sockets_from_proc(self):
+        root = tempfile.mkdtemp()
+        try:
+            os.mkdir(os.path.join(root, 'net'))
+            with open(os.path.join(root, 'net', 'tcp'), 'w') as f:
+                f.write(PROC_HEADER)
+                f.write(f"   0: {proc_addr('127.0.0.1', 22)} 00000000:0000 0A 00000000:00000000 00:00000000 00000000 0 0 1\n")
+                f.write(f"   1: {proc_addr('10.0.0.5', 40000)} {proc_addr('10.0.0.9', 443)} 01 00000000:00000000 00:00000000 00000000 0 0 2\n")
+            with open(os.path.join(root, 'net', 'tcp6'), 'w') as f:
+                f.write(PROC_HEADER)
+                f.write(f"   0: {proc_addr('::', 8080)} {proc_addr('::', 0)} 0A 00000000:00000000 00:00000000 00000000 0 0 3\n")
+            self.assertEqual(listening_sockets(root), {('127.0.0.1', 22), ('::', 8080)})
+        finally:
+            shutil.rmtree(root)
+
+    def test_unreadable_proc_falls_back_to_psutil(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        with mock.patch('builtins.open', side_effect=PermissionError(errno.EACCES, 'denied')), \
+                mock.patch.object(ports, '_listening_from_psutil', return_value={('0.0.0.0', 22)}):
+            self.assertEqual(listening_sockets(root), {('0.0.0.0', 22)})
+
+    @unittest.skipUnless(os.name == 'posix', 'needs RLIMIT_NOFILE')
+    def test_concurrency_fits_the_open_file_limit(self):
+        import resource
+        with mock.patch.object(resource, 'getrlimit', return_value=(256, 1024)):
+            capped = ports.max_concurrency(500)
+        self.assertLess(capped, 256 - ports.FD_HEADROOM)
+        self.assertGreater(capped, 0)
+        with mock.patch.object(resource, 'getrlimit', return_value=(100000, 100000)):
+            self.assertEqual(ports.max_concurrency(500), 500)
+
+    def test_scan_backs_off_when_out_of_descriptors(self):
+        real_socket = socket.socket
+        opened = []
+
+        def limited_socket(*args, **kwargs):
+            if len(opened) - sum(s.fileno() == -1 for s in opened) >= 3:
+                raise OSError(errno.EMFILE, 'Too many open files')
+            sock = real_socket(*args, **kwargs)
+            opened.append(sock)
+            return sock
+
+        server = real_socket()
+        server.bind(('127.0.0.1', 0))
+        server.listen()
+        self.addCleanup(server.close)
+        port = server.getsockname()[1]
+        with mock.patch.object(ports, 'max_concurrency', lambda n: n), \
+                mock.patch.object(ports.socket, 'socket', limited_socket):
+            result = scan_ports([port] * 20, hosts=['127.0.0.1'], concurrency=10, timeout=1.0)
+        self.assertEqual(result, {'127.0.0.1': [port] * 20})
+
+    def test_scan_finds_listener_and_skips_closed_port(self):
+        server = socket.socket()
+        server.bind(('127.0.0.1', 0))
+        server.listen()
+        open_port = server.getsockname()[1]
+        probe = socket.socket()
+        probe.bind(('127.0.0.1', 0))
+        closed_port = probe.getsockname()[1]
+        probe.close()
+        try:
+            result = scan_ports([open_port, closed_port], hosts=['127.0.0.1'], concurrency=2, timeout=1.0)
+        finally:
+            server.close()
+        self.assertEqual(result, {'127.0.0.1': [open_port]})
+
+if __name__ == '__main__':
+    unittest.main()
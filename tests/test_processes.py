@@ -0,0 +1,112 @@
+import unittest
+from collections import namedtuple
+from unittest import mock
+
+from fakes import FakePsutil, patch_psutil
+from script_info.collectors import basic, processes
+from script_info.collectors.options import options
+
+pcputimes = namedtuple('pcputimes', 'user system')
+pmem = namedtuple('pmem', 'rss vms')
+
+
+class FakeProc:
+    def __init__(self, pid, name, cpu, rss=0, threads=1, fds=0, created=0.0, status='sleeping'):
+        self.info = {
+            'pid': pid, 'name': name, 'status': status, 'create_time': created,
+            'cpu_times': None if cpu is None else pcputimes(cpu, 0.0),
+            'memory_info': None if rss is None else pmem(rss, rss),
+            'num_threads': threads, processes.FD_ATTR: fds,
+        }
+
+
+class Backend:
+    def __init__(self, procs):
+        self.procs = procs
+        self.attrs = None
+
+    def process_iter(self, attrs=None, ad_value=None):
+        self.attrs = attrs
+        return iter(self.procs)
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestProcessSampler(unittest.TestCase):
+    def setUp(self):
+        self.backend = Backend([FakeProc(1, 'init', 10.0, created=0.0),
+                                FakeProc(2, 'worker', 50.0, created=50.0)])
+        self.clock = Clock(1000.0)
+        self.wall = Clock(100.0)
+        self.sampler = processes.ProcessSampler(self.backend, self.clock, self.wall)
+
+    def test_first_sample_is_lifetime_average(self):
+        procs, window = self.sampler.sample()
+        self.assertIsNone(window)
+        self.assertEqual(self.backend.attrs, processes.ATTRS)
+        self.assertEqual([p.cpu for p in procs], [10.0, 100.0])
+
+    def test_later_samples_use_the_window(self):
+        self.sampler.sample()
+        self.clock.now += 2.0
+        self.wall.now += 2.0
+        self.backend.procs = [
+            FakeProc(1, 'init', 11.0, created=0.0),
+            FakeProc(2, 'worker', 50.5, created=50.0),
+            # A new process, and a reused pid with a new start time
+            FakeProc(3, 'new', 1.0, created=101.0),
+        ]
+        procs, window = self.sampler.sample()
+        self.assertEqual(window, 2.0)
+        self.assertEqual([p.cpu for p in procs], [50.0, 25.0, 100.0])
+
+        self.clock.now += 1.0
+        self.wall.now += 1.0
+        self.backend.procs = [FakeProc(1, 'init', 11.0, created=90.0)]
+        procs, _ = self.sampler.sample()
+        self.assertAlmostEqual(procs[0].cpu, 100.0 * 11.0 / 13.0)
+
+    def test_unreadable_fields_never_rank(self):
+        self.backend.procs = [FakeProc(1, 'a', None, rss=None, threads=None, fds=None),
+                              FakeProc(2, 'b', 1.0, rss=4096, threads=3, fds=5)]
+        procs, _ = self.sampler.sample()
+        for field in processes.RANKINGS:
+            self.assertEqual([p.pid for p in processes.top(procs, field, 5)], [2])
+
+
+class TestTop(unittest.TestCase):
+    def test_matches_a_full_sort(self):
+        procs = [processes.Process(pid, f'p{pid}', 'sleeping', (pid * 37) % 101, pid * 7 % 13, pid % 5, pid)
+                 for pid in range(1, 500)]
+        for field in processes.RANKINGS:
+            expected = sorted(procs, key=lambda p: getattr(p, field), reverse=True)[:10]
+            self.assertEqual([getattr(p, field) for p in processes.top(procs, field, 10)],
+                             [getattr(p, field) for p in expected])
+
+    def test_status_counts(self):
+        procs = [processes.Process(i, 'p', s, 0, 0, 0, 0) for i, s in enumerate(['sleeping', 'running', 'sleeping'])]
+        self.assertEqual(processes.status_counts(procs), {'sleeping': 2, 'running': 1})
+
+
+class TestCollector(unittest.TestCase):
+    def test_display(self):
+        with patch_psutil(FakePsutil(processes=200, mounts=1, interfaces=1)), \
+                mock.patch.object(options, 'process_top', 3):
+            info = basic.get_processes_info()
+        self.assertEqual(info['Process Count'], 200)
+        self.assertEqual(info['Process CPU Window (s)'], 'N/A')
+        self.assertEqual(info['Process States'], {'sleeping': 200})
+        self.assertEqual(list(info['Top Processes by Threads']),
+                         ['1. proc-63 (63)', '2. proc-127 (127)', '3. proc-191 (191)'])
+        self.assertEqual(info['Top Processes by Memory']['1. proc-200 (200)'], '200.00 MB')
+        self.assertEqual(len(info['Top Processes by CPU (%)']), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import psutil
+
+from script_info.collectors import procfs
+
+STAT = """\
+cpu  28344 12 4357 353539 268 0 89 891 0 0
+cpu0 14000 6 2000 176000 100 0 40 400 0 0
+cpu1 14344 6 2357 177539 168 0 49 491 0 0
+intr 245489 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 1 1 1 0 0 774 53 0 75 1 10586
+ctxt 1234567
+btime 1700000000
+processes 4242
+"""
+
+MEMINFO = """\
+MemTotal:        6147400 kB
+MemFree:         4773900 kB
+MemAvailable:    5646196 kB
+Buffers:           61556 kB
+Cached:          1015284 kB
+SwapCached:            0 kB
+Active:           393692 kB
+Inactive:         884152 kB
+Active(anon):         20 kB
+SwapTotal:       2097148 kB
+SwapFree:        1048574 kB
+Shmem:             12345 kB
+Slab:              99999 kB
+SReclaimable:      55555 kB
+HugePages_Total:       0
+HugePages_Free:        0
+Hugepagesize:       2048 kB
+"""
+
+VMSTAT = """\
+nr_free_pages 1193475
+pswpin 1200
+pswpout 3400
+pgpgin 990
+"""
+
+NET_DEV = """\
+Inter-|   Receive                                                |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed
+    lo: 109089236  839822    0    0    0     0          0         0 109089236  839822    0    0    0     0       0          0
+  eth0: 5000 40 1 2 0 0 0 0 7000 50 3 4 0 0 0 0
+veth0123456789abc:123 4 0 0 0 0 0 0 456 7 0 0 0 0 0 0
+"""
+
+DISKSTATS = """\
+   7       0 loop0 10 0 80 5 0 0 0 0 0 12 5 0 0 0 0 0 0
+   8       0 sda 2000 100 160000 900 3000 200 240000 1800 0 2500 2700 0 0 0 0 0 0
+   8       1 sda1 1500 90 120000 700 2500 150 200000 1500 0 2000 2200 0 0 0 0 0 0
+"""
+
+
+def write_tree(root, files):
+    for name, content in files.items():
+        path = os.path.join(root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+
+
+class TestAgainstPsutil(unittest.TestCase):
+    """Same fake /proc tree, read by psutil (via PROCFS_PATH) and by the fast path."""
+
+    def setUp(self):
+        if not procfs.available():
+            self.skipTest('Linux /proc fast path not available')
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        proc = os.path.join(self.root, 'proc')
+        write_tree(proc, {'stat': STAT, 'meminfo': MEMINFO, 'vmstat': VMSTAT,
+                          'net/dev': NET_DEV, 'diskstats': DISKSTATS})
+        os.makedirs(os.path.join(self.root, 'sys', 'block', 'sda'))
+        os.makedirs(os.path.join(self.root, 'sys', 'block', 'loop0'))
+        patcher = mock.patch.object(psutil, 'PROCFS_PATH', proc)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.fast = procfs.ProcfsBackend(psutil, proc, os.path.join(self.root, 'sys'))
+        self.addCleanup(self.fast.close)
+
+    def test_cpu_times(self):
+        self.assertEqual(self.fast.cpu_times(), psutil.cpu_times())
+        self.assertEqual(self.fast.cpu_times(percpu=True), psutil.cpu_times(percpu=True))
+        self.assertEqual(len(self.fast.cpu_times(percpu=True)), 2)
+
+    def test_memory(self):
+        self.assertEqual(self.fast.virtual_memory(), psutil.virtual_memory())
+        swap = self.fast.swap_memory()
+        self.assertEqual(swap, psutil.swap_memory())
+        self.assertEqual((swap.used, swap.sin), (1048574 * 1024, 1200 * 4096))
+
+    def test_network(self):
+        pernic = self.fast.net_io_counters(pernic=True)
+        self.assertEqual(pernic, psutil.net_io_counters(pernic=True, nowrap=False))
+        self.assertEqual(list(pernic), ['lo', 'eth0', 'veth0123456789abc'])
+        self.assertEqual(self.fast.net_io_counters(), psutil.net_io_counters(nowrap=False))
+
+    def test_disks(self):
+        perdisk = self.fast.disk_io_counters(perdisk=True)
+        self.assertEqual(perdisk, psutil.disk_io_counters(perdisk=True, nowrap=False))
+        # Totals count whole disks only, not sda1
+        total = self.fast.disk_io_counters()
+        self.assertEqual(total.read_bytes, (80 + 160000) * 512)
+        self.assertEqual(total.busy_time, 12 + 2500)
+
+    def test_layout_changes_are_picked_up(self):
+        self.fast.virtual_memory()
+        write_tree(psutil.PROCFS_PATH, {'meminfo': 'MemTotal: 100 kB\nMemFree: 10 kB\nMemAvailable: 50 kB\n'
+                                                   + MEMINFO.split('\n', 3)[3]})
+        self.assertEqual(self.fast.virtual_memory().total, 100 * 1024)
+
+    def test_unparsable_files_fall_back_to_psutil(self):
+        write_tree(psutil.PROCFS_PATH, {'diskstats': '   8       0 sda 1 2 3\n'})
+        fallback = mock.Mock()
+        fallback.disk_io_counters.return_value = 'from psutil'
+        fast = procfs.ProcfsBackend(fallback, psutil.PROCFS_PATH)
+        self.assertEqual(fast.disk_io_counters(perdisk=True), 'from psutil')
+        self.assertIn('disk_io_counters', fast._broken)
+        # Everything else is delegated
+        self.assertIs(fast.disk_partitions, fallback.disk_partitions)
+
+
+class TestProcFile(unittest.TestCase):
+    def test_grows_past_its_buffer(self):
+        fd, path = tempfile.mkstemp()
+        self.addCleanup(os.remove, path)
+        data = b''.join(b'line %d\n' % i for i in range(1000))
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        if not hasattr(os, 'preadv'):
+            self.skipTest('os.preadv not available')
+        f = procfs.ProcFile(path, size=64)
+        self.addCleanup(f.close)
+        self.assertEqual(f.read(), data)
+        self.assertEqual(f.read(), data)
+
+
+class TestLiveProc(unittest.TestCase):
+    """On the real /proc, every counter lies between two psutil reads taken around it."""
+
+    def setUp(self):
+        if not procfs.available():
+            self.skipTest('Linux /proc fast path not available')
+        self.fast = procfs.ProcfsBackend(psutil)
+        self.addCleanup(self.fast.close)
+
+    def assertBetween(self, read):
+        before = read(psutil)
+        value = read(self.fast)
+        after = read(psutil)
+        self.assertIs(type(value), type(before))
+        for low, mid, high in zip(before, value, after):
+            self.assertLessEqual(low, mid)
+            self.assertLessEqual(mid, high)
+
+    def test_counters(self):
+        self.assertBetween(lambda b: b.cpu_times())
+        self.assertBetween(lambda b: b.net_io_counters(nowrap=False))
+        if psutil.disk_io_counters() is not None:
+            self.assertBetween(lambda b: b.disk_io_counters(nowrap=False))
+
+    def test_memory(self):
+        self.assertEqual(self.fast.virtual_memory().total, psutil.virtual_memory().total)
+        self.assertEqual(self.fast.swap_memory().total, psutil.swap_memory().total)
+        self.assertEqual(self.fast._broken, set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+
+from script_info.collectors import CHEAP, get_collectors, all_collectors
+from script_info.collectors.registry import Collector
+
+
+class TestRegistry(unittest.TestCase):
+    def names(self, **kwargs):
+        return [c.name for c in get_collectors(**kwargs)]
+
+    def test_every_collector_declares_category_and_cost(self):
+        for c in all_collectors():
+            self.assertIsInstance(c, Collector)
+            self.assertTrue(c.category)
+            self.assertIn(c.cost, ('cheap', 'moderate', 'expensive'))
+
+    def test_only_cheap(self):
+        collectors = get_collectors(only=['cheap'])
+        self.assertTrue(collectors)
+        self.assertTrue(all(c.cost == CHEAP for c in collectors))
+
+    def test_skip_categories(self):
+        names = self.names(skip=['network', 'software'])
+        for skipped in ('dns', 'ports', 'hostname', 'browser_history', 'dev_tools'):
+            self.assertNotIn(skipped, names)
+        self.assertIn('os', names)
+
+    def test_opt_in_collectors_need_explicit_name(self):
+        self.assertNotIn('installed_programs', self.names())
+        self.assertNotIn('installed_programs', self.names(only=['software']))
+        self.assertEqual(self.names(only=['installed_programs']), ['installed_programs'])
+
+    def test_unknown_selector(self):
+        with self.assertRaises(ValueError):
+            get_collectors(only=['no_such_collector'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from script_info.collectors import resolve
+from script_info.collectors.resolve import TTLCache
+
+
+class TestResolve(unittest.TestCase):
+    def setUp(self):
+        resolve.cache.clear()
+        self.dir = tempfile.mkdtemp()
+        self.hosts = os.path.join(self.dir, 'hosts')
+        with open(self.hosts, 'w') as f:
+            f.write('# comment\n127.0.0.1 localhost\n10.1.2.3 web01.example.com web01  # primary\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_hosts_file_answers_without_the_resolver(self):
+        with mock.patch('socket.getfqdn', side_effect=AssertionError), \
+                mock.patch('socket.gethostbyname', side_effect=AssertionError):
+            self.assertEqual(resolve.fully_qualified_name('web01', hosts_path=self.hosts), 'web01.example.com')
+            self.assertEqual(resolve.host_address('WEB01', hosts_path=self.hosts), '10.1.2.3')
+
+    def test_hung_resolver_is_bounded_and_cached(self):
+        release = threading.Event()
+        calls = []
+
+        def hang(name):
+            calls.append(name)
+            release.wait(5)
+            return 'late.example.com'
+
+        try:
+            with mock.patch('socket.getfqdn', hang):
+                start = time.monotonic()
+                self.assertIsNone(resolve.fully_qualified_name('nohost', 0.05, hosts_path=self.hosts))
+                # The negative answer is cached: no second wait, no second thread
+                self.assertIsNone(resolve.fully_qualified_name('nohost', 0.05, hosts_path=self.hosts))
+                self.assertLess(time.monotonic() - start, 0.5)
+                resolve.cache.clear()
+                self.assertIsNone(resolve.fully_qualified_name('nohost', 0.05, hosts_path=self.hosts))
+            self.assertEqual(calls, ['nohost'])
+        finally:
+            release.set()
+
+    def test_resolv_conf(self):
+        path = os.path.join(self.dir, 'resolv.conf')
+        with open(path, 'w') as f:
+            f.write('search example.com\nnameserver 10.0.0.2\nnameserver 10.0.0.3 # backup\n')
+        self.assertEqual(resolve.dns_servers(resolv_conf=path), ['10.0.0.2', '10.0.0.3'])
+
+    def test_ttl_cache_expiry(self):
+        now = [0.0]
+        cache = TTLCache(maxsize=2, clock=lambda: now[0])
+        cache.set('a', 1, ttl=10)
+        cache.set('b', 2, ttl=20)
+        cache.set('c', 3, ttl=30)
+        self.assertIsNone(cache.get('a'))
+        now[0] = 25
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import importlib
+import unittest
+from unittest import mock
+
+from fakes import FakePsutil, scputimes
+from script_info.collectors import hardware, sampling
+from script_info.collectors.sampling import CpuSampler
+
+options_module = importlib.import_module('script_info.collectors.options')
+
+
+class FrozenCpu:
+    def cpu_times(self, percpu=False):
+        times = scputimes(1.0, 0.0, 1.0, 10.0, 0.0, 0.0, 0.0, 0.0)
+        return [times, times] if percpu else times
+
+
+class TestCpuSampler(unittest.TestCase):
+    def test_utilisation_per_mode_and_core(self):
+        clock = iter([10.0, 10.5]).__next__
+        sampler = CpuSampler(FakePsutil(processes=0, mounts=1, interfaces=1, cpus=4), clock=clock)
+        usage = sampler.sample()
+
+        self.assertEqual(usage['window'], 0.5)
+        # Per tick the fake adds user 100, nice 1, system 50, idle 800, iowait 5, irq+softirq 1
+        self.assertAlmostEqual(usage['total']['usage'], 100 * 152 / 957)
+        self.assertAlmostEqual(usage['total']['user'], 100 * 100 / 957)
+        self.assertAlmostEqual(usage['total']['iowait'], 100 * 5 / 957)
+        self.assertEqual(usage['total']['steal'], 0)
+        self.assertEqual(len(usage['per_core']), 4)
+        self.assertAlmostEqual(usage['per_core'][3]['usage'], usage['total']['usage'])
+
+    def test_short_window_reports_since_boot(self):
+        fake = FakePsutil(processes=0, mounts=1, interfaces=1, cpus=2)
+        clock = iter([10.0, 10.04, 10.6]).__next__
+        sampler = CpuSampler(fake, clock=clock)
+        baseline = sampler._baseline
+        usage = sampler.sample()
+        self.assertTrue(usage['since_boot'])
+        self.assertGreater(usage['window'], 0)
+        times = fake.cpu_times()
+        busy = times.user + times.nice + times.system + times.irq + times.softirq + times.steal
+        self.assertAlmostEqual(usage['total']['usage'], 100 * busy / sum(times), places=0)
+        self.assertEqual(len(usage['per_core']), 2)
+        # The short window did not move the baseline, the next sample measures from it
+        self.assertIs(sampler._baseline, baseline)
+        usage = sampler.sample()
+        self.assertNotIn('since_boot', usage)
+        self.assertAlmostEqual(usage['window'], 0.6)
+
+    def test_empty_window_keeps_baseline(self):
+        times = iter([1.0, 2.0, 3.0])
+        sampler = CpuSampler(FrozenCpu(), clock=lambda: next(times))
+        self.assertIsNone(sampler.sample())
+        self.assertEqual(sampler._baseline[0], 1.0)
+
+
+class TestCpuCollector(unittest.TestCase):
+    def collect(self, **options):
+        fake = FakePsutil(processes=0, mounts=1, interfaces=1, cpus=2)
+        clock = iter([10.0, 10.1]).__next__
+        with mock.patch.object(sampling, 'cpu_sampler', CpuSampler(fake, clock=clock)), \
+                mock.patch.object(options_module, 'options', options_module.Options()) as patched, \
+                mock.patch.object(hardware, 'options', patched):
+            patched.configure(**options)
+            return {m.name: m.value for m in hardware.get_cpu_info.metrics()}
+
+    def test_short_window_reports_since_boot_separately(self):
+        metrics = self.collect()
+        self.assertEqual(metrics['cpu_usage'], 'N/A (sampling window too short)')
+        self.assertIsInstance(metrics['cpu_usage_since_boot'], float)
+        self.assertNotIn('cpu_usage_window', metrics)
+
+    def test_zero_min_window_always_measures(self):
+        metrics = self.collect(cpu_min_window=0)
+        self.assertIsInstance(metrics['cpu_usage'], float)
+        self.assertAlmostEqual(metrics['cpu_usage_window'], 0.1)
+        self.assertNotIn('cpu_usage_since_boot', metrics)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from script_info.collectors import hardware, sensors
+
+
+def write_tree(root, files):
+    for name, content in files.items():
+        path = os.path.join(root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content + '\n')
+
+
+SYSFS = {
+    'hwmon/hwmon0/name': 'coretemp',
+    'hwmon/hwmon0/temp1_input': '48000',
+    'hwmon/hwmon0/temp1_label': 'Package id 0',
+    'hwmon/hwmon0/temp1_max': '80000',
+    'hwmon/hwmon0/temp1_crit': '100000',
+    'hwmon/hwmon0/temp2_input': '45500',
+    'hwmon/hwmon0/temp2_label': 'Core 0',
+    'hwmon/hwmon0/temp10_input': '47000',
+    # Older drivers: attributes under device/
+    'hwmon/hwmon2/device/name': 'nct6775',
+    'hwmon/hwmon2/device/fan1_input': '1200',
+    'hwmon/hwmon2/device/fan1_min': '300',
+    'hwmon/hwmon10/name': 'nvme',
+    'hwmon/hwmon10/temp1_input': '38850',
+    'hwmon/hwmon10/temp1_label': 'Composite',
+    'hwmon/hwmon11/name': 'nvme',
+    'hwmon/hwmon11/temp1_input': '40000',
+    # No sensors at all
+    'hwmon/hwmon3/name': 'acpi_fan',
+    'thermal/thermal_zone0/type': 'acpitz',
+    'thermal/thermal_zone0/temp': '27800',
+    'thermal/thermal_zone0/trip_point_0_type': 'critical',
+    'thermal/thermal_zone0/trip_point_0_temp': '119000',
+    'thermal/thermal_zone0/trip_point_1_type': 'passive',
+    'thermal/thermal_zone0/trip_point_1_temp': '95000',
+    'thermal/cooling_device0/type': 'Processor',
+}
+
+
+class TestSensors(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        write_tree(self.root, SYSFS)
+        self.sensor_set = sensors.SensorSet(self.root)
+        self.addCleanup(self.sensor_set.close)
+
+    def test_discovery(self):
+        found = [(s.chip, s.kind, s.label, s.thresholds) for s in self.sensor_set.sensors()]
+        self.assertEqual(found, [
+            ('coretemp', 'temperature', 'Package id 0', (('max', 80.0), ('critical', 100.0))),
+            ('coretemp', 'temperature', 'Core 0', ()),
+            ('coretemp', 'temperature', 'temp10', ()),
+            ('nct6775', 'fan', 'fan1', (('min', 300),)),
+            ('nvme', 'temperature', 'Composite', ()),
+            ('nvme #2', 'temperature', 'temp1', ()),
+            ('acpitz', 'temperature', 'thermal_zone0', (('critical', 119.0),)),
+        ])
+
+    def test_samples_reuse_discovery_and_descriptors(self):
+        self.assertEqual([v for _, v in self.sensor_set.sample()], [48.0, 45.5, 47.0, 1200, 38.85, 40.0, 27.8])
+        write_tree(self.root, {'hwmon/hwmon0/temp1_input': '52000',
+                               # A new sensor is only found by rediscover()
+                               'hwmon/hwmon0/temp3_input': '1000'})
+        with mock.patch.object(sensors, 'discover') as discover, \
+                mock.patch('os.open', side_effect=AssertionError('reopened')):
+            values = [v for _, v in self.sensor_set.sample()]
+        discover.assert_not_called()
+        self.assertEqual(values[0], 52.0)
+        self.assertEqual(len(values), 7)
+        self.sensor_set.rediscover()
+        self.assertEqual(len(self.sensor_set.sample()), 8)
+
+    def test_unreadable_sensor_is_none(self):
+        self.sensor_set.sensors()
+        os.remove(os.path.join(self.root, 'hwmon/hwmon10/temp1_input'))
+        values = dict((s.chip, v) for s, v in self.sensor_set.sample())
+        self.assertIsNone(values['nvme'])
+        self.assertEqual(values['nvme #2'], 40.0)
+
+    def test_collector(self):
+        with mock.patch.object(sensors, 'sensor_set', self.sensor_set), \
+                mock.patch.object(sensors, 'supported', return_value=True):
+            info = hardware.get_sensors_info()
+            metrics = hardware.get_sensors_info.metrics()
+        self.assertEqual(info['Sensors Count'], 7)
+        self.assertEqual(info['coretemp Sensors'], {
+            'Package id 0 (°C)': 48.0, 'Package id 0 Max (°C)': 80.0, 'Package id 0 Critical (°C)': 100.0,
+            'Core 0 (°C)': 45.5, 'temp10 (°C)': 47.0,
+        })
+        self.assertEqual(info['nct6775 Sensors'], {'fan1 (RPM)': 1200, 'fan1 Min (RPM)': 300})
+        self.assertEqual(info['acpitz Sensors'], {'thermal_zone0 (°C)': 27.8, 'thermal_zone0 Critical (°C)': 119.0})
+        critical = [m for m in metrics if m.name == 'temperature_critical']
+        self.assertEqual([m.labels for m in critical], [{'chip': 'coretemp', 'sensor': 'Package id 0'},
+                                                        {'chip': 'acpitz', 'sensor': 'thermal_zone0'}])
+
+    def test_empty_tree(self):
+        empty = sensors.SensorSet(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, empty.root)
+        with mock.patch.object(sensors, 'sensor_set', empty), \
+                mock.patch.object(sensors, 'supported', return_value=True):
+            self.assertEqual(hardware.get_sensors_info(), {'Sensors': 'None found'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Cumulative import time allowed for the CLI entry module. Importing GPUtil
+# eagerly (it drags in distutils/setuptools) costs well over 100 ms on its own.
+STARTUP_BUDGET_MS = 200
+
+HEAVY_MODULES = ('GPUtil', 'cpuinfo', 'wmi', 'dns', 'browserhistory', 'reportlab')
+
+
+def run_python(code, *flags):
+    return subprocess.run(
+        [sys.executable, *flags, '-c', code],
+        capture_output=True, text=True, cwd=ROOT, timeout=60,
+    )
+
+
+class TestStartup(unittest.TestCase):
+    def test_cli_import_time_budget(self):
+        result = run_python('import script_info.cli.main', '-X', 'importtime')
+        self.assertEqual(result.returncode, 0, result.stderr)
+        cumulative = None
+        for line in result.stderr.splitlines():
+            parts = line.split('|')
+            if len(parts) == 3 and parts[2].strip() == 'script_info.cli.main':
+                cumulative = int(parts[1])
+        self.assertIsNotNone(cumulative, result.stderr)
+        self.assertLess(cumulative / 1000, STARTUP_BUDGET_MS)
+
+    def test_basic_run_does_not_import_heavy_dependencies(self):
+        code = (
+            "import sys\n"
+            "sys.argv = ['script-info-cli', '-all', '--only', 'os']\n"
+            "from script_info.cli.main import main\n"
+            "main()\n"
+            f"print('LOADED', [m for m in {HEAVY_MODULES!r} if m in sys.modules])\n"
+        )
+        result = run_python(code)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn('OS Name', result.stdout)
+        self.assertIn('LOADED []', result.stdout)
+
+if __name__ == '__main__':
+    unittest.main()
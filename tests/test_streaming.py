@@ -0,0 +1,73 @@
+import asyncio
+import contextlib
+import io
+import time
+import unittest
+
+from script_info.cli.main import SECTION_PREVIEW, _print_section
+from script_info.collectors import registry
+from script_info.collectors.model import COUNT, Metric, Section
+from script_info.collectors.registry import Collector
+from script_info.core import aiter_system_info, get_system_info, iter_system_info
+
+ONLY = ['stream_slow', 'stream_fast']
+
+
+class TestIterSystemInfo(unittest.TestCase):
+    def setUp(self):
+        for collector in (Collector('stream_slow', lambda: time.sleep(0.2) or {'Slow': 1}, 'Plugins', default=False),
+                          Collector('stream_fast', lambda: {'Fast': 2}, 'Plugins', default=False)):
+            registry.add_collector(collector)
+            self.addCleanup(registry._collectors.pop, collector.name)
+
+    def test_yields_as_collectors_finish(self):
+        start = time.monotonic()
+        stream = iter_system_info(only=ONLY)
+        self.assertEqual(next(stream), ('stream_fast', {'Fast': 2}))
+        self.assertLess(time.monotonic() - start, 0.15)
+        self.assertEqual(list(stream), [('stream_slow', {'Slow': 1})])
+
+    def test_merged_results_match_get_system_info(self):
+        merged = {}
+        for _, info in iter_system_info(only=ONLY):
+            merged.update(info)
+        self.assertEqual(merged, get_system_info(only=ONLY))
+
+    def test_async_iterator(self):
+        async def consume():
+            return [name async for name, _ in aiter_system_info(only=ONLY)]
+        self.assertEqual(asyncio.run(consume()), ['stream_fast', 'stream_slow'])
+
+    def test_async_iterator_raises_selection_errors(self):
+        async def consume():
+            return [item async for item in aiter_system_info(only=['no_such_collector'])]
+        with self.assertRaises(ValueError):
+            asyncio.run(consume())
+
+
+class TestPrintSection(unittest.TestCase):
+    def print_section(self, section, full=False):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            items = _print_section(section, full)
+        return items, out.getvalue().splitlines()
+
+    def test_preview_and_full(self):
+        metrics = [Metric('interface_name', f'veth{i}', None, 'Interface {index} Name', {'index': i})
+                   for i in range(1, 51)]
+        metrics.append(Metric('interfaces_by_type', 50, COUNT, ('Network Interface Types', '{type}'),
+                              {'type': 'veth'}))
+        section = Section('interfaces', 'Network', metrics)
+
+        items, lines = self.print_section(section)
+        self.assertEqual(items, 51)
+        self.assertEqual(lines[1], '[Network] interfaces')
+        self.assertEqual(len(lines), 2 + SECTION_PREVIEW + 1)
+        self.assertIn('and 32 more lines', lines[-1])
+
+        _, lines = self.print_section(section, full=True)
+        self.assertEqual(lines[-2:], ['Network Interface Types:', '  veth: 50'])
+
+
+if __name__ == '__main__':
+    unittest.main()
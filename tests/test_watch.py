@@ -0,0 +1,85 @@
+import unittest
+from unittest import mock
+
+from fakes import FakePsutil
+from script_info import watch as watch_module
+from script_info.collectors.sampling import MIN_WINDOW, CpuSampler
+from script_info.watch import CounterSampler, format_rates, ticks, watch
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestCounterSampler(unittest.TestCase):
+    def test_rates_per_nic_and_per_disk(self):
+        clock = FakeClock()
+        sampler = CounterSampler(FakePsutil(processes=0, mounts=1, interfaces=4), clock=clock)
+        self.assertIsNone(sampler.sample())
+        clock.now += 2.0
+        rates = sampler.sample()
+
+        self.assertEqual(rates['Interval (s)'], 2.0)
+        self.assertEqual(set(rates['Per NIC']), {'lo', 'eth0', 'cali00000000000', 'veth00001'})
+        self.assertEqual(set(rates['Per Disk']), {'sda', 'sdb', 'sdc', 'sdd'})
+        # FakePsutil advances every counter by a fixed step per read (4 reads per sample)
+        self.assertEqual(rates['Per NIC']['eth0']['Sent (B/s)'], 1500 * 4 / 2.0)
+        self.assertEqual(rates['Disk']['Read IOPS'], 1000 * 4 / 2.0)
+        self.assertTrue(format_rates(rates))
+
+    def test_counter_reset_never_goes_negative(self):
+        clock = FakeClock()
+        fake = FakePsutil(processes=0, mounts=1, interfaces=2)
+        sampler = CounterSampler(fake, clock=clock)
+        sampler.sample()
+        fake.ticks = 0
+        clock.now += 1.0
+        rates = sampler.sample()
+        self.assertEqual(rates['Network']['Sent (B/s)'], 0)
+
+
+class TestTicks(unittest.TestCase):
+    def test_steady_schedule_skips_overrun_ticks(self):
+        clock = FakeClock()
+        clock.sleeps = []
+        seen = []
+        for n in ticks(1.0, count=3, clock=clock, sleep=clock.sleep):
+            seen.append(n)
+            if n == 1:
+                clock.now += 1.5  # work overran the next tick
+        self.assertEqual(seen, [1, 3, 4])
+        self.assertEqual(clock.now, 104.0)
+
+
+class TestWatch(unittest.TestCase):
+    def test_short_interval_measures_every_tick(self):
+        backend = FakePsutil(processes=0, mounts=1, interfaces=1, cpus=2)
+        sampler = CpuSampler(backend)
+        samples = []
+
+        def sample(min_window=MIN_WINDOW):
+            usage = CpuSampler.sample(sampler, min_window)
+            samples.append(usage)
+            return usage
+
+        lines = []
+        with mock.patch.object(watch_module, 'cpu_sampler', mock.Mock(sample=sample)), \
+                mock.patch.object(watch_module, 'CounterSampler', lambda: CounterSampler(backend)):
+            watch(0.1, count=4, out=lines.append)
+        # The priming sample and one per report, each over the tick just gone
+        self.assertEqual(len(samples), 5)
+        for usage in samples:
+            self.assertNotIn('since_boot', usage)
+            self.assertLess(usage['window'], MIN_WINDOW)
+        self.assertEqual(sum(line.startswith('CPU: ') for line in lines), 4)
+
+if __name__ == '__main__':
+    unittest.main()